@@ -0,0 +1,226 @@
+"""
+Benchmark suite of the simulator. It measures, with fixed seeds and random WT sequences of
+configurable length, the wall time, the CPU time and the peak RSS (see Instrumentation) of:
+    - the growth of the tree ('Simulator.growth');
+    - the reconstruction of all the leaves ('run_reconstruction') and of one path
+      ('path_reconstructor');
+    - the visualization of the cumulated mutations ('run_visualization');
+for every combination of number of generations, average number of events and chromosome length,
+and the time per event of 'reconstruct' and 'update_visual' of each event class, in simulations
+with only that kind of event. Each benchmark is repeated and the fastest run is kept.
+
+The results are written to a JSON file. With '--compare' they are compared with a baseline (a
+file written by a previous run): the benchmarks slower (or using more memory) than the baseline by
+more than the thresholds are reported as regressions, and the script exits with status 1.
+
+Usage
+-----
+    python benchmark.py --output baseline.json
+    python benchmark.py --output new.json --compare baseline.json
+    python benchmark.py --generations 6 8 --events 1 --lengths 10000 --repeat 1
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "code"))
+import numpy as np
+from Simulator import Simulator
+from Utility import Utility
+from EventLog import EventLog
+from TruncatedExponential import TruncatedExponential
+
+N_TYPES = len(EventLog.TYPES)
+
+
+def reference(n_chromosomes: int, length: int, seed: int):
+    """
+    Returns a 'chromosome_table' of 'n_chromosomes' random sequences of 'length' bases, the same
+    for the same seed.
+    """
+    np.random.seed(seed)
+    return Utility.random_seq_initializer([length] * n_chromosomes)
+
+
+def single_type_cumulative_list(type_code: int):
+    """
+    Returns the 'cumulative_list' of a simulation with only the events of kind
+    'EventLog.TYPES[type_code]'.
+    """
+    return [0.] * type_code + [1.] * (N_TYPES - type_code)
+
+
+def simulate(table, n_generations: int, n_events: float, tau: float, seed: int, \
+             cumulative_list = None):
+    """
+    Runs the growth of a simulation with the given parameters.
+    """
+    if cumulative_list is None: cumulative_list = [(k + 1) / N_TYPES for k in range(N_TYPES)]
+    distrib = TruncatedExponential(tau)
+    return Simulator(table, n_generations, n_events, cumulative_list, del_len_distrib=distrib, \
+                     ins_len_distrib=distrib, transl_len_distrib=distrib, \
+                     rec_transl_len_distrib=distrib, dupl_len_distrib=distrib, seed=seed)
+
+
+def measure(simulator: Simulator, phase: str, function, *args):
+    """
+    Calls 'function(*args)' and returns the measurements of the phase 'phase' of the simulator.
+    """
+    simulator.instrumentation.reset()
+    result = function(*args)
+    if hasattr(result, "__next__"):
+        for _ in result: pass
+    return simulator.instrumentation.report()[phase]
+
+
+def best(runs: list, n_events = None):
+    """
+    Returns the fastest of the measurements of a benchmark, with all the wall times. If 'n_events'
+    is given, the times are divided by it (time per event).
+    """
+    fastest = min(runs, key=lambda run: run["wall_time"])
+    scale = 1. / n_events if n_events else 1.
+    return {"wall_time": fastest["wall_time"] * scale, "cpu_time": fastest["cpu_time"] * scale, \
+            "peak_rss": fastest["peak_rss"], \
+            "wall_times": [run["wall_time"] * scale for run in runs]}
+
+
+def scaling_benchmarks(args, results: dict):
+    """
+    Measures growth, reconstruction, path reconstruction and visualization for every combination
+    of generations, events and lengths.
+    """
+    for length in args.lengths:
+        table = reference(args.chromosomes, length, args.seed)
+        for n_events in args.events:
+            for n_generations in args.generations:
+                runs = {"growth": [], "run_reconstruction": [], "path_reconstructor": [], \
+                        "run_visualization": []}
+                for repeat in range(args.repeat):
+                    simulator = simulate(table, n_generations, n_events, args.tau, args.seed)
+                    runs["growth"].append(simulator.instrumentation.report()["growth"])
+                    runs["run_reconstruction"].append(measure(simulator, "reconstruction", \
+                        simulator.run_reconstruction, simulator.parent, n_generations))
+                    runs["path_reconstructor"].append(measure(simulator, "reconstruction", \
+                        simulator.path_reconstructor, [0] * n_generations))
+                    runs["run_visualization"].append(measure(simulator, "visualization", \
+                        simulator.run_visualization, simulator.parent, n_generations))
+                    n_tree_events = simulator.tree.log.size
+                    del simulator
+                for name, phase_runs in runs.items():
+                    key = f"{name}/generations={n_generations}/events={n_events:g}/length={length}"
+                    results[key] = best(phase_runs)
+                    results[key]["n_events"] = n_tree_events
+                    print(f"{key:<72}{results[key]['wall_time']:>10.4f} s")
+
+
+def event_benchmarks(args, results: dict):
+    """
+    Measures the time per event of 'reconstruct' and 'update_visual' of each event class, in
+    simulations with only that kind of event.
+    """
+    n_generations, n_events = args.event_generations, max(args.events)
+    length = args.lengths[len(args.lengths) // 2]
+    table = reference(args.chromosomes, length, args.seed)
+    for type_code, event_type in enumerate(EventLog.TYPES):
+        runs = {"reconstruct": [], "update_visual": []}
+        for repeat in range(args.repeat):
+            simulator = simulate(table, n_generations, n_events, args.tau, args.seed, \
+                                 single_type_cumulative_list(type_code))
+            runs["reconstruct"].append(measure(simulator, "reconstruction", \
+                simulator.run_reconstruction, simulator.parent, n_generations))
+            runs["update_visual"].append(measure(simulator, "visualization", \
+                simulator.run_visualization, simulator.parent, n_generations))
+            n_tree_events = simulator.tree.log.size
+            del simulator
+        for method, method_runs in runs.items():
+            key = f"event/{event_type.__name__}/{method}/generations={n_generations}/length={length}"
+            results[key] = best(method_runs, n_tree_events)
+            results[key]["n_events"] = n_tree_events
+            print(f"{key:<72}{results[key]['wall_time'] * 1e6:>10.2f} us/event")
+
+
+def compare(results: dict, baseline: dict, time_threshold: float, memory_threshold: float, \
+            min_time: float):
+    """
+    Compares the results with a baseline and prints the benchmarks whose wall time (or peak RSS)
+    grew by more than 'time_threshold' (or 'memory_threshold') times the baseline. Differences
+    of less than 'min_time' seconds are considered noise.
+
+    Returns
+    -------
+        regressions (list): names of the benchmarks with a regression.
+    """
+    regressions = []
+    print(f"\n{'benchmark':<72}{'baseline':>12}{'new':>12}{'ratio':>8}")
+    for key, result in results.items():
+        if key not in baseline: continue
+        old, new = baseline[key]["wall_time"], result["wall_time"]
+        ratio = new / old if old > 0 else float("inf")
+        flags = []
+        # the per-event times are compared with 'min_time' as total times
+        scale = result["n_events"] if key.startswith("event/") else 1
+        if ratio > 1 + time_threshold and (new - old) * scale > min_time: flags.append("TIME")
+        old_rss, new_rss = baseline[key].get("peak_rss"), result.get("peak_rss")
+        if old_rss and new_rss and new_rss > (1 + memory_threshold) * old_rss: flags.append("MEMORY")
+        if flags: regressions.append(key)
+        print(f"{key:<72}{old:>12.6f}{new:>12.6f}{ratio:>8.2f}  {' '.join(flags)}")
+    missing = [key for key in baseline if key not in results]
+    if missing: print(f"\n{len(missing)} benchmarks of the baseline were not run")
+    print(f"\n{len(regressions)} regressions")
+    for key in regressions: print(f"    {key}")
+    return regressions
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description="Benchmark suite of the simulator.")
+    parser.add_argument("--generations", type=int, nargs="+", default=[6, 8, 10], \
+                        help="numbers of generations (default: 6 8 10)")
+    parser.add_argument("--events", type=float, nargs="+", default=[1, 4], \
+                        help="average numbers of events per duplication (default: 1 4)")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[10000, 100000], \
+                        help="length of each chromosome (default: 10000 100000)")
+    parser.add_argument("--chromosomes", type=int, default=4, \
+                        help="number of chromosomes (default: 4)")
+    parser.add_argument("--event-generations", type=int, default=8, \
+                        help="generations of the per-event benchmarks (default: 8)")
+    parser.add_argument("--tau", type=float, default=100, \
+                        help="average length of the rearrangements (default: 100)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the simulations (default: 0)")
+    parser.add_argument("--repeat", type=int, default=3, \
+                        help="runs of each benchmark, the fastest is kept (default: 3)")
+    parser.add_argument("--output", default="benchmark_results.json", \
+                        help="JSON file of the results (default: benchmark_results.json)")
+    parser.add_argument("--compare", default=None, help="JSON file of the baseline results")
+    parser.add_argument("--time-threshold", type=float, default=0.2, \
+                        help="relative increase of the wall time flagged as regression (default: 0.2)")
+    parser.add_argument("--memory-threshold", type=float, default=0.2, \
+                        help="relative increase of the peak RSS flagged as regression (default: 0.2)")
+    parser.add_argument("--min-time", type=float, default=0.005, \
+                        help="increase of the wall time, in seconds, below which it is noise (default: 0.005)")
+    parser.add_argument("--skip-events", action="store_true", help="skip the per-event benchmarks")
+    args = parser.parse_args(argv)
+
+    results = {}
+    scaling_benchmarks(args, results)
+    if not args.skip_events: event_benchmarks(args, results)
+    metadata = {"date": datetime.datetime.now().isoformat(timespec="seconds"), \
+                "python": platform.python_version(), "numpy": np.__version__, \
+                "platform": platform.platform(), "arguments": vars(args)}
+    with open(args.output, "w") as f:
+        json.dump({"metadata": metadata, "results": results}, f, indent=1)
+    print(f"\nResults written to {args.output}")
+
+    if args.compare is not None:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.time_threshold, args.memory_threshold, \
+                              args.min_time)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
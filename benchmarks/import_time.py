@@ -0,0 +1,73 @@
+"""
+Import-time budget of the simulator. Each module is imported in new Python processes (as a worker
+process does) and the median of the import times is compared with the budget. It also checks that
+the heavy dependencies are not imported:
+    - 'import Simulator' must not import matplotlib (it is imported by 'Simulator.visualize');
+    - 'import Parameters' must not read the WT sequences ('chromosome_table' is read the first
+      time it is used).
+The script exits with status 1 if a module exceeds the budget or a check fails.
+
+Usage
+-----
+    python import_time.py
+    python import_time.py --budget 0.3 --repeat 9
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+CODE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "code")
+
+# run in the new processes: it prints the import time and the checked property
+PROBES = {
+    "Simulator": "import Simulator\n" \
+                 "lazy = 'matplotlib' not in sys.modules",
+    "Parameters": "import Parameters\n" \
+                  "lazy = 'chromosome_table' not in vars(Parameters)",
+}
+TEMPLATE = "import sys, time\n" \
+           "sys.path.insert(1, {code!r})\n" \
+           "start = time.perf_counter()\n" \
+           "{probe}\n" \
+           "print(time.perf_counter() - start, lazy)\n"
+
+
+def measure(module: str, repeat: int):
+    """
+    Imports 'module' in 'repeat' new processes and returns the import times and whether the
+    heavy dependencies were not loaded in every run.
+    """
+    script = TEMPLATE.format(code=os.path.abspath(CODE), probe=PROBES[module])
+    times, lazy = [], True
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, \
+                                check=True).stdout.split()
+        times.append(float(output[0]))
+        lazy &= output[1] == "True"
+    return times, lazy
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description="Import-time budget of the simulator.")
+    parser.add_argument("--budget", type=float, default=0.4, \
+                        help="maximum median import time of each module, in seconds (default: 0.4)")
+    parser.add_argument("--repeat", type=int, default=5, \
+                        help="processes importing each module (default: 5)")
+    args = parser.parse_args(argv)
+
+    failures = []
+    print(f"{'module':<14}{'median (s)':>12}{'min (s)':>10}  lazy")
+    for module in PROBES:
+        times, lazy = measure(module, args.repeat)
+        median = statistics.median(times)
+        print(f"{module:<14}{median:>12.4f}{min(times):>10.4f}  {lazy}")
+        if median > args.budget: failures.append(f"{module}: import time {median:.3f} s > {args.budget} s")
+        if not lazy: failures.append(f"{module}: heavy dependencies loaded at import")
+    for failure in failures: print(f"FAILED {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,343 @@
+import numpy as np
+from BinaryTree import Node
+from WTCell import WT_Cell
+from MutantCell import MUT_Cell
+from DNA import DNA
+from Chromosome import Chromosome
+from EventLog import EventLog
+
+
+class ArrayTree():
+    """
+    Array-backed implicit Binary Tree. Nodes are identified by an integer ID: the root (WT cell) is
+    node 0 and the children of node 'i' are the nodes '2i+1' (left) and '2i+2' (right). Instead of
+    one Cell object per node, the tree stores the chromosome lengths of all the nodes in a single
+    array, and the events of all the nodes in a single EventLog. The Cell of a node is built only
+    when it is requested (see NodeView) and it is kept in a cache until it is released.
+
+    Attributes
+    ----------
+    chromosome_table : list
+        list of tuple. Each tuple contains the chromosome ID and its sequence.
+    generations : int
+        Number of generations of the tree.
+    n_nodes : int
+        Number of nodes of the tree: 2^(generations + 1) - 1.
+    lengths : np.ndarray
+        Array (n_nodes, n_chr) of int64 containing the length of each chromosome of each node.
+    log : EventLog
+        Columnar store of the events of all the nodes.
+    event_start : np.ndarray
+        Array (n_nodes) containing, for each node ID, the first row of its events in 'log'.
+    event_stop : np.ndarray
+        Array (n_nodes) containing, for each node ID, the row following its last event in 'log'.
+    cells : dict
+        Cache of the Cell objects currently in use, indexed by node ID.
+
+    Methods
+    -------
+    left(i: int), right(i: int), parent(i: int)
+        Return the ID of the left child, right child and parent of the node 'i'.
+    generation(i: int)
+        Returns the generation of the node 'i'.
+    path(i: int)
+        Returns the path (list of 0 and 1) from the root to the node 'i'.
+    index(path: list)
+        Returns the ID of the node at the end of 'path'.
+    row(i: int)
+        Returns the row of the node 'i' in the arrays of the tree.
+    node(i: int)
+        Returns a NodeView on the node 'i'.
+    events(i: int)
+        Returns the events occurred in the node 'i'.
+    cell(i: int)
+        Returns the Cell of the node 'i', building it from the arrays if it is not in the cache.
+    store(i: int, cell: Cell)
+        Saves the chromosome lengths and the events of 'cell' in the node 'i'.
+    release(i: int)
+        Removes the Cell of the node 'i' from the cache.
+    graft(i: int, subtree: ArrayTree)
+        Copies the nodes of 'subtree' below the node 'i'.
+    subtree(i: int, n_generations: int) -> ArrayTree
+        Returns a new tree containing the node 'i' (as root) and its descendants.
+    """
+    def __init__(self, chromosome_table, n_generations: int, root_lengths = None):
+        """
+        It allocates the arrays for a complete tree of 'n_generations' generations and stores the
+        chromosome lengths of the WT cell in the root.
+
+        Parameters
+        ----------
+            chromosome_table (list): list of tuple. Each tuple contains the chromosome ID and its
+                                     sequence. It can be None if 'root_lengths' is given: in this
+                                     case the root contains a MUT_Cell.
+            n_generations (int): number of generations of the tree.
+            root_lengths (list): chromosome lengths of the root, if it is not the WT cell.
+                                 (default: None)
+        """
+        if root_lengths is None: root_lengths = [len(seq) for ID, seq in chromosome_table]
+        self.chromosome_table = chromosome_table
+        self.generations = n_generations
+        self.n_nodes = 2 ** (n_generations + 1) - 1
+        self.lengths = np.zeros((self.n_nodes, len(root_lengths)), dtype=np.int64)
+        self.lengths[0] = root_lengths
+        self.log = EventLog()
+        self.event_start = np.zeros(self.n_nodes, dtype=np.int64)
+        self.event_stop = np.zeros(self.n_nodes, dtype=np.int64)
+        self.cells = {}
+
+    @staticmethod
+    def left(i: int):
+        return 2 * i + 1
+
+    @staticmethod
+    def right(i: int):
+        return 2 * i + 2
+
+    @staticmethod
+    def parent(i: int):
+        return (i - 1) // 2
+
+    @staticmethod
+    def generation(i: int):
+        return (i + 1).bit_length() - 1
+
+    @staticmethod
+    def path(i: int):
+        """
+        Returns the path from the root to the node 'i'.
+
+        Parameters
+        ----------
+            i (int): node ID.
+
+        Returns
+        -------
+            path (list): list of 0 or 1. 0 corresponds to "left_child", 1 to "right_child".
+        """
+        generation = ArrayTree.generation(i)
+        offset = i - (2 ** generation - 1)
+        return [(offset >> (generation - 1 - g)) & 1 for g in range(generation)]
+
+    @staticmethod
+    def index(path: list):
+        """
+        Returns the ID of the node at the end of 'path'.
+
+        Parameters
+        ----------
+            path (list): list of 0 or 1. 0 corresponds to "left_child", 1 to "right_child".
+
+        Returns
+        -------
+            i (int): node ID.
+        """
+        i = 0
+        for direction in path:
+            i = 2 * i + 1 + direction
+        return i
+
+    def row(self, i: int):
+        """
+        Returns the row of the node 'i' in 'lengths', 'event_start' and 'event_stop' (the node ID
+        itself, for a complete tree).
+        """
+        return i
+
+    def node(self, i: int):
+        """
+        Returns a NodeView on the node 'i', or None if 'i' is not a node of the tree.
+        """
+        return NodeView(self, i) if i < self.n_nodes else None
+
+    def events(self, i: int):
+        """
+        Returns the events occurred in the node 'i'.
+
+        Parameters
+        ----------
+            i (int): node ID.
+
+        Returns
+        -------
+            events (EventSlice): read-only sequence of the events of the node.
+        """
+        row = self.row(i)
+        return self.log.events(int(self.event_start[row]), int(self.event_stop[row]))
+
+    def cell(self, i: int):
+        """
+        Returns the Cell of the node 'i', building it from the arrays if it is not in the cache.
+
+        Parameters
+        ----------
+            i (int): node ID.
+
+        Returns
+        -------
+            cell (Cell): WT_Cell for the root, MUT_Cell otherwise.
+        """
+        cell = self.cells.get(i)
+        if cell is None:
+            if i == 0 and self.chromosome_table is not None:
+                cell = WT_Cell(self.chromosome_table)
+            else:
+                lengths = self.lengths[self.row(i)].tolist()
+                dna = DNA([Chromosome(ID, lengths[ID - 1]) for ID in range(1, len(lengths) + 1)])
+                dna.IDs = [ID for ID in dna.IDs if lengths[ID - 1] > 0]
+                cell = MUT_Cell(dna, self.events(i), self.generation(i))
+            self.cells[i] = cell
+        return cell
+
+    def store(self, i: int, cell, rows = None):
+        """
+        Saves the chromosome lengths and the events of 'cell' in the node 'i', and puts 'cell' in
+        the cache. The events are moved to the log: 'cell.events' is replaced by a view on the log.
+
+        Parameters
+        ----------
+            i (int): node ID.
+            cell (Cell): cell contained in the node.
+            rows (np.ndarray): events of the cell already as rows of the log (dtype
+                               'EventLog.DTYPE'), used instead of 'cell.events'. (default: None)
+        """
+        row = self.row(i)
+        self.lengths[row] = [chr.length for chr in cell.DNA.CHRs]
+        if i != 0:
+            if rows is None:
+                self.event_start[row], self.event_stop[row] = self.log.extend(i, cell.events)
+            else:
+                rows["node_id"] = i
+                self.event_start[row], self.event_stop[row] = self.log.extend_rows(rows)
+            cell.events = self.events(i)
+        self.cells[i] = cell
+
+    def release(self, i: int):
+        """
+        Removes the Cell of the node 'i' from the cache. The next request of the cell will build a
+        new one, without sequences and visual arrays.
+
+        Parameters
+        ----------
+            i (int): node ID.
+        """
+        self.cells.pop(i, None)
+
+    def graft(self, i: int, subtree):
+        """
+        Copies the chromosome lengths and the events of the nodes of 'subtree' (except its root)
+        below the node 'i', which takes the place of the root of 'subtree'.
+
+        Parameters
+        ----------
+            i (int): node ID of the root of the grafted subtree.
+            subtree (ArrayTree): tree whose root corresponds to the node 'i'.
+        """
+        ids = self._descendants(i, subtree.generations)
+        self.lengths[ids[1:]] = subtree.lengths[1:]
+        rows = subtree.log.table.copy()
+        rows["node_id"] = ids[rows["node_id"]]
+        start, stop = self.log.extend_rows(rows)
+        self.event_start[ids[1:]] = subtree.event_start[1:] + start
+        self.event_stop[ids[1:]] = subtree.event_stop[1:] + start
+
+    def subtree(self, i: int, n_generations = None):
+        """
+        Returns a new tree containing the node 'i' (as root, with ID 0) and its descendants, with
+        their chromosome lengths and events. The root contains a MUT_Cell.
+
+        Parameters
+        ----------
+            i (int): node ID of the root of the subtree.
+            n_generations (int): number of generations of the subtree. If None, all the
+                                 generations below 'i'. (default: None)
+
+        Returns
+        -------
+            subtree (ArrayTree): tree of the descendants of 'i'.
+        """
+        if n_generations is None: n_generations = self.generations - self.generation(i)
+        ids = self._descendants(i, n_generations)
+        subtree = ArrayTree(None, n_generations, self.lengths[i])
+        subtree.lengths[:] = self.lengths[ids]
+        for k in range(1, subtree.n_nodes):
+            rows = self.log.table[self.event_start[ids[k]] : self.event_stop[ids[k]]].copy()
+            rows["node_id"] = k
+            subtree.event_start[k], subtree.event_stop[k] = subtree.log.extend_rows(rows)
+        return subtree
+
+    def _descendants(self, i: int, n_generations: int):
+        """
+        Returns the IDs of the node 'i' and of its descendants up to 'n_generations' generations
+        below it, in the order of the node IDs of a tree rooted in 'i'. Generation by generation
+        the descendants of a node have consecutive IDs.
+        """
+        generation, offset = self.generation(i), i - (2 ** self.generation(i) - 1)
+        ids = np.empty(2 ** (n_generations + 1) - 1, dtype=np.int64)
+        for d in range(n_generations + 1):
+            first = 2 ** (generation + d) - 1 + offset * 2 ** d
+            ids[2 ** d - 1 : 2 ** (d + 1) - 1] = np.arange(first, first + 2 ** d)
+        return ids
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["cells"] = {}
+        return state
+
+    def __repr__(self):
+        return f"ArrayTree(generations: {self.generations!r}, nodes: {self.n_nodes!r})"
+
+    def __str__(self):
+        return f"ArrayTree(generations: {self.generations}, nodes: {self.n_nodes})"
+
+
+class NodeView(Node):
+    """
+    Node-compatible view on a node of an ArrayTree. It exposes the same attributes of the class Node
+    ('data', 'generation', 'left_child', 'right_child'), reading them from the tree.
+
+    Attributes
+    ----------
+    tree: ArrayTree
+        Tree containing the node.
+    index: int
+        ID of the node in the tree.
+    """
+    def __init__(self, tree: ArrayTree, index: int):
+        """
+        It initializes the view on the node 'index' of 'tree'.
+
+        Parameters
+        ----------
+            tree (ArrayTree): tree containing the node.
+            index (int): ID of the node.
+        """
+        self.tree = tree
+        self.index = index
+
+    @property
+    def data(self):
+        return self.tree.cell(self.index)
+
+    @data.setter
+    def data(self, cell):
+        self.tree.store(self.index, cell)
+
+    @property
+    def generation(self):
+        return ArrayTree.generation(self.index)
+
+    @property
+    def left_child(self):
+        return self.tree.node(ArrayTree.left(self.index))
+
+    @property
+    def right_child(self):
+        return self.tree.node(ArrayTree.right(self.index))
+
+    def __eq__(self, other):
+        if isinstance(other, NodeView): return self.tree is other.tree and self.index == other.index
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((id(self.tree), self.index))
@@ -1,5 +1,3 @@
-import copy 
-
 class Node():
     """
     Class of the Node of a Binary Tree. By defining the node with a left attribute and a right 
@@ -33,7 +31,8 @@ class Node():
         """
         n_seqs = len(parent.data.DNA.CHRs)
         for i in range(n_seqs):
-            self.data.DNA.CHRs[i].sequence = copy.deepcopy(parent.data.DNA.CHRs[i].sequence)
+            # sequences are immutable Ropes: the doughter can share the parent's one
+            self.data.DNA.editable_chromosome(i + 1).sequence = parent.data.DNA.CHRs[i].sequence
             
     def __init__(self, data = None, generation = 0):
         """
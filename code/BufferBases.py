@@ -0,0 +1,73 @@
+class BufferBases():
+    """
+    Read-only DNA sequence stored as ASCII bytes in an external buffer (for example a block of
+    shared memory or a memory-mapped file). It can be used as a source of a Rope, like a string:
+    the bases are copied out of the buffer only when a slice of the sequence is requested.
+    The bases can be split in lines of 'line_bases' bases, each one followed by a line terminator
+    ('line_width' bytes per line, as in a FASTA file and in its '.fai' index): the terminators
+    are skipped when the bases are read.
+
+    Attributes
+    ----------
+    buffer : memoryview
+        Buffer containing the bases, one byte per base (and the line terminators, if any).
+    length : int
+        Number of bases of the sequence.
+    line_bases : int
+        Number of bases of each line. (None if the bases are contiguous)
+    line_width : int
+        Number of bytes of each line, terminator included. (None if the bases are contiguous)
+    """
+    __slots__ = ("buffer", "length", "line_bases", "line_width")
+
+    def __init__(self, buffer, offset = 0, length = None, line_bases = None, line_width = None):
+        """
+        It initializes the view on the 'length' bases of 'buffer' starting from 'offset'.
+
+        Parameters
+        ----------
+            buffer (buffer): object supporting the buffer protocol (bytes, memoryview, mmap...).
+            offset (int): position of the first base in the buffer. (default: 0)
+            length (int): number of bases. If None, all the bytes following 'offset' (only for
+                          contiguous bases). (default: None)
+            line_bases (int): number of bases of each line. (default: None, contiguous bases)
+            line_width (int): number of bytes of each line, terminator included.
+                              (default: None, contiguous bases)
+        """
+        buffer = memoryview(buffer).cast("B")
+        if length is None: length = len(buffer) - offset
+        self.length = length
+        self.line_bases, self.line_width = line_bases, line_width
+        self.buffer = buffer[offset : offset + self._byte(length - 1) + 1 if length > 0 else offset]
+
+    def _byte(self, k: int):
+        """
+        Returns the position in the buffer of the base 'k'.
+        """
+        if self.line_bases is None: return k
+        return (k // self.line_bases) * self.line_width + k % self.line_bases
+
+    @property
+    def nbytes(self):
+        return self.buffer.nbytes
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.length)
+            if step != 1: raise ValueError("BufferBases slicing does not support steps")
+            if stop <= start: return ""
+            raw = bytes(self.buffer[self._byte(start) : self._byte(stop - 1) + 1])
+            if self.line_bases is not None: raw = raw.translate(None, b"\r\n")
+            return raw.decode("ascii")
+        if key < 0: key += self.length
+        if key < 0 or key >= self.length: raise IndexError("BufferBases index out of range")
+        return chr(self.buffer[self._byte(key)])
+
+    def __str__(self):
+        return self[0 : self.length]
+
+    def __repr__(self):
+        return f"BufferBases(length: {self.length!r})"
@@ -0,0 +1,224 @@
+import json
+import struct
+import numpy as np
+from ArrayTree import ArrayTree
+from SparseTree import SparseTree
+from EventLog import EventLog
+from BufferBases import BufferBases
+from PackedBases import PackedBases
+from OnlineStatistics import OnlineStatistics
+from Instrumentation import Instrumentation
+from Simulator import Simulator
+
+
+class Checkpoint():
+    """
+    Binary checkpoint of a simulated tree, so that the growth and the reconstruction can be run
+    separately (e.g. on different machines). The file contains the WT sequences, the chromosome
+    lengths of every node, the events of every node (the rows of the EventLog), the seed from which
+    the random generators of the cells are derived and the statistics of the growth.
+
+    The file is made of a fixed preamble ('MAGIC', version as uint32, 4 reserved bytes and the
+    length of the header as uint64), a JSON header describing the content, and the arrays, each
+    one starting at a multiple of 'ALIGNMENT' bytes (offsets in the header are counted from the
+    end of the header). The arrays are read with a memory map: loading a checkpoint costs only the
+    parsing of the header, and the bases and the events are read from the disk when needed.
+
+    Methods
+    -------
+    save(simulator: Simulator, file_name: str)
+        Writes the checkpoint of a simulation.
+    read_header(file_name: str) -> dict
+        Reads only the header of a checkpoint.
+    load(file_name: str, mmap = True) -> Simulator
+        Builds a Simulator from a checkpoint, ready for the reconstruction.
+    """
+    MAGIC = b"YSIMCKPT"
+    VERSION = 1
+    ALIGNMENT = 64
+    _PREAMBLE = struct.Struct("<8sII Q")
+
+    @staticmethod
+    def _align(offset: int):
+        return -(-offset // Checkpoint.ALIGNMENT) * Checkpoint.ALIGNMENT
+
+    @staticmethod
+    def save(simulator: Simulator, file_name: str):
+        """
+        Writes the checkpoint of a simulation.
+
+        Parameters
+        ----------
+            simulator (Simulator): simulation, after the growth.
+            file_name (str): path of the checkpoint file.
+
+        Raises
+        ------
+            Exception
+                If the simulator has no WT sequences (e.g. it simulates a subtree).
+        """
+        if simulator.chromosome_table is None:
+            raise Exception(f"The simulation has no WT sequences: it cannot be saved")
+        tree = simulator.tree
+        n_nodes = tree.n_nodes
+        arrays = {"lengths": tree.lengths[: n_nodes], "event_start": tree.event_start[: n_nodes], \
+                  "event_stop": tree.event_stop[: n_nodes], "events": tree.log.table}
+        if isinstance(tree, SparseTree):
+            arrays["node_ids"] = np.array(list(tree.rows), dtype=np.int64)
+        chromosomes = []
+        for ID, seq in simulator.chromosome_table:
+            packed = isinstance(seq, PackedBases)
+            if packed:
+                arrays[f"wt_{ID}"] = np.asarray(seq.buffer, dtype=np.uint8)
+            elif isinstance(seq, BufferBases) and seq.line_bases is None:
+                arrays[f"wt_{ID}"] = np.frombuffer(seq.buffer, dtype=np.uint8)
+            else:
+                arrays[f"wt_{ID}"] = np.frombuffer(str(seq).encode("ascii"), dtype=np.uint8)
+            chromosomes.append({"ID": ID, "length": len(seq), "packed": packed})
+        statistics = simulator.statistics
+        arrays.update({"stat_mean": statistics.mean, "stat_m2": statistics.m2, \
+                       "stat_min": statistics.min, "stat_max": statistics.max, \
+                       "event_counts": statistics.event_counts})
+
+        descriptions, offset = {}, 0
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            arrays[name] = array
+            descriptions[name] = {"dtype": np.lib.format.dtype_to_descr(array.dtype), \
+                                  "shape": list(array.shape), "offset": offset}
+            offset = Checkpoint._align(offset + array.nbytes)
+        header = {"generations": simulator.generations, "sparse": isinstance(tree, SparseTree), \
+                  "seed": str(simulator.seed), "root_path": simulator.root_path, \
+                  "keep_leaves": simulator.keep_leaves, "sampled_paths": simulator.sampled_paths, \
+                  "chromosomes": chromosomes, "arrays": descriptions, \
+                  "statistics": {"n": statistics.n, "accuracy": statistics.accuracy, \
+                                 "sketches": [{"count": sketch.count, "zeros": sketch.zeros, \
+                                               "buckets": list(sketch.buckets.items())} \
+                                              for sketch in statistics.sketches]}}
+        header = json.dumps(header).encode("utf-8")
+        data_start = Checkpoint._align(Checkpoint._PREAMBLE.size + len(header))
+        with open(file_name, "wb") as f:
+            f.write(Checkpoint._PREAMBLE.pack(Checkpoint.MAGIC, Checkpoint.VERSION, 0, len(header)))
+            f.write(header)
+            for name, array in arrays.items():
+                f.seek(data_start + descriptions[name]["offset"])
+                f.write(array.tobytes())
+            f.truncate(data_start + offset)
+
+    @staticmethod
+    def _read_preamble(f):
+        """
+        Reads the preamble and the header of an open checkpoint file.
+        """
+        magic, version, _, header_length = Checkpoint._PREAMBLE.unpack(f.read(Checkpoint._PREAMBLE.size))
+        if magic != Checkpoint.MAGIC: raise Exception(f"The file is not a checkpoint")
+        if version != Checkpoint.VERSION:
+            raise Exception(f"Checkpoint version {version} not supported (supported: {Checkpoint.VERSION})")
+        header = json.loads(f.read(header_length).decode("utf-8"))
+        return header, Checkpoint._align(Checkpoint._PREAMBLE.size + header_length)
+
+    @staticmethod
+    def read_header(file_name: str):
+        """
+        Reads only the header of a checkpoint (number of generations, seed, chromosomes,
+        description of the arrays...).
+
+        Parameters
+        ----------
+            file_name (str): path of the checkpoint file.
+
+        Returns
+        -------
+            header (dict): header of the checkpoint.
+        """
+        with open(file_name, "rb") as f:
+            return Checkpoint._read_preamble(f)[0]
+
+    @staticmethod
+    def load(file_name: str, mmap = True):
+        """
+        Builds a Simulator from a checkpoint. The Simulator contains the tree, the seed and the
+        statistics of the growth, so that its cells can be reconstructed (or visualized) exactly as
+        in the simulation that was saved. The growth cannot be continued.
+
+        Parameters
+        ----------
+            file_name (str): path of the checkpoint file.
+            mmap (bool): if True the arrays are memory-mapped (copy on write), otherwise the whole
+                         file is read in memory. (default: True)
+
+        Returns
+        -------
+            simulator (Simulator): simulation saved in the checkpoint.
+        """
+        with open(file_name, "rb") as f:
+            header, data_start = Checkpoint._read_preamble(f)
+        if mmap:
+            raw = np.memmap(file_name, dtype=np.uint8, mode="c")
+        else:
+            raw = np.fromfile(file_name, dtype=np.uint8)
+        arrays = {}
+        for name, description in header["arrays"].items():
+            dtype = np.lib.format.descr_to_dtype(description["dtype"])
+            shape = tuple(description["shape"])
+            start = data_start + description["offset"]
+            nbytes = dtype.itemsize * int(np.prod(shape))
+            arrays[name] = raw[start : start + nbytes].view(dtype).reshape(shape)
+
+        chromosome_table = []
+        for chromosome in header["chromosomes"]:
+            buffer = arrays[f"wt_{chromosome['ID']}"]
+            if chromosome["packed"]:
+                seq = PackedBases(buffer=buffer, length=chromosome["length"])
+            else:
+                seq = BufferBases(buffer, 0, chromosome["length"])
+            chromosome_table.append((chromosome["ID"], seq))
+
+        tree_class = SparseTree if header["sparse"] else ArrayTree
+        tree = tree_class.__new__(tree_class)
+        tree.chromosome_table = chromosome_table
+        tree.generations = header["generations"]
+        tree.lengths = arrays["lengths"]
+        tree.event_start, tree.event_stop = arrays["event_start"], arrays["event_stop"]
+        tree.log = EventLog(0)
+        tree.log.rows, tree.log.size = arrays["events"], len(arrays["events"])
+        tree.cells = {}
+        if header["sparse"]:
+            tree.rows = {ID: row for row, ID in enumerate(arrays["node_ids"].tolist())}
+        else:
+            tree.n_nodes = len(tree.lengths)
+
+        n_chr = len(chromosome_table)
+        statistics = OnlineStatistics(n_chr, header["statistics"]["accuracy"])
+        statistics.n = header["statistics"]["n"]
+        statistics.mean, statistics.m2 = np.array(arrays["stat_mean"]), np.array(arrays["stat_m2"])
+        statistics.min, statistics.max = np.array(arrays["stat_min"]), np.array(arrays["stat_max"])
+        statistics.event_counts = np.array(arrays["event_counts"])
+        for sketch, state in zip(statistics.sketches, header["statistics"]["sketches"]):
+            sketch.count, sketch.zeros = state["count"], state["zeros"]
+            sketch.buckets = {k: n for k, n in state["buckets"]}
+
+        simulator = Simulator.__new__(Simulator)
+        simulator.chromosome_table = chromosome_table
+        simulator.tree = tree
+        simulator.parent = tree.node(0)
+        simulator.generations = header["generations"]
+        simulator.seed = int(header["seed"])
+        simulator.root_path = header["root_path"]
+        simulator.keep_leaves = header["keep_leaves"]
+        simulator.sampled_paths = header["sampled_paths"]
+        simulator.genome_cache = None
+        simulator.instrumentation = Instrumentation()
+        simulator.profiler = None
+        simulator.statistics = statistics
+        simulator.average_genome_length = statistics.mean[-1]
+        simulator.average_chromosome_length = statistics.mean[: -1]
+        simulator.chr_length_st_dev = statistics.std()[: -1]
+        simulator.leaves = []
+        if simulator.keep_leaves:
+            if simulator.sampled_paths is not None:
+                leaves = [ArrayTree.index(path) for path in simulator.sampled_paths]
+            else:
+                leaves = range(2 ** simulator.generations - 1, tree.n_nodes)
+            simulator.leaves = [tree.cell(i) for i in leaves]
+        return simulator
@@ -8,11 +8,12 @@ class Chromosome:
         ID of the considered chromosome.
     length : int
         Length of the considered chromosome.
-    visual : list 
-        Array of the same length of the chromosome sequence. It contains an integer for each DNA base 
-        in the sequence, indicating how many times that base was involved in a Rearrangement/Mutataion.
-    sequence : str
-        DNA sequence of the considered chromosome.
+    visual : Coverage 
+        Run-length encoded array of the same length of the chromosome sequence. It contains an integer
+        for each DNA base in the sequence, indicating how many times that base was involved in a
+        Rearrangement/Mutataion. The dense array is returned by 'visual.to_array()'.
+    sequence : Rope
+        DNA sequence of the considered chromosome. It is converted into a string with 'str()'.
     """
     def __init__(self, ID, length):
         """
@@ -0,0 +1,171 @@
+import numpy as np
+
+
+class Coverage():
+    """
+    Run-length encoded 'visual' array of a chromosome: the number of Rearrangements/Mutations which
+    involved each base is piecewise constant, so only the positions where it changes (breakpoints)
+    and the value of each run are stored. A Coverage is immutable: every method returns a new
+    object, so a daughter cell can share the coverage of its parent until one of its events
+    modifies it. The dense array is built only on demand, with 'to_array'.
+
+    Attributes
+    ----------
+    starts : np.ndarray
+        Sorted start positions of the runs (int64). The first run starts at 0.
+    counts : np.ndarray
+        Value of each run (uint16). Two consecutive runs never have the same value.
+    length : int
+        Number of bases covered.
+
+    Methods
+    -------
+    slice(self, start: int, stop: int) -> Coverage
+        Returns the coverage of the bases between 'start' (included) and 'stop' (excluded).
+    concatenate(parts: list) -> Coverage
+        Returns the coverage obtained joining the given coverages.
+    increment(self, start: int, stop: int, value = 1) -> Coverage
+        Returns the coverage with 'value' added to the bases between 'start' and 'stop'.
+    delete(self, start: int, stop: int) -> Coverage
+        Returns the coverage without the bases between 'start' and 'stop'.
+    insert(self, pos: int, other: Coverage) -> Coverage
+        Returns the coverage with 'other' inserted before position 'pos'.
+    max(self) -> int
+        Returns the maximum number of superposed mutations.
+    to_array(self) -> np.ndarray
+        Returns the dense array of the coverage (uint16).
+    """
+    __slots__ = ("starts", "counts", "length")
+
+    def __init__(self, length: int, value = 0):
+        """
+        It initializes a coverage of 'length' bases, all with the same value.
+
+        Parameters
+        ----------
+            length (int): number of bases.
+            value (int): value of all the bases. (default: 0)
+        """
+        self.length = int(length)
+        n_runs = 1 if self.length > 0 else 0
+        self.starts = np.zeros(n_runs, dtype=np.int64)
+        self.counts = np.full(n_runs, value, dtype=np.uint16)
+
+    @classmethod
+    def _from_runs(cls, starts, counts, length: int):
+        """
+        Builds a Coverage from its runs, merging the consecutive runs with the same value.
+        """
+        coverage = cls.__new__(cls)
+        if len(counts) > 1:
+            keep = np.concatenate(([True], counts[1:] != counts[:-1]))
+            starts, counts = starts[keep], counts[keep]
+        coverage.starts, coverage.counts, coverage.length = starts, counts, int(length)
+        return coverage
+
+    def slice(self, start: int, stop: int):
+        """
+        Returns the coverage of the bases between 'start' (included) and 'stop' (excluded). The
+        extremes are clipped to the length of the coverage.
+
+        Parameters
+        ----------
+            start (int): first base.
+            stop (int): base following the last one.
+
+        Returns
+        -------
+            coverage (Coverage): coverage of the 'stop - start' bases.
+        """
+        start, stop = max(0, start), min(self.length, stop)
+        if stop <= start: return Coverage(0)
+        first = np.searchsorted(self.starts, start, side="right") - 1
+        last = np.searchsorted(self.starts, stop, side="left")
+        starts = self.starts[first : last] - start
+        starts[0] = 0
+        return Coverage._from_runs(starts, self.counts[first : last], stop - start)
+
+    @staticmethod
+    def concatenate(parts):
+        """
+        Returns the coverage obtained joining the given coverages.
+
+        Parameters
+        ----------
+            parts (list): list of Coverage.
+
+        Returns
+        -------
+            coverage (Coverage): joined coverage.
+        """
+        parts = [part for part in parts if part.length > 0]
+        if not parts: return Coverage(0)
+        if len(parts) == 1: return parts[0]
+        offsets = np.cumsum([0] + [part.length for part in parts])
+        starts = np.concatenate([part.starts + offset for part, offset in zip(parts, offsets)])
+        counts = np.concatenate([part.counts for part in parts])
+        return Coverage._from_runs(starts, counts, offsets[-1])
+
+    def increment(self, start: int, stop: int, value = 1):
+        """
+        Returns the coverage with 'value' added to the bases between 'start' (included) and 'stop'
+        (excluded).
+
+        Parameters
+        ----------
+            start (int): first base.
+            stop (int): base following the last one.
+            value (int): increment. (default: 1)
+
+        Returns
+        -------
+            coverage (Coverage): incremented coverage.
+        """
+        middle = self.slice(start, stop)
+        if middle.length == 0: return self
+        middle = Coverage._from_runs(middle.starts, middle.counts + np.uint16(value), middle.length)
+        return Coverage.concatenate((self.slice(0, start), middle, self.slice(stop, self.length)))
+
+    def delete(self, start: int, stop: int):
+        """
+        Returns the coverage without the bases between 'start' (included) and 'stop' (excluded).
+        """
+        return Coverage.concatenate((self.slice(0, start), self.slice(stop, self.length)))
+
+    def insert(self, pos: int, other):
+        """
+        Returns the coverage with 'other' inserted before position 'pos'.
+        """
+        return Coverage.concatenate((self.slice(0, pos), other, self.slice(pos, self.length)))
+
+    def max(self):
+        """
+        Returns the maximum number of superposed mutations (0 for an empty coverage).
+        """
+        return int(self.counts.max()) if len(self.counts) else 0
+
+    def to_array(self):
+        """
+        Returns the dense array of the coverage, one element per base.
+
+        Returns
+        -------
+            visual (np.ndarray): number of superposed mutations of each base (uint16).
+        """
+        run_lengths = np.diff(np.append(self.starts, self.length))
+        return np.repeat(self.counts, run_lengths)
+
+    def __array__(self, dtype = None, copy = None):
+        array = self.to_array()
+        return array if dtype is None else array.astype(dtype)
+
+    def __getitem__(self, pos: int):
+        if pos < 0: pos += self.length
+        if pos < 0 or pos >= self.length: raise IndexError("Coverage index out of range")
+        return int(self.counts[np.searchsorted(self.starts, pos, side="right") - 1])
+
+    def __len__(self):
+        return self.length
+
+    def __repr__(self):
+        return f"Coverage(length: {self.length!r}, runs: {len(self.counts)!r}, max: {self.max()!r})"
@@ -1,6 +1,10 @@
+import copy
+
 class DNA:
     """
-    DNA Class
+    DNA Class. Copies of a DNA object are copy-on-write: they share the Chromosome objects and the
+    list of IDs with the original one, and a chromosome (or the list of IDs) is copied only when it
+    is modified through 'editable_chromosome' (or 'remove_ID').
     
     Attributes
     ----------
@@ -8,6 +12,15 @@ class DNA:
         List containing the chromosomes of the cell.
     IDs : list
         List containing the IDs of the chromosome currently present in the cell.
+
+    Methods
+    -------
+    copy(self)
+        Returns a copy-on-write copy of the DNA.
+    editable_chromosome(self, ID: int)
+        Returns the chromosome with the given ID, copying it first if it is shared with another DNA.
+    remove_ID(self, ID: int)
+        Removes the given ID from the IDs of the chromosomes present in the cell.
     """
     def __init__(self, chromosomes):
         """
@@ -19,9 +32,56 @@ class DNA:
         """
         self.CHRs = chromosomes
         self.IDs = list(range(1, len(chromosomes) + 1))
+        self._owned = set(range(len(chromosomes)))
+        self._owned_IDs = True
+
+    def copy(self):
+        """
+        Returns a copy-on-write copy of the DNA. Both the copy and the original DNA lose the
+        ownership of their chromosomes, which are copied again by the first of the two DNA objects
+        that modifies them.
+
+        Returns
+        -------
+            dna (DNA): copy of the DNA.
+        """
+        dna = DNA.__new__(DNA)
+        dna.CHRs, dna.IDs = list(self.CHRs), self.IDs
+        dna._owned, dna._owned_IDs = set(), False
+        self._owned, self._owned_IDs = set(), False
+        return dna
+
+    def editable_chromosome(self, ID: int):
+        """
+        Returns the chromosome with the given ID, copying it first if it is shared with another DNA.
+
+        Parameters
+        ----------
+            ID (int): ID of the chromosome.
+
+        Returns
+        -------
+            chr (Chromosome): chromosome owned by this DNA, which can be modified.
+        """
+        if ID - 1 not in self._owned:
+            self.CHRs[ID - 1] = copy.copy(self.CHRs[ID - 1])
+            self._owned.add(ID - 1)
+        return self.CHRs[ID - 1]
+
+    def remove_ID(self, ID: int):
+        """
+        Removes the given ID from the IDs of the chromosomes present in the cell.
+
+        Parameters
+        ----------
+            ID (int): ID of the removed chromosome.
+        """
+        if not self._owned_IDs:
+            self.IDs, self._owned_IDs = list(self.IDs), True
+        self.IDs.remove(ID)
 
     def __repr__(self):
         return f"DNA(number of chromosomes: {len(self.CHRs)!r})"
 
     def __str__(self):
-        return f"Cell(number of chromosomes: {len(self.CHRs)})"
\ No newline at end of file
+        return f"Cell(number of chromosomes: {len(self.CHRs)})"
@@ -1,6 +1,5 @@
 from Rearrangement import Rearrangement
 from BinaryTree import Node
-import numpy as np
 
 
 class Deletion(Rearrangement):
@@ -21,28 +20,33 @@ class Deletion(Rearrangement):
     Methods
     -------
     update_visual(self, chr: Chromosome):
-        Updates the "visual" array of the chromosome.
-    reconstruct(self, node: Node):
+        Updates the "visual" coverage (Coverage) of the chromosome.
+    reconstruct(self, node: Node, rng = None):
         Reconstruction of the DNA sequence involved in the current Deletion, of the considered
         cell.
+    row(self) -> tuple
+        Returns the columns (chr_a, chr_b, pos, length, final_pos) of the event in the EventLog.
+    from_row(cls, chr_a, chr_b, pos, length, final_pos)
+        Builds the event from its columns in the EventLog.
     """
+    __slots__ = ("ChrID", "Pos", "Length")
+    SubKind = "Deletion"
+    type_code = 0
+
     def update_visual(self, node: Node):
         """
-        Updates the "visual" array of the chromosome.
+        Updates the "visual" coverage (Coverage) of the chromosome.
 
         Parameters
         ----------
             chr (Chromosome): chromosome involved in the Deletion.
         """
         chr = node.data.DNA.CHRs[self.ChrID - 1]
-        new_vis = np.concatenate((chr.visual[: self.Pos], chr.visual[self.Pos + self.Length :]))
-        #if len(new_vis) != chr.length: raise Exception(f"visual {len(new_vis)}, chr {chr.length}")
-        if self.Pos - 1 >= 0: 
-            new_vis[self.Pos - 1] += 1
-        if self.Pos  < len(new_vis): new_vis[self.Pos] += 1
-        chr.visual = new_vis
-
-    def reconstruct(self, node: Node):
+        new_vis = chr.visual.delete(self.Pos, self.Pos + self.Length)
+        # the bases on both sides of the breakpoint (if present)
+        chr.visual = new_vis.increment(self.Pos - 1, self.Pos + 1)
+
+    def reconstruct(self, node: Node, rng = None):
         """
         Reconstruction of the DNA sequence involved in the current Deletion, in the considered
         cell. It takes the old sequence, and modifies it in order to add the Deletion.
@@ -50,9 +54,10 @@ class Deletion(Rearrangement):
         Parameters
         ----------
             node (Node): node containing the involved cell.
+            rng (np.random.Generator): random generator of the node (not used).
         """
-        chrID, init_pos, final_pos = self.ChrID, self.Pos, self.Pos + self.Length
-        node.data.DNA.CHRs[chrID - 1].sequence = node.data.DNA.CHRs[chrID - 1].sequence[ : init_pos] +  node.data.DNA.CHRs[chrID - 1].sequence[final_pos : ]
+        chr = node.data.DNA.CHRs[self.ChrID - 1]
+        chr.sequence = chr.sequence.delete(self.Pos, self.Length)
     
 
 
@@ -74,17 +79,37 @@ class Deletion(Rearrangement):
             visual (bool): True if the visualizaiton is active. False if not.
         """
         super().__init__()
-        self.SubKind = "Deletion"
         self.ChrID = ChrID
         self.Pos = Pos
         self.Length = Length
         if cell != None:
             cell.events.append(self)
-            cell.DNA.CHRs[ChrID - 1].length -= self.Length
+            cell.DNA.editable_chromosome(ChrID).length -= self.Length
             if cell.DNA.CHRs[ChrID - 1].length == 0:
-                cell.DNA.IDs.remove(ChrID)
+                cell.DNA.remove_ID(ChrID)
                 print(f"(generation: {cell.generation}) Chromosome {ChrID} has been removed! \n The event was a {self}.\n")
                 
+    def row(self):
+        """
+        Returns the columns of the event in the EventLog.
+
+        Returns
+        -------
+            row (tuple): (chr_a, chr_b, pos, length, final_pos).
+        """
+        return (self.ChrID, 0, self.Pos, self.Length, 0)
+
+    @classmethod
+    def from_row(cls, chr_a, chr_b, pos, length, final_pos):
+        """
+        Builds the event from its columns in the EventLog, without adding it to any cell.
+
+        Parameters
+        ----------
+            chr_a (int), chr_b (int), pos (int), length (int), final_pos (int): columns of the event.
+        """
+        return cls(chr_a, pos, length)
+
     def __repr__(self):
         return f"Event->{self.kind}->{self.SubKind}(ChrId: {self.ChrID!r}, Pos: {self.Pos!r}, Length: {self.Length!r})"
 
@@ -1,6 +1,5 @@
 from Rearrangement import Rearrangement
 from BinaryTree import Node
-import numpy as np
 
 class Duplication(Rearrangement):
     """
@@ -22,26 +21,33 @@ class Duplication(Rearrangement):
     Methods
     -------
     update_visual(self, chr: Chromosome):
-        Updates the "visual" array of the chromosome.
-    reconstruct(self, node: Node):
+        Updates the "visual" coverage (Coverage) of the chromosome.
+    reconstruct(self, node: Node, rng = None):
         Reconstruction of the DNA sequence involved in the current Duplication, of the considered
         cell.
+    row(self) -> tuple
+        Returns the columns (chr_a, chr_b, pos, length, final_pos) of the event in the EventLog.
+    from_row(cls, chr_a, chr_b, pos, length, final_pos)
+        Builds the event from its columns in the EventLog.
     """
+    __slots__ = ("ChrID", "InitPos", "Length", "FinalPos")
+    SubKind = "Duplication"
+    type_code = 4
+
     def update_visual(self, node: Node):
         """
-        Updates the "visual" array of the chromosome.
+        Updates the "visual" coverage (Coverage) of the chromosome.
 
         Parameters
         ----------
             chr (Chromosome): chromosome involeved in the Deletion.
         """
         chr = node.data.DNA.CHRs[self.ChrID - 1]
-        duplicated = chr.visual[self.InitPos : self.InitPos + self.Length] + 1
-        new_vis = np.concatenate((chr.visual[: self.FinalPos], duplicated, chr.visual[self.FinalPos :]))
-        #if len(new_vis) != chr.length: raise Exception(f"visual {len(new_vis)}, chr {chr.length}")
-        chr.visual = new_vis
+        duplicated = chr.visual.slice(self.InitPos, self.InitPos + self.Length)
+        duplicated = duplicated.increment(0, duplicated.length)
+        chr.visual = chr.visual.insert(self.FinalPos, duplicated)
 
-    def reconstruct(self, node: Node):
+    def reconstruct(self, node: Node, rng = None):
         """
         Reconstruction of the DNA sequence involved in the current Duplication, in the considered
         cell. It takes the old sequence, and modifies it in order to add the Duplication.
@@ -49,12 +55,11 @@ class Duplication(Rearrangement):
         Parameters
         ----------
             node (Node): node containing the involved cell.
+            rng (np.random.Generator): random generator of the node (not used).
         """
-        chrID, init_pos, end_pos, final_pos = self.ChrID, self.InitPos, self.InitPos + self.Length,\
-                                              self.FinalPos
-        dupl_seq = node.data.DNA.CHRs[chrID - 1].sequence[init_pos : end_pos]
-        node.data.DNA.CHRs[chrID - 1].sequence = node.data.DNA.CHRs[chrID - 1].sequence[ : final_pos]  \
-            + dupl_seq + node.data.DNA.CHRs[chrID - 1].sequence[final_pos : ]
+        chr = node.data.DNA.CHRs[self.ChrID - 1]
+        dupl_seq = chr.sequence.copy_range(self.InitPos, self.InitPos + self.Length)
+        chr.sequence = chr.sequence.insert(self.FinalPos, dupl_seq)
     
     def __init__(self, ChrID :int, InitPos :int, Length :int, FinalPos :int, cell = None, visual = False):
         """
@@ -71,16 +76,36 @@ class Duplication(Rearrangement):
             visual (bool): True if the visualizaiton is active. False if not.
         """
         super().__init__()
-        self.SubKind = "Duplication"
         self.ChrID = ChrID
         self.InitPos = InitPos
         self.Length = Length
         self.FinalPos = FinalPos
         if cell != None:
             cell.events.append(self)
-            cell.DNA.CHRs[ChrID - 1].length += self.Length
+            cell.DNA.editable_chromosome(ChrID).length += self.Length
             
 
+    def row(self):
+        """
+        Returns the columns of the event in the EventLog.
+
+        Returns
+        -------
+            row (tuple): (chr_a, chr_b, pos, length, final_pos).
+        """
+        return (self.ChrID, 0, self.InitPos, self.Length, self.FinalPos)
+
+    @classmethod
+    def from_row(cls, chr_a, chr_b, pos, length, final_pos):
+        """
+        Builds the event from its columns in the EventLog, without adding it to any cell.
+
+        Parameters
+        ----------
+            chr_a (int), chr_b (int), pos (int), length (int), final_pos (int): columns of the event.
+        """
+        return cls(chr_a, pos, length, final_pos)
+
     def __repr__(self):
         return f"Event->{self.kind}->{self.SubKind}(ChrId: {self.ChrID!r}, InitPos: {self.InitPos!r}, Length: {self.Length!r}, FinalPos: {self.FinalPos!r})"
 
@@ -0,0 +1,97 @@
+from bisect import bisect_left, bisect_right
+import numpy as np
+from LengthDistribution import LengthDistribution
+
+
+class EmpiricalLength(LengthDistribution):
+    """
+    Empirical (discrete) distribution of lengths, for example a measured spectrum of structural
+    variant lengths. The inverse of the cumulative distribution function is precomputed as a table
+    (the sorted lengths and their cumulative probabilities), so that drawing a length truncated to
+    ['low', 'high') costs three binary searches. The table is also kept as Python lists, searched
+    with 'bisect' by 'scalar_ppf' (which is called once per event, where NumPy calls are slow).
+
+    Attributes
+    ----------
+    values : np.ndarray
+        Sorted distinct lengths (int64).
+    cumulative : np.ndarray
+        'cumulative[k]' is the probability of the lengths smaller than 'values[k]' (the last
+        element is 1).
+
+    Methods
+    -------
+    from_file(file_name: str) -> EmpiricalLength
+        Reads the lengths from a text file.
+    """
+    __slots__ = ("values", "cumulative", "_values", "_cumulative")
+
+    def __init__(self, lengths, weights = None):
+        """
+        It builds the inverse cumulative distribution table from the observed lengths.
+
+        Parameters
+        ----------
+            lengths (list): observed lengths (positive integers).
+            weights (list): weight (e.g. number of observations) of each length. (default: None,
+                            all the lengths have the same weight)
+
+        Raises
+        ------
+            Exception
+                If there are no lengths, or some of them are not positive.
+        """
+        lengths = np.asarray(lengths, dtype=np.int64)
+        if len(lengths) == 0: raise Exception(f"The empirical distribution has no lengths")
+        if lengths.min() <= 0: raise Exception(f"The lengths must be positive")
+        weights = np.ones(len(lengths)) if weights is None else np.asarray(weights, dtype=float)
+        self.values, inverse = np.unique(lengths, return_inverse=True)
+        mass = np.bincount(inverse, weights=weights)
+        self.cumulative = np.concatenate(([0.], np.cumsum(mass) / mass.sum()))
+        self._values, self._cumulative = self.values.tolist(), self.cumulative.tolist()
+
+    @classmethod
+    def from_file(cls, file_name: str):
+        """
+        Reads the lengths from a text file. Each line contains one length, optionally followed by
+        its weight (separated by spaces, tabs or a comma). Empty lines and lines starting with '#'
+        are ignored.
+
+        Parameters
+        ----------
+            file_name (str): path of the file.
+
+        Returns
+        -------
+            distribution (EmpiricalLength): distribution of the lengths in the file.
+        """
+        lengths, weights = [], []
+        with open(file_name, "r") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"): continue
+                columns = line.replace(",", " ").split()
+                lengths.append(int(float(columns[0])))
+                weights.append(float(columns[1]) if len(columns) > 1 else 1.)
+        return cls(lengths, weights)
+
+    def ppf(self, u, low, high):
+        first = np.searchsorted(self.values, low, side="left")
+        last = np.searchsorted(self.values, high, side="left")
+        before, upto = self.cumulative[first], self.cumulative[last]
+        k = np.searchsorted(self.cumulative, before + u * (upto - before), side="right") - 1
+        k = np.clip(k, first, np.maximum(last - 1, first))
+        k = np.minimum(k, len(self.values) - 1)
+        # if no length falls in the domain, the closest extreme of the domain is used
+        return np.clip(self.values[k], low, np.asarray(high) - 1).astype(np.int64)
+
+    def scalar_ppf(self, u: float, low: int, high: int):
+        values, cumulative = self._values, self._cumulative
+        first, last = bisect_left(values, low), bisect_left(values, high)
+        before, upto = cumulative[first], cumulative[last]
+        k = bisect_right(cumulative, before + u * (upto - before)) - 1
+        k = min(max(k, first), max(last - 1, first), len(values) - 1)
+        return min(max(values[k], low), high - 1)
+
+    def __repr__(self):
+        return f"EmpiricalLength(lengths: {len(self.values)!r})"
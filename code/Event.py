@@ -12,11 +12,14 @@ class Event:
         Rearrangement
         Mutation
     """
+    # events are stored as rows of the EventLog: the objects are light flyweights without __dict__
+    __slots__ = ()
+    kind = None
+
     def __init__(self):
         """
-        It initializes the event kind to 'None'.
+        The event kind is a class attribute: nothing to initialize.
         """
-        self.kind = None
 
     def __repr__(self):
         return f"Event(Kind: {self.kind!r})"
@@ -0,0 +1,205 @@
+import numpy as np
+from Deletion import Deletion
+from Insertion import Insertion
+from Translocation import Translocation
+from ReciprocalTranslocation import ReciprocalTranslocation
+from Duplication import Duplication
+from PointwiseInsertion import PointInsertion
+from PointwiseDeletion import PointDeletion
+from PointwiseReplacement import PointReplacement
+
+
+class EventLog():
+    """
+    Columnar store of all the events of a simulation. Each event is one row of a NumPy structured
+    array (25 bytes per event) with the columns:
+        node_id : ID of the node (see ArrayTree) in which the event occurred;
+        type_code : kind of event, index in 'EventLog.TYPES' (same order of 'cumulative_list');
+        chr_a : ID of the involved chromosome (the first one for Reciprocal Translocations);
+        chr_b : ID of the second chromosome of a Reciprocal Translocation (0 otherwise);
+        pos : position (initial position) of the event;
+        length : number of bases involved (1 for Pointwise Mutations);
+        final_pos : final position of Translocations and Duplications (0 otherwise).
+    Event objects are built from the rows only when they are requested, so that the whole log can
+    also be analysed with vectorised operations on 'EventLog.table'.
+
+    Attributes
+    ----------
+    TYPES : list
+        Event classes ordered by 'type_code'.
+    DTYPE : np.dtype
+        dtype of the rows.
+    rows : np.ndarray
+        Structured array containing the rows (only the first 'size' rows are used).
+    size : int
+        Number of events in the log.
+
+    Methods
+    -------
+    append(self, node_id: int, event: Event) -> int
+        Adds one event to the log and returns its row number.
+    extend(self, node_id: int, events: list) -> (int, int)
+        Adds a list of events to the log and returns the range of the rows.
+    extend_rows(self, rows: np.ndarray) -> (int, int)
+        Adds already built rows to the log and returns their range.
+    event(self, k: int) -> Event
+        Builds the event of the row 'k'.
+    events(self, start: int, stop: int) -> EventSlice
+        Returns a read-only sequence of the events of the rows between 'start' and 'stop'.
+    """
+    TYPES = [Deletion, Insertion, Translocation, ReciprocalTranslocation, Duplication, \
+             PointInsertion, PointDeletion, PointReplacement]
+    DTYPE = np.dtype([("node_id", np.int64), ("type_code", np.int8), ("chr_a", np.int16), \
+                      ("chr_b", np.int16), ("pos", np.uint32), ("length", np.uint32), \
+                      ("final_pos", np.uint32)])
+
+    def __init__(self, capacity = 1024):
+        """
+        It allocates the rows of the log.
+
+        Parameters
+        ----------
+            capacity (int): number of rows initially allocated. The log grows automatically.
+                            (default: 1024)
+        """
+        self.rows = np.zeros(capacity, dtype=EventLog.DTYPE)
+        self.size = 0
+
+    @property
+    def table(self):
+        """
+        Structured array of the events in the log (view, without copy).
+        """
+        return self.rows[: self.size]
+
+    def _reserve(self, n: int):
+        if self.size + n > len(self.rows):
+            rows = np.zeros(max(2 * len(self.rows), self.size + n), dtype=EventLog.DTYPE)
+            rows[: self.size] = self.rows[: self.size]
+            self.rows = rows
+
+    def append(self, node_id: int, event):
+        """
+        Adds one event to the log.
+
+        Parameters
+        ----------
+            node_id (int): ID of the node in which the event occurred.
+            event (Event): event to be added.
+
+        Returns
+        -------
+            k (int): row of the event.
+        """
+        self._reserve(1)
+        self.rows[self.size] = (node_id, event.type_code) + event.row()
+        self.size += 1
+        return self.size - 1
+
+    def extend(self, node_id: int, events):
+        """
+        Adds a list of events to the log.
+
+        Parameters
+        ----------
+            node_id (int): ID of the node in which the events occurred.
+            events (list): events to be added.
+
+        Returns
+        -------
+            start (int), stop (int): range of the rows of the added events.
+        """
+        start = self.size
+        self._reserve(len(events))
+        for event in events:
+            self.rows[self.size] = (node_id, event.type_code) + event.row()
+            self.size += 1
+        return start, self.size
+
+    def extend_rows(self, rows):
+        """
+        Adds already built rows (for example the events of another log) to the log.
+
+        Parameters
+        ----------
+            rows (np.ndarray): structured array with dtype 'EventLog.DTYPE'.
+
+        Returns
+        -------
+            start (int), stop (int): range of the added rows.
+        """
+        start = self.size
+        self._reserve(len(rows))
+        self.rows[start : start + len(rows)] = rows
+        self.size += len(rows)
+        return start, self.size
+
+    def event(self, k: int):
+        """
+        Builds the event of the row 'k'.
+
+        Parameters
+        ----------
+            k (int): row number.
+
+        Returns
+        -------
+            event (Event): event of the row, not linked to any cell.
+        """
+        node_id, type_code, chr_a, chr_b, pos, length, final_pos = self.rows[k].tolist()
+        return EventLog.TYPES[type_code].from_row(chr_a, chr_b, pos, length, final_pos)
+
+    def events(self, start: int, stop: int):
+        """
+        Returns a read-only sequence of the events of the rows between 'start' (included) and
+        'stop' (excluded).
+        """
+        return EventSlice(self, start, stop)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["rows"] = self.table.copy()
+        return state
+
+    def __len__(self):
+        return self.size
+
+    def __repr__(self):
+        return f"EventLog(events: {self.size!r}, bytes: {self.table.nbytes!r})"
+
+
+class EventSlice():
+    """
+    Read-only sequence of consecutive events of an EventLog. It is used as 'MUT_Cell.events': the
+    event objects are built while iterating, and are not kept in memory.
+
+    Attributes
+    ----------
+    log : EventLog
+        Log containing the events.
+    start : int
+        First row of the sequence.
+    stop : int
+        Row following the last one of the sequence.
+    """
+    __slots__ = ("log", "start", "stop")
+
+    def __init__(self, log: EventLog, start: int, stop: int):
+        self.log = log
+        self.start = start
+        self.stop = stop
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def __iter__(self):
+        for k in range(self.start, self.stop):
+            yield self.log.event(k)
+
+    def __getitem__(self, i: int):
+        if i < 0: i += len(self)
+        if i < 0 or i >= len(self): raise IndexError("event index out of range")
+        return self.log.event(self.start + i)
+
+    def __repr__(self):
+        return f"{list(self)!r}"
@@ -0,0 +1,190 @@
+import time
+from EventLog import EventLog
+from Coverage import Coverage
+from Rope import Rope
+
+
+class EventProfiler():
+    """
+    Opt-in profiler of the events of a simulation. For each stage ('growth': creation of the
+    events in 'Simulator.sample_events', 'reconstruct' and 'update_visual'), kind of event and
+    generation it counts the calls, their cumulative time (nanoseconds) and the bytes they copied:
+        growth: the row of the event in the EventLog;
+        reconstruct: the new pieces of the Ropes of the chromosomes modified by the event, and the
+                     new bases they contain (the pieces shared with the old sequence are not
+                     copied);
+        update_visual: the new Coverage arrays of the chromosomes modified by the event.
+    The bytes are computed outside of the timed calls. The Simulator calls the profiler only when
+    it is enabled ('Simulator(..., profile=True)'), so that it costs nothing otherwise.
+
+    Attributes
+    ----------
+    counters : dict
+        List [calls, nanoseconds, bytes] indexed by tuple (stage, type_code, generation).
+
+    Methods
+    -------
+    add(self, stage: str, type_code: int, generation: int, nanoseconds: int, nbytes = 0)
+        Adds one call to the counters.
+    reconstruct(self, node: Node, rng)
+        Applies the events of the cell in 'node' to its sequences, measuring each of them.
+    update_visual(self, node: Node)
+        Applies the events of the cell in 'node' to its coverages, measuring each of them.
+    merge(self, other, generation_offset = 0)
+        Adds the counters of another profiler.
+    table(self, by_generation = False) -> list
+        Returns the profile table.
+    reset(self)
+        Removes all the counters.
+    """
+    ROW_BYTES = EventLog.DTYPE.itemsize
+
+    def __init__(self):
+        """
+        It initializes empty counters.
+        """
+        self.counters = {}
+
+    def add(self, stage: str, type_code: int, generation: int, nanoseconds: int, nbytes = 0):
+        """
+        Adds one call to the counters of (stage, type_code, generation).
+
+        Parameters
+        ----------
+            stage (str): 'growth', 'reconstruct' or 'update_visual'.
+            type_code (int): kind of event (index in EventLog.TYPES).
+            generation (int): generation of the cell.
+            nanoseconds (int): duration of the call.
+            nbytes (int): bytes copied by the call. (default: 0)
+        """
+        counter = self.counters.get((stage, type_code, generation))
+        if counter is None: counter = self.counters[(stage, type_code, generation)] = [0, 0, 0]
+        counter[0] += 1
+        counter[1] += nanoseconds
+        counter[2] += nbytes
+
+    @staticmethod
+    def _copied_bytes(old, new):
+        """
+        Returns the bytes of 'new' (Rope or Coverage) which are not shared with 'old'.
+        """
+        if new is old: return 0
+        if isinstance(new, Coverage): return new.starts.nbytes + new.counts.nbytes
+        if not isinstance(new, Rope): return 0
+        old_nodes, old_sources, stack = set(), set(), [old.root if isinstance(old, Rope) else None]
+        while stack:
+            node = stack.pop()
+            if node is None: continue
+            old_nodes.add(id(node))
+            old_sources.add(id(node.source))
+            stack += [node.left, node.right]
+        nbytes, stack = 0, [new.root]
+        while stack:
+            node = stack.pop()
+            if node is None or id(node) in old_nodes: continue
+            nbytes += Rope.PIECE_BYTES
+            if id(node.source) not in old_sources and isinstance(node.source, str):
+                nbytes += node.length
+            stack += [node.left, node.right]
+        return nbytes
+
+    def reconstruct(self, node, rng):
+        """
+        Applies the events of the cell in 'node' to its sequences (as in
+        'Simulator.single_doughter_reconstructor'), measuring each of them.
+
+        Parameters
+        ----------
+            node (Node): node of the cell, whose sequences are a copy of the parent ones.
+            rng (np.random.Generator): random generator of the node.
+        """
+        CHRs = node.data.DNA.CHRs
+        for event in node.data.events:
+            before = [chr.sequence for chr in CHRs]
+            start = time.perf_counter_ns()
+            event.reconstruct(node, rng)
+            nanoseconds = time.perf_counter_ns() - start
+            nbytes = sum(self._copied_bytes(old, chr.sequence) for old, chr in zip(before, CHRs))
+            self.add("reconstruct", event.type_code, node.generation, nanoseconds, nbytes)
+
+    def update_visual(self, node):
+        """
+        Applies the events of the cell in 'node' to its coverages (as in
+        'Simulator.run_visualization'), measuring each of them.
+
+        Parameters
+        ----------
+            node (Node): node of the cell, whose coverages are the parent ones.
+        """
+        CHRs = node.data.DNA.CHRs
+        for event in node.data.events:
+            before = [chr.visual for chr in CHRs]
+            start = time.perf_counter_ns()
+            event.update_visual(node)
+            nanoseconds = time.perf_counter_ns() - start
+            nbytes = sum(self._copied_bytes(old, chr.visual) for old, chr in zip(before, CHRs))
+            self.add("update_visual", event.type_code, node.generation, nanoseconds, nbytes)
+
+    def merge(self, other, generation_offset = 0):
+        """
+        Adds the counters of another profiler, e.g. of a subtree simulated in a worker process.
+
+        Parameters
+        ----------
+            other (EventProfiler): profiler to add.
+            generation_offset (int): generation, in this simulation, of the root of the cells
+                                     measured by 'other'. (default: 0)
+        """
+        for (stage, type_code, generation), (calls, nanoseconds, nbytes) in other.counters.items():
+            key = (stage, type_code, generation + generation_offset)
+            counter = self.counters.get(key)
+            if counter is None: counter = self.counters[key] = [0, 0, 0]
+            counter[0] += calls
+            counter[1] += nanoseconds
+            counter[2] += nbytes
+
+    def table(self, by_generation = False):
+        """
+        Returns the profile table, sorted from the most to the least expensive row.
+
+        Parameters
+        ----------
+            by_generation (bool): if True there is one row for each generation, otherwise the
+                                  generations are summed. (default: False)
+
+        Returns
+        -------
+            table (list): list of dict with keys 'stage', 'event' (name of the event class),
+                          'generation' (only if 'by_generation'), 'calls', 'nanoseconds',
+                          'bytes' and 'ns_per_call'.
+        """
+        rows = {}
+        for (stage, type_code, generation), (calls, nanoseconds, nbytes) in self.counters.items():
+            key = (stage, type_code, generation) if by_generation else (stage, type_code)
+            row = rows.get(key)
+            if row is None:
+                row = rows[key] = {"stage": stage, "event": EventLog.TYPES[type_code].__name__, \
+                                   "calls": 0, "nanoseconds": 0, "bytes": 0}
+                if by_generation: row["generation"] = generation
+            row["calls"] += calls
+            row["nanoseconds"] += nanoseconds
+            row["bytes"] += nbytes
+        for row in rows.values(): row["ns_per_call"] = row["nanoseconds"] / row["calls"]
+        return sorted(rows.values(), key=lambda row: row["nanoseconds"], reverse=True)
+
+    def reset(self):
+        """
+        Removes all the counters.
+        """
+        self.counters = {}
+
+    def __str__(self):
+        lines = [f"{'stage':<15}{'event':<25}{'calls':>10}{'total (ms)':>13}{'ns/call':>11}{'Kb':>11}"]
+        for row in self.table():
+            lines.append(f"{row['stage']:<15}{row['event']:<25}{row['calls']:>10}" + \
+                         f"{row['nanoseconds'] / 1e6:>13.3f}{row['ns_per_call']:>11.0f}" + \
+                         f"{row['bytes'] / 1024:>11.1f}")
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return f"EventProfiler(rows: {len(self.counters)!r})"
@@ -0,0 +1,110 @@
+from collections import OrderedDict
+
+
+class GenomeCache():
+    """
+    Least Recently Used cache of reconstructed genomes (the chromosome sequences of a cell),
+    indexed by node ID, with a bound on the memory they use. When a new genome does not fit in
+    'byte_budget', the genomes used least recently are removed.
+
+    Attributes
+    ----------
+    byte_budget : int
+        Maximum memory (in bytes, as estimated by 'Rope.nbytes') of the cached genomes.
+    nbytes : int
+        Memory of the cached genomes.
+    genomes : OrderedDict
+        Cached genomes (list of sequences, memory) indexed by node ID, from the least to the most
+        recently used.
+    hits, misses : int
+        Number of requested genomes found and not found in the cache.
+
+    Methods
+    -------
+    get(self, index: int) -> list
+        Returns the genome of the node 'index', or None if it is not in the cache.
+    put(self, index: int, sequences: list)
+        Adds the genome of the node 'index' to the cache.
+    resize(self, byte_budget: int)
+        Changes the memory bound, removing the genomes in excess.
+    clear(self)
+        Removes all the genomes.
+    """
+    def __init__(self, byte_budget: int):
+        """
+        It initializes an empty cache.
+
+        Parameters
+        ----------
+            byte_budget (int): maximum memory (in bytes) of the cached genomes.
+        """
+        self.byte_budget = byte_budget
+        self.nbytes = 0
+        self.genomes = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, index: int):
+        """
+        Returns the genome of the node 'index' and marks it as the most recently used.
+
+        Parameters
+        ----------
+            index (int): node ID.
+
+        Returns
+        -------
+            sequences (list): sequence of each chromosome, or None if the genome is not cached.
+        """
+        entry = self.genomes.get(index)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.genomes.move_to_end(index)
+        return entry[0]
+
+    def put(self, index: int, sequences: list):
+        """
+        Adds the genome of the node 'index' to the cache, removing the least recently used genomes
+        if the memory bound is exceeded. A genome larger than the whole budget is not cached.
+
+        Parameters
+        ----------
+            index (int): node ID.
+            sequences (list): sequence (Rope) of each chromosome.
+        """
+        nbytes = sum(seq.nbytes for seq in sequences)
+        if index in self.genomes: self.nbytes -= self.genomes.pop(index)[1]
+        if nbytes > self.byte_budget: return
+        self.genomes[index] = (sequences, nbytes)
+        self.nbytes += nbytes
+        self._evict()
+
+    def resize(self, byte_budget: int):
+        """
+        Changes the memory bound, removing the least recently used genomes in excess.
+        """
+        self.byte_budget = byte_budget
+        self._evict()
+
+    def _evict(self):
+        while self.nbytes > self.byte_budget:
+            _, (sequences, nbytes) = self.genomes.popitem(last=False)
+            self.nbytes -= nbytes
+
+    def clear(self):
+        """
+        Removes all the genomes.
+        """
+        self.genomes.clear()
+        self.nbytes = 0
+
+    def __contains__(self, index: int):
+        return index in self.genomes
+
+    def __len__(self):
+        return len(self.genomes)
+
+    def __repr__(self):
+        return f"GenomeCache(genomes: {len(self)!r}, nbytes: {self.nbytes!r}, byte_budget: {self.byte_budget!r})"
@@ -1,5 +1,6 @@
 from Rearrangement import Rearrangement
 from BinaryTree import Node
+from Coverage import Coverage
 import numpy as np
 
 class Insertion(Rearrangement):
@@ -20,26 +21,31 @@ class Insertion(Rearrangement):
     Methods
     -------
     update_visual(self, chr: Chromosome):
-        Updates the "visual" array of the chromosome.
-    reconstruct(self, node: Node):
+        Updates the "visual" coverage (Coverage) of the chromosome.
+    reconstruct(self, node: Node, rng = None):
         Reconstruction of the DNA sequence involved in the current Insertion, of the considered
         cell.
+    row(self) -> tuple
+        Returns the columns (chr_a, chr_b, pos, length, final_pos) of the event in the EventLog.
+    from_row(cls, chr_a, chr_b, pos, length, final_pos)
+        Builds the event from its columns in the EventLog.
     """
+    __slots__ = ("ChrID", "Pos", "Length")
+    SubKind = "Insertion"
+    type_code = 1
+
     def update_visual(self, node: Node):
         """
-        Updates the "visual" array of the chromosome.
+        Updates the "visual" coverage (Coverage) of the chromosome.
 
         Parameters
         ----------
             chr (Chromosome): chromosome involeved in the Deletion.
         """
         chr = node.data.DNA.CHRs[self.ChrID - 1]
-        inserted = np.zeros(self.Length) + 1
-        new_vis = np.concatenate((chr.visual[: self.Pos], inserted, chr.visual[self.Pos :]))
-        #if len(new_vis) != chr.length: raise Exception(f"visual {len(new_vis)}, chr {chr.length}")
-        chr.visual = new_vis
+        chr.visual = chr.visual.insert(self.Pos, Coverage(self.Length, 1))
 
-    def reconstruct(self, node: Node):
+    def reconstruct(self, node: Node, rng = None):
         """
         Reconstruction of the DNA sequence involved in the current Insertion, in the considered
         cell. It takes the old sequence, and modifies it in order to add the Insertion.
@@ -47,11 +53,13 @@ class Insertion(Rearrangement):
         Parameters
         ----------
             node (Node): node containing the involved cell.
+            rng (np.random.Generator): random generator of the node, from which the new bases
+                                       are drawn. (default: None, a new generator)
         """
-        chrID, init_pos, new_seq = self.ChrID, self.Pos, ''.join(np.random.choice(["A","G","C","T"],\
-                                 self.Length))
-        node.data.DNA.CHRs[chrID - 1].sequence = node.data.DNA.CHRs[chrID - 1].sequence[ : init_pos] \
-                                 + new_seq + node.data.DNA.CHRs[chrID - 1].sequence[init_pos : ]
+        if rng is None: rng = np.random.default_rng()
+        chr = node.data.DNA.CHRs[self.ChrID - 1]
+        new_seq = ''.join(rng.choice(["A","G","C","T"], self.Length))
+        chr.sequence = chr.sequence.insert(self.Pos, new_seq)
 
     def __init__(self, ChrID :int, Pos :int, Length :int, cell = None):
         """
@@ -67,14 +75,34 @@ class Insertion(Rearrangement):
             visual (bool): True if the visualizaiton is active. False if not.
         """
         super().__init__()
-        self.SubKind = "Insertion"
         self.ChrID = ChrID
         self.Pos = Pos
         self.Length = Length
         if cell != None:
             cell.events.append(self)
-            cell.DNA.CHRs[ChrID - 1].length += self.Length
+            cell.DNA.editable_chromosome(ChrID).length += self.Length
     
+    def row(self):
+        """
+        Returns the columns of the event in the EventLog.
+
+        Returns
+        -------
+            row (tuple): (chr_a, chr_b, pos, length, final_pos).
+        """
+        return (self.ChrID, 0, self.Pos, self.Length, 0)
+
+    @classmethod
+    def from_row(cls, chr_a, chr_b, pos, length, final_pos):
+        """
+        Builds the event from its columns in the EventLog, without adding it to any cell.
+
+        Parameters
+        ----------
+            chr_a (int), chr_b (int), pos (int), length (int), final_pos (int): columns of the event.
+        """
+        return cls(chr_a, pos, length)
+
     def __repr__(self):
         return f"Event->{self.kind}->{self.SubKind}(ChrId: {self.ChrID!r}, Pos: {self.Pos!r}, Length: {self.Length!r})"
 
@@ -0,0 +1,262 @@
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+class Instrumentation():
+    """
+    Measures the time and the memory used by the phases of a simulation (growth, reconstruction,
+    visualization, stats...). Each phase is measured by the context manager 'phase': the
+    measurements of the calls with the same name are accumulated, and 'report' returns them as a
+    dictionary. The memory is read from '/proc/self/status' (Linux) or from 'resource' (the other
+    Unix systems): on Linux the high-water mark of the RSS is reset at the beginning of each phase
+    (which is not nested in another one), so that its peak is the peak of the phase, elsewhere it
+    is the peak of the whole process.
+    If 'trace_allocations' is True, 'tracemalloc' is started during the phases and the lines of
+    code which allocated most memory are reported (the simulation runs a few times slower).
+
+    Attributes
+    ----------
+    trace_allocations : bool
+        If True, the allocations of each phase are traced with 'tracemalloc'.
+    top : int
+        Number of lines of code reported for the allocations of each phase.
+    phases : dict
+        Measurements of each phase, indexed by name (see 'report').
+
+    Methods
+    -------
+    phase(self, name: str)
+        Context manager measuring the code it contains as a call of the phase 'name'.
+    iterate(self, name: str, iterable)
+        Generator yielding the items of 'iterable', measuring the time spent producing them.
+    report(self) -> dict
+        Returns the measurements of each phase.
+    reset(self)
+        Removes all the measurements.
+    rss() -> int
+        Returns the resident memory of the process (its peak without '/proc'), in bytes.
+    peak_rss() -> int
+        Returns the high-water mark of the resident memory of the process, in bytes.
+    used_memory() -> int
+        Returns the memory used by all the processes of the system, in bytes (Linux only).
+    """
+    def __init__(self, trace_allocations = False, top = 10):
+        """
+        It initializes an empty report.
+
+        Parameters
+        ----------
+            trace_allocations (bool): if True, the allocations of each phase are traced with
+                                      'tracemalloc'. (default: False)
+            top (int): number of lines of code reported for the allocations of each phase.
+                       (default: 10)
+        """
+        self.trace_allocations = trace_allocations
+        self.top = top
+        self.phases = {}
+        self._active = {}
+
+    @staticmethod
+    def _status(field: str):
+        """
+        Returns a field of '/proc/self/status' in bytes, or None if it is not available.
+        """
+        try:
+            with open("/proc/self/status", "r") as f:
+                for line in f:
+                    if line.startswith(field + ":"): return int(line.split()[1]) * 1024
+        except OSError:
+            pass
+        return None
+
+    @staticmethod
+    def rss():
+        """
+        Returns the resident memory (RSS) of the process, in bytes. Without '/proc' (e.g. on
+        macOS) it is the high-water mark given by 'resource' (see 'peak_rss'), which is never
+        lower than the current RSS: there the 'rss_increase' of a phase is the increase of the
+        peak. None if neither is available (e.g. on Windows).
+        """
+        rss = Instrumentation._status("VmRSS")
+        return Instrumentation.peak_rss() if rss is None else rss
+
+    @staticmethod
+    def peak_rss():
+        """
+        Returns the high-water mark of the resident memory of the process, in bytes (None if it is
+        not available).
+        """
+        peak = Instrumentation._status("VmHWM")
+        if peak is None and resource is not None:
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            if sys.platform != "darwin": peak *= 1024
+        return peak
+
+    @staticmethod
+    def _reset_peak_rss():
+        """
+        Resets the high-water mark of the resident memory (Linux only). Returns True if it was
+        reset.
+        """
+        try:
+            with open("/proc/self/clear_refs", "w") as f:
+                f.write("5")
+            return True
+        except OSError:
+            return False
+
+    @staticmethod
+    def used_memory():
+        """
+        Returns the memory used by all the processes of the system, in bytes. It is read from
+        '/proc/meminfo', so it is available only on Linux (None elsewhere).
+        """
+        try:
+            with open("/proc/meminfo", "r") as f:
+                info = {line.split(":")[0]: int(line.split()[1]) * 1024 for line in f}
+            return info["MemTotal"] - info["MemAvailable"]
+        except (OSError, KeyError):
+            return None
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Context manager measuring the code it contains as a call of the phase 'name'. A phase
+        entered again while it is running (e.g. by a recursive method) is measured only once.
+
+        Parameters
+        ----------
+            name (str): name of the phase.
+        """
+        if self._active.get(name, 0) > 0:
+            self._active[name] += 1
+            try:
+                yield
+            finally:
+                self._active[name] -= 1
+            return
+        outermost = not any(self._active.values())
+        self._active[name] = 1
+        started_tracing = False
+        if self.trace_allocations:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+            snapshot = tracemalloc.take_snapshot()
+        reset = outermost and self._reset_peak_rss()
+        rss = self.rss()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            self._active[name] = 0
+            entry = self.phases.setdefault(name, {"calls": 0, "wall_time": 0., "cpu_time": 0., \
+                                                  "peak_rss": None, "rss_increase": None, \
+                                                  "peak_rss_is_process_peak": not reset})
+            entry["calls"] += 1
+            entry["wall_time"] += wall
+            entry["cpu_time"] += cpu
+            peak, end_rss = self.peak_rss(), self.rss()
+            if peak is not None: entry["peak_rss"] = max(entry["peak_rss"] or 0, peak)
+            if rss is not None and end_rss is not None:
+                entry["rss_increase"] = (entry["rss_increase"] or 0) + end_rss - rss
+            entry["peak_rss_is_process_peak"] |= not reset
+            if self.trace_allocations:
+                self._add_allocations(entry, snapshot)
+                if started_tracing: tracemalloc.stop()
+
+    def iterate(self, name: str, iterable):
+        """
+        Generator yielding the items of 'iterable', measuring the time spent producing them (but
+        not the time spent by the caller between two items) as one call of the phase 'name'.
+
+        Parameters
+        ----------
+            name (str): name of the phase.
+            iterable (iterable): items to yield, e.g. the output of another generator.
+        """
+        iterator = iter(iterable)
+        calls = self.phases.get(name, {}).get("calls", 0)
+        try:
+            while True:
+                with self.phase(name):
+                    try:
+                        item = next(iterator)
+                    except StopIteration:
+                        return
+                yield item
+        finally:
+            if name in self.phases: self.phases[name]["calls"] = calls + 1
+
+    def _add_allocations(self, entry: dict, snapshot):
+        """
+        Adds to the entry of a phase the peak of the traced memory and the memory allocated by
+        each line of code since 'snapshot' (and not released).
+        """
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__), \
+                   tracemalloc.Filter(False, __file__)]
+        entry["traced_peak"] = max(entry.get("traced_peak", 0), tracemalloc.get_traced_memory()[1])
+        allocations = entry.setdefault("allocations", {})
+        differences = tracemalloc.take_snapshot().filter_traces(filters).compare_to( \
+                      snapshot.filter_traces(filters), "lineno")
+        for difference in differences:
+            if difference.size_diff <= 0: continue
+            frame = difference.traceback[0]
+            location = f"{os.path.basename(frame.filename)}:{frame.lineno}"
+            size, count = allocations.get(location, (0, 0))
+            allocations[location] = (size + difference.size_diff, count + difference.count_diff)
+
+    def report(self):
+        """
+        Returns the measurements of each phase.
+
+        Returns
+        -------
+            report (dict): dictionary indexed by phase name. Each value is a dictionary with keys:
+                           'calls' (number of calls), 'wall_time' and 'cpu_time' (total seconds),
+                           'peak_rss' (highest peak of the resident memory during the calls, in
+                           bytes), 'rss_increase' (total increase of the resident memory, in bytes),
+                           'peak_rss_is_process_peak' (True if the peak could not be reset, so that
+                           it is the peak of the whole process) and, if the allocations are
+                           traced, 'traced_peak' (peak of the memory traced by 'tracemalloc', in
+                           bytes) and 'top_allocations' (list of tuple (line of code, bytes,
+                           number of blocks) of the lines which allocated most memory).
+        """
+        report = {}
+        for name, entry in self.phases.items():
+            entry = dict(entry)
+            allocations = entry.pop("allocations", None)
+            if allocations is not None:
+                top = sorted(allocations.items(), key=lambda item: item[1][0], reverse=True)
+                entry["top_allocations"] = [(location, size, count) \
+                                            for location, (size, count) in top[: self.top]]
+            report[name] = entry
+        return report
+
+    def reset(self):
+        """
+        Removes all the measurements.
+        """
+        self.phases = {}
+
+    def __str__(self):
+        lines = [f"{'phase':<16}{'calls':>6}{'wall (s)':>11}{'cpu (s)':>11}{'peak RSS (Mb)':>15}"]
+        for name, entry in self.report().items():
+            peak = "-" if entry["peak_rss"] is None else f"{entry['peak_rss'] / 1048576:.1f}"
+            lines.append(f"{name:<16}{entry['calls']:>6}{entry['wall_time']:>11.3f}" + \
+                         f"{entry['cpu_time']:>11.3f}{peak:>15}")
+            for location, size, count in entry.get("top_allocations", []):
+                lines.append(f"    {location:<36}{size / 1024:>10.1f} Kb{count:>8} blocks")
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return f"Instrumentation(phases: {list(self.phases)!r}, trace_allocations: {self.trace_allocations!r})"
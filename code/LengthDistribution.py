@@ -0,0 +1,83 @@
+from abc import ABC, abstractmethod
+import numpy as np
+
+
+class LengthDistribution(ABC):
+    """
+    Length Distribution Class. Probability distribution of the length of a Rearrangement, truncated
+    to the interval ['low', 'high'). The lengths are drawn by inverse transform sampling: the
+    subclasses define the inverse of the cumulative distribution function ('ppf'), so that many
+    lengths can be drawn with a single vectorised call. The object can also be called as the
+    length distribution functions of the Utility class: 'distrib(a, b, rng)'. It is an abstract
+    class: the subclasses must define 'ppf' and 'scalar_ppf'.
+
+    Subclasses
+    ----------
+        TruncatedExponential
+        TruncatedUniform
+        EmpiricalLength
+
+    Methods
+    -------
+    ppf(self, u, low, high) -> np.ndarray
+        Returns the lengths corresponding to the quantiles 'u' (vectorised).
+    scalar_ppf(self, u: float, low: int, high: int) -> int
+        Returns the length corresponding to the quantile 'u' (one length, without NumPy).
+    sample(self, n: int, low, high, rng) -> np.ndarray
+        Draws 'n' lengths between 'low' (included) and 'high' (excluded).
+    """
+    __slots__ = ()
+
+    @abstractmethod
+    def ppf(self, u, low, high):
+        """
+        Returns the lengths corresponding to the quantiles 'u'.
+
+        Parameters
+        ----------
+            u (np.ndarray): quantiles, between 0 (included) and 1 (excluded).
+            low (int/np.ndarray): left extreme of the distribution domain.
+            high (int/np.ndarray): right extreme of the distribution domain.
+
+        Returns
+        -------
+            lengths (np.ndarray): lengths (int64).
+        """
+
+    @abstractmethod
+    def scalar_ppf(self, u: float, low: int, high: int):
+        """
+        Returns the length corresponding to the quantile 'u'. It is the scalar version of 'ppf',
+        used in the event sampling, where the domain changes from one event to the other: it
+        should not use NumPy, whose calls are slow on single numbers.
+        """
+
+    def sample(self, n: int, low, high, rng = None):
+        """
+        Draws 'n' lengths between 'low' (included) and 'high' (excluded).
+
+        Parameters
+        ----------
+            n (int): number of lengths.
+            low (int/np.ndarray): left extreme of the distribution domain.
+            high (int/np.ndarray): right extreme of the distribution domain.
+            rng (np.random.Generator): random generator. (default: None, a new generator)
+
+        Returns
+        -------
+            lengths (np.ndarray): drawn lengths (int64).
+
+        Raises
+        ------
+            Exception
+                If 'low' or 'high' are negative.
+        """
+        if np.any(np.asarray(low) <= 0) or np.any(np.asarray(high) <= 0):
+            raise Exception(f"a<=0 or b<=0. They must be positive")
+        if rng is None: rng = np.random.default_rng()
+        return self.ppf(rng.random(n), low, high)
+
+    def __call__(self, a: int, b: int, rng = None):
+        if a <= 0 or b <= 0: raise Exception(f"a<=0 or b<=0. They must be positive")
+        if rng is None: rng = np.random.default_rng()
+        return self.scalar_ppf(rng.random(), a, b)
@@ -14,7 +14,8 @@ class MUT_Cell(Cell):
     DNA: DNA
         It contains the DNA of the cell. In particular its chromosomes and their sequences.
     events: list
-        List of the new events occurred in the cell in the corresponding generation.
+        List of the new events occurred in the cell in the corresponding generation. Once the cell
+        is stored in an ArrayTree it becomes a read-only view (EventSlice) on the EventLog.
     """
     def __init__(self, DNA :DNA, events = [], generation = 0):
         """
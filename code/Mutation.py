@@ -17,9 +17,11 @@ class Mutation(Event):
         PointwiseDeletion
         PointwiseReplacement
     """
+    __slots__ = ("chr_id",)
+    kind = "Mutation"
+
     def __init__(self):
         """
-        It initializes the kind to 'Mutation' and the chromosome ID to 'None'.
+        It initializes the chromosome ID to 'None'.
         """
-        self.kind = "Mutation"
         self.chr_id = None
\ No newline at end of file
@@ -0,0 +1,158 @@
+import numpy as np
+from QuantileSketch import QuantileSketch
+
+
+class OnlineStatistics():
+    """
+    Streaming statistics of the chromosome and genome lengths of the leaves, and of the events of
+    the simulated cells. The leaves are added one at a time during the growth (Welford's online
+    algorithm), so that they do not need to be kept in memory. The statistics of two collectors are
+    merged (Chan's formula) when the tree is simulated in parallel.
+    The length statistics are arrays with one column for each chromosome (column 'ID - 1') and a
+    last column for the whole genome.
+
+    Attributes
+    ----------
+    n_chr : int
+        Number of chromosomes.
+    accuracy : float
+        Relative accuracy of the quantile sketches.
+    n : int
+        Number of leaves added.
+    mean : np.ndarray
+        Average lengths.
+    m2 : np.ndarray
+        Sum of the squared deviations from the average lengths.
+    min, max : np.ndarray
+        Minimum and maximum lengths.
+    sketches : list
+        QuantileSketch of the lengths of each column.
+    event_counts : np.ndarray
+        Array (n_chr, 8): 'event_counts[ID - 1, type_code]' is the number of events of the kind
+        'EventLog.TYPES[type_code]' which involved the chromosome 'ID' (both the chromosomes for a
+        Reciprocal Translocation).
+
+    Methods
+    -------
+    add_leaf(self, lengths: np.ndarray)
+        Adds the chromosome lengths of a leaf.
+    add_events(self, rows: np.ndarray)
+        Counts the events of a cell (rows of an EventLog).
+    merge(self, other: OnlineStatistics)
+        Adds the leaves and the events of another collector.
+    reset_lengths(self)
+        Removes all the leaves, keeping the event counts.
+    variance(self) -> np.ndarray
+        Returns the variance of the lengths.
+    std(self) -> np.ndarray
+        Returns the standard deviation of the lengths.
+    quantile(self, q: float) -> np.ndarray
+        Returns the 'q'-quantile of the lengths.
+    """
+    N_TYPES = 8
+
+    def __init__(self, n_chr: int, accuracy = 0.01):
+        """
+        It initializes empty statistics.
+
+        Parameters
+        ----------
+            n_chr (int): number of chromosomes.
+            accuracy (float): relative accuracy of the quantiles (see QuantileSketch).
+                              (default: 0.01)
+        """
+        self.n_chr = n_chr
+        self.accuracy = accuracy
+        self.event_counts = np.zeros((n_chr, OnlineStatistics.N_TYPES), dtype=np.int64)
+        self.reset_lengths()
+
+    def reset_lengths(self):
+        """
+        Removes all the leaves, keeping the event counts.
+        """
+        self.n = 0
+        self.mean = np.zeros(self.n_chr + 1)
+        self.m2 = np.zeros(self.n_chr + 1)
+        self.min = np.full(self.n_chr + 1, np.inf)
+        self.max = np.full(self.n_chr + 1, -np.inf)
+        self.sketches = [QuantileSketch(self.accuracy) for _ in range(self.n_chr + 1)]
+
+    def add_leaf(self, lengths):
+        """
+        Adds the chromosome lengths of a leaf.
+
+        Parameters
+        ----------
+            lengths (np.ndarray): length of each chromosome, ordered by ID.
+        """
+        values = np.append(lengths, np.sum(lengths)).astype(float)
+        self.n += 1
+        delta = values - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (values - self.mean)
+        np.minimum(self.min, values, out=self.min)
+        np.maximum(self.max, values, out=self.max)
+        for sketch, value in zip(self.sketches, values.tolist()):
+            sketch.add(value)
+
+    def add_events(self, rows):
+        """
+        Counts the events of a cell.
+
+        Parameters
+        ----------
+            rows (np.ndarray): rows of an EventLog (see EventLog.DTYPE).
+        """
+        np.add.at(self.event_counts, (rows["chr_a"] - 1, rows["type_code"]), 1)
+        second = rows[rows["chr_b"] > 0]
+        np.add.at(self.event_counts, (second["chr_b"] - 1, second["type_code"]), 1)
+
+    def merge(self, other):
+        """
+        Adds the leaves and the events of another collector.
+
+        Parameters
+        ----------
+            other (OnlineStatistics): collector to be merged.
+        """
+        self.event_counts += other.event_counts
+        if other.n == 0: return
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * other.n / n
+        self.m2 = self.m2 + other.m2 + delta ** 2 * self.n * other.n / n
+        self.n = n
+        np.minimum(self.min, other.min, out=self.min)
+        np.maximum(self.max, other.max, out=self.max)
+        for sketch, other_sketch in zip(self.sketches, other.sketches):
+            sketch.merge(other_sketch)
+
+    def variance(self):
+        """
+        Returns the (population) variance of the lengths.
+        """
+        return self.m2 / self.n if self.n > 0 else np.full(self.n_chr + 1, np.nan)
+
+    def std(self):
+        """
+        Returns the (population) standard deviation of the lengths.
+        """
+        return np.sqrt(self.variance())
+
+    def quantile(self, q: float):
+        """
+        Returns the 'q'-quantile of the lengths of each column.
+
+        Parameters
+        ----------
+            q (float): quantile, between 0 and 1.
+
+        Returns
+        -------
+            quantiles (np.ndarray): estimates of the quantiles, within the relative accuracy of
+                                    the sketches.
+        """
+        return np.array([sketch.quantile(q) for sketch in self.sketches])
+
+    def __repr__(self):
+        return f"OnlineStatistics(n_chr: {self.n_chr!r}, leaves: {self.n!r})"
@@ -0,0 +1,120 @@
+import numpy as np
+
+# 2-bit code of each base and its inverse
+_CODES = np.full(256, 255, dtype=np.uint8)
+_CODES[np.frombuffer(b"ACGTacgt", dtype=np.uint8)] = [0, 1, 2, 3, 0, 1, 2, 3]
+_BASES = np.frombuffer(b"ACGT", dtype=np.uint8)
+
+
+class PackedBases():
+    """
+    Packed DNA sequence Class. It stores a DNA sequence with 2 bits per base in a 'uint8' NumPy
+    buffer (4 bases per byte), i.e. with a quarter of the memory of a Python string. It can be used
+    everywhere a WT sequence is expected (for example in the 'chromosome_table'): a Rope built on it
+    slices the buffer directly and bases are decoded only when the sequence is converted into a
+    string.
+
+    Attributes
+    ----------
+    buffer : np.ndarray
+        Packed bases: the base in position 'i' is stored in the bits '6 - 2*(i%4)' and
+        '7 - 2*(i%4)' of 'buffer[i//4]'. A=0, C=1, G=2, T=3.
+    length : int
+        Number of bases of the sequence.
+
+    Methods
+    -------
+    encode(seq: str) -> np.ndarray
+        Encodes a DNA sequence into the corresponding packed buffer.
+    decode(self, start: int, end: int) -> str
+        Decodes the bases between 'start' (included) and 'end' (excluded).
+    """
+    __slots__ = ("buffer", "length")
+
+    def __init__(self, seq = "", buffer = None, length = None):
+        """
+        It initializes the packed buffer from the sequence 'seq', or directly from an already packed
+        'buffer' of 'length' bases.
+
+        Parameters
+        ----------
+            seq (str/bytes): DNA sequence to be packed. (default: "")
+            buffer (np.ndarray): already packed bases. (default: None)
+            length (int): number of bases in 'buffer'. (default: None)
+        """
+        if buffer is None:
+            buffer, length = PackedBases.encode(seq), len(seq)
+        self.buffer = buffer
+        self.length = length
+
+    @staticmethod
+    def encode(seq):
+        """
+        Encodes a DNA sequence into the corresponding packed buffer.
+
+        Parameters
+        ----------
+            seq (str/bytes): DNA sequence. Only the bases A, C, G, T (also lower case) are allowed:
+                             sequences with N or other ambiguous bases must be kept unpacked.
+
+        Returns
+        -------
+            buffer (np.ndarray): packed bases (uint8).
+
+        Raises
+        ------
+            Exception
+                If the sequence contains a character which is not a DNA base.
+        """
+        if isinstance(seq, str): seq = seq.encode("ascii")
+        codes = _CODES[np.frombuffer(seq, dtype=np.uint8)]
+        if len(codes) and codes.max() == 255:
+            invalid = np.flatnonzero(codes == 255)
+            raise Exception(f"The sequence contains {len(invalid)} characters different from A, C, G, T (the first one is {chr(seq[invalid[0]])!r} in position {invalid[0]}): N and the other ambiguous bases cannot be packed")
+        padded = np.zeros(-(-len(codes) // 4) * 4, dtype=np.uint8)
+        padded[: len(codes)] = codes
+        padded = padded.reshape(-1, 4)
+        return (padded[:, 0] << 6) | (padded[:, 1] << 4) | (padded[:, 2] << 2) | padded[:, 3]
+
+    def decode(self, start: int, end: int):
+        """
+        Decodes the bases between 'start' (included) and 'end' (excluded).
+
+        Parameters
+        ----------
+            start (int): position of the first decoded base.
+            end (int): position following the last decoded base.
+
+        Returns
+        -------
+            seq (str): decoded sequence.
+        """
+        if end <= start: return ""
+        packed = self.buffer[start // 4 : (end + 3) // 4]
+        codes = np.empty((len(packed), 4), dtype=np.uint8)
+        codes[:, 0], codes[:, 1] = packed >> 6, (packed >> 4) & 3
+        codes[:, 2], codes[:, 3] = (packed >> 2) & 3, packed & 3
+        offset = start % 4
+        return _BASES[codes.ravel()[offset : offset + end - start]].tobytes().decode("ascii")
+
+    @property
+    def nbytes(self):
+        return self.buffer.nbytes
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.length)
+            if step != 1: raise ValueError("PackedBases slicing does not support steps")
+            return self.decode(start, stop)
+        if key < 0: key += self.length
+        if key < 0 or key >= self.length: raise IndexError("PackedBases index out of range")
+        return "ACGT"[(int(self.buffer[key >> 2]) >> (6 - 2 * (key & 3))) & 3]
+
+    def __str__(self):
+        return self.decode(0, self.length)
+
+    def __repr__(self):
+        return f"PackedBases(length: {self.length!r}, bytes: {self.nbytes!r})"
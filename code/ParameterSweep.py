@@ -0,0 +1,352 @@
+import hashlib
+import itertools
+import json
+import os
+import time
+import types
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from Simulator import Simulator
+from SparseTree import SparseTree
+
+
+class ParameterSweep():
+    """
+    Sweep of the Simulator over a grid of parameters and a list of seeds. Each point of the sweep
+    (one combination of the parameters with one seed) is simulated, and its summary statistics are
+    stored in a cache directory, in a JSON file whose name is the hash (sha256) of the parameters,
+    of the seed, of the WT sequences and of the source code of the simulator (the '.py' files of
+    its directory, so that the results of an older version are not reused): running the sweep again, or a larger sweep containing the
+    same points, only simulates the points which are not in the cache. The points are simulated
+    by a pool of processes, each one receiving the WT sequences once.
+
+    Summary statistics of each point: average and standard deviation of the genome and chromosome
+    lengths, number of events of each kind, average and standard deviation of the cumulated
+    mutations ('stat_cumulated_mutations' and 'stat_max_cumulated_mutations', computed by
+    'population_coverage', not for sampled lineages) and time of the simulation.
+
+    Attributes
+    ----------
+    chromosome_table : list
+        WT sequences of the simulations.
+    grid : dict
+        List of values of each swept argument of the Simulator, indexed by the name of the argument
+        (e.g. {"n_gen": [5, 6], "ave_events_num": [1, 2, 4]}).
+    seeds : list
+        Seeds of the replicates of each combination of the parameters.
+    base : dict
+        Arguments of the Simulator which are the same for all the points.
+    cache_dir : str
+        Directory of the cache.
+    n_workers : int
+        Number of processes.
+
+    Methods
+    -------
+    points(self) -> list
+        Returns the points of the sweep: list of tuple (parameters, seed).
+    key(self, parameters: dict, seed: int) -> str
+        Returns the cache key of a point.
+    run(self) -> list
+        Simulates the points which are not in the cache and returns the results of all the points.
+    aggregate(results: list, statistic: str) -> list
+        Average and standard deviation of a statistic over the seeds of each combination.
+    code_fingerprint() -> str
+        Returns the hash of the source code of the simulator.
+    """
+    CACHE_VERSION = 2
+    # hash of the source code of the simulator (see 'code_fingerprint')
+    _code_fingerprint = None
+
+    def __init__(self, chromosome_table, grid: dict, seeds = (0,), base = None, \
+                 cache_dir = "sweep_cache", n_workers = 1):
+        """
+        It initializes the sweep, without running any simulation.
+
+        Parameters
+        ----------
+            chromosome_table (list): list of tuple. Each tuple contains the chromosome ID and its
+                                     sequence.
+            grid (dict): list of values of each swept argument of the Simulator ('n_gen',
+                         'ave_events_num', 'cumulative_list', 'del_len_distrib'...).
+            seeds (list): seeds of the replicates. (default: (0,))
+            base (dict): arguments of the Simulator common to all the points. It must contain
+                         'n_gen' if 'n_gen' is not swept. (default: None)
+            cache_dir (str): directory of the cache. (default: "sweep_cache")
+            n_workers (int): number of processes. (default: 1)
+
+        Raises
+        ------
+            Exception
+                If the number of generations or the seeds are not given, or if the seed is in the
+                grid.
+        """
+        self.chromosome_table = chromosome_table
+        self.grid = dict(grid)
+        self.seeds = list(seeds)
+        self.base = dict(base) if base is not None else {}
+        self.cache_dir = cache_dir
+        self.n_workers = n_workers
+        if "n_gen" not in self.grid and "n_gen" not in self.base:
+            raise Exception(f"The number of generations ('n_gen') must be in 'grid' or in 'base'")
+        if "seed" in self.grid or "seed" in self.base:
+            raise Exception(f"The seeds of the sweep are given by 'seeds'")
+        if None in self.seeds:
+            raise Exception(f"The seeds must be given: a random seed cannot be cached")
+        self._reference_hash = None
+
+    @staticmethod
+    def _describe(value):
+        """
+        Returns a JSON description of an argument of the Simulator, which is the same for equal
+        arguments (numbers, lists, distributions, functions...).
+        """
+        if value is None or isinstance(value, (bool, int, float, str)): return value
+        if isinstance(value, np.generic): return value.item()
+        if isinstance(value, np.ndarray):
+            return {"array": hashlib.sha256(np.ascontiguousarray(value).tobytes()).hexdigest(), \
+                    "dtype": str(value.dtype), "shape": list(value.shape)}
+        if isinstance(value, (list, tuple)): return [ParameterSweep._describe(v) for v in value]
+        if isinstance(value, dict):
+            return {str(k): ParameterSweep._describe(v) for k, v in sorted(value.items())}
+        if isinstance(value, types.FunctionType):
+            # the name is not enough: lambdas and local functions share it, and a function can
+            # be edited keeping its name
+            try:
+                closure = [cell.cell_contents for cell in value.__closure__ or ()]
+            except ValueError:
+                closure = None
+            return {"function": f"{value.__module__}.{value.__qualname__}", \
+                    "code": ParameterSweep._code_digest(value.__code__), \
+                    "defaults": ParameterSweep._describe(value.__defaults__), \
+                    "kwdefaults": ParameterSweep._describe(value.__kwdefaults__), \
+                    "closure": ParameterSweep._describe(closure)}
+        if isinstance(value, types.MethodType):
+            return {"method": ParameterSweep._describe(value.__func__), \
+                    "self": ParameterSweep._describe(value.__self__)}
+        if callable(value) and hasattr(value, "__qualname__"):
+            return {"function": f"{value.__module__}.{value.__qualname__}"}
+        # other objects (distributions, functools.partial...) are described by their pickle state
+        return {"class": type(value).__qualname__, \
+                "state": ParameterSweep._describe(value.__reduce_ex__(4)[1 : 3])}
+
+    @staticmethod
+    def _code_digest(code):
+        """
+        Returns the hash of the bytecode of a function: instructions, constants (and nested
+        functions) and names of the global variables and attributes it uses. The values of the
+        global variables are not part of it.
+        """
+        h = hashlib.sha256(code.co_code)
+        for const in code.co_consts:
+            if isinstance(const, types.CodeType):
+                h.update(ParameterSweep._code_digest(const).encode("ascii"))
+            else:
+                h.update(repr(const).encode("utf-8"))
+        h.update(repr(code.co_names).encode("utf-8"))
+        return h.hexdigest()
+
+    @staticmethod
+    def code_fingerprint():
+        """
+        Returns the hash of the source code of the simulator, i.e. of the '.py' files of the
+        directory of this module (computed once).
+        """
+        if ParameterSweep._code_fingerprint is None:
+            h = hashlib.sha256()
+            directory = os.path.dirname(os.path.abspath(__file__))
+            for name in sorted(os.listdir(directory)):
+                if not name.endswith(".py"): continue
+                h.update(name.encode("utf-8"))
+                with open(os.path.join(directory, name), "rb") as f:
+                    h.update(hashlib.sha256(f.read()).digest())
+            ParameterSweep._code_fingerprint = h.hexdigest()
+        return ParameterSweep._code_fingerprint
+
+    def reference_hash(self):
+        """
+        Returns the hash of the WT sequences (computed once).
+        """
+        if self._reference_hash is None:
+            h = hashlib.sha256()
+            for ID, seq in self.chromosome_table:
+                h.update(f"{ID}:{len(seq)}:".encode("ascii"))
+                h.update(str(seq).encode("ascii"))
+            self._reference_hash = h.hexdigest()
+        return self._reference_hash
+
+    def points(self):
+        """
+        Returns the points of the sweep, i.e. every combination of the values in 'grid' with every
+        seed.
+
+        Returns
+        -------
+            points (list): list of tuple (parameters, seed), 'parameters' being the dictionary of
+                           the swept arguments.
+        """
+        names = list(self.grid)
+        return [(dict(zip(names, values)), seed) \
+                for values in itertools.product(*(self.grid[name] for name in names)) \
+                for seed in self.seeds]
+
+    def key(self, parameters: dict, seed: int):
+        """
+        Returns the cache key of a point: the sha256 of its arguments (swept and common, functions
+        included with their bytecode, defaults and closures), of the seed, of the WT sequences and
+        of the source code of the simulator.
+
+        Parameters
+        ----------
+            parameters (dict): swept arguments of the point.
+            seed (int): seed of the point.
+        """
+        arguments = dict(self.base, **parameters)
+        description = {"arguments": self._describe(arguments), "seed": seed, \
+                       "reference": self.reference_hash(), "code": self.code_fingerprint(), \
+                       "version": ParameterSweep.CACHE_VERSION}
+        return hashlib.sha256(json.dumps(description, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _cache_file(self, key: str):
+        return os.path.join(self.cache_dir, key + ".json")
+
+    def _read_cache(self, key: str):
+        """
+        Returns the cached result of a point, or None if it is not in the cache.
+        """
+        try:
+            with open(self._cache_file(key), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_cache(self, key: str, result: dict):
+        """
+        Writes the result of a point in the cache (atomically, so that an interrupted sweep never
+        leaves a partial file).
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temporary = self._cache_file(key) + f".{os.getpid()}.tmp"
+        with open(temporary, "w") as f:
+            json.dump(result, f)
+        os.replace(temporary, self._cache_file(key))
+
+    def run(self):
+        """
+        Simulates the points which are not in the cache (in a pool of 'n_workers' processes),
+        stores their results in the cache as soon as they are ready, and returns the results of all
+        the points.
+
+        Returns
+        -------
+            results (list): result of each point, in the order of 'points'. Each result is a dict
+                            with keys 'parameters' (description of the swept arguments), 'seed',
+                            'key', 'summary' (summary statistics) and 'cached' (True if the point
+                            was read from the cache).
+        """
+        points = self.points()
+        results, tasks = [None] * len(points), {}
+        for i, (parameters, seed) in enumerate(points):
+            key = self.key(parameters, seed)
+            cached = self._read_cache(key)
+            if cached is not None:
+                results[i] = dict(cached, cached=True)
+            else:
+                tasks.setdefault(key, []).append(i)
+
+        def store(key: str, summary: dict):
+            parameters, seed = points[tasks[key][0]]
+            result = {"parameters": self._describe(parameters), "seed": seed, "key": key, \
+                      "summary": summary}
+            self._write_cache(key, result)
+            for i in tasks[key]: results[i] = dict(result, cached=False)
+
+        arguments = {key: (dict(self.base, **points[indices[0]][0]), points[indices[0]][1]) \
+                     for key, indices in tasks.items()}
+        if self.n_workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(self.n_workers, initializer=_init_worker, \
+                                     initargs=(self.chromosome_table,)) as executor:
+                futures = {executor.submit(_run_point, arguments[key]): key for key in tasks}
+                for future in as_completed(futures):
+                    store(futures[future], future.result())
+        else:
+            _init_worker(self.chromosome_table)
+            for key in tasks:
+                store(key, _run_point(arguments[key]))
+        return results
+
+    @staticmethod
+    def aggregate(results: list, statistic: str):
+        """
+        Average and standard deviation, over the seeds, of a scalar summary statistic of each
+        combination of the parameters.
+
+        Parameters
+        ----------
+            results (list): output of 'run'.
+            statistic (str): name of the statistic in the summaries (e.g. 'average_genome_length'),
+                             or name and index separated by '/' for the statistics which are
+                             lists (e.g. 'cumulated_mutations/0' for the average).
+
+        Returns
+        -------
+            aggregated (list): list of tuple (parameters, average, standard deviation, number of
+                               seeds), in the order of the first appearance of each combination.
+        """
+        name, _, index = statistic.partition("/")
+        groups = {}
+        for result in results:
+            value = result["summary"][name]
+            if index: value = value[int(index)]
+            key = json.dumps(result["parameters"], sort_keys=True)
+            groups.setdefault(key, (result["parameters"], []))[1].append(value)
+        return [(parameters, float(np.mean(values)), float(np.std(values)), len(values)) \
+                for parameters, values in groups.values()]
+
+    def __repr__(self):
+        return f"ParameterSweep(parameters: {list(self.grid)!r}, points: {len(self.points())!r}, cache_dir: {self.cache_dir!r})"
+
+
+# WT sequences of the worker process (see '_init_worker')
+_chromosome_table = None
+
+
+def _init_worker(chromosome_table):
+    """
+    Stores the WT sequences in the worker process, once for all its points.
+    """
+    global _chromosome_table
+    _chromosome_table = chromosome_table
+
+
+def _run_point(task):
+    """
+    Simulates one point of a sweep (see 'ParameterSweep.run') and returns its summary statistics.
+
+    Parameters
+    ----------
+        task (tuple): arguments of the Simulator and seed.
+
+    Returns
+    -------
+        summary (dict): summary statistics of the point.
+    """
+    arguments, seed = task
+    arguments = dict(arguments)
+    n_gen = arguments.pop("n_gen")
+    start = time.perf_counter()
+    simulator = Simulator(_chromosome_table, n_gen, seed=seed, keep_leaves=False, **arguments)
+    statistics = simulator.statistics
+    summary = {"average_genome_length": float(statistics.mean[-1]), \
+               "genome_length_st_dev": float(statistics.std()[-1]), \
+               "average_chromosome_length": statistics.mean[: -1].tolist(), \
+               "chr_length_st_dev": statistics.std()[: -1].tolist(), \
+               "event_counts": statistics.event_counts.sum(axis=0).tolist(), \
+               "n_leaves": int(statistics.n)}
+    if not isinstance(simulator.tree, SparseTree):
+        coverage = simulator.population_coverage(n_gen)
+        summary["cumulated_mutations"] = [float(x) for x in coverage.stat_cumulated_mutations()]
+        summary["max_cumulated_mutations"] = [float(x) for x in \
+                                              coverage.stat_max_cumulated_mutations()]
+    summary["time"] = time.perf_counter() - start
+    return summary
@@ -1,4 +1,7 @@
 from Utility import Utility
+from TruncatedExponential import TruncatedExponential
+from TruncatedUniform import TruncatedUniform
+from EmpiricalLength import EmpiricalLength
 """
 Module containing all the input parameters of the 'Simulator' class.
 
@@ -10,15 +13,19 @@ cumulative_list (int): list containing the cumulative probability of the possibl
 
 n_events_distrib (Method): probability distribution of the number of events in one cell
                             duplication.
-del_len_distrib (Method): probability distribution of the Deletion length. 
-ins_len_distrib (Method): probability distribution of the Insertion length.
-transl_len_distrib (Method): probability distribution of the Translocation length.
-rec_transl_len_distrib (Method): probability distribution of the Reciprocal Translocation length.
-dupl_len_distrib (Method): probability distribution of the Duplication length.
+del_len_distrib (LengthDistribution): probability distribution of the Deletion length. 
+ins_len_distrib (LengthDistribution): probability distribution of the Insertion length.
+transl_len_distrib (LengthDistribution): probability distribution of the Translocation length.
+rec_transl_len_distrib (LengthDistribution): probability distribution of the Reciprocal
+                                             Translocation length.
+dupl_len_distrib (LengthDistribution): probability distribution of the Duplication length.
+    Available distributions: TruncatedExponential(tau), TruncatedUniform() and
+    EmpiricalLength.from_file(file_name) (e.g. a measured spectrum of SV lengths).
 
 chromosome_lengths (list): list of contaning in order, the length of each chromosome.
 chromosome_number (int): number of chromosomes.
 chromosome_table (list): list of tuple. Each tuple contains the chromosome ID and its sequence.
+    It is read from the file the first time it is used, not when the module is imported.
 """
 number_of_generations = 7
 average_events_number = 10
@@ -30,11 +37,11 @@ cumulative_list = [ 1./5,    2./5,     3./5,       4./5,      1,           0,
 n_events_distrib = Utility.poisson_events_number
 
 tau = 1 # parameter of the exponential distribution
-del_len_distrib = Utility.int_trunc_exp(tau) #Utility.int_trunc_uniform #
-ins_len_distrib = Utility.int_trunc_exp(tau) #Utility.int_trunc_uniform #
-transl_len_distrib = Utility.int_trunc_exp(tau) #Utility.int_trunc_uniform #
-rec_transl_len_distrib = Utility.int_trunc_exp(tau) #Utility.int_trunc_uniform #
-dupl_len_distrib = Utility.int_trunc_exp(tau) #Utility.int_trunc_uniform #
+del_len_distrib = TruncatedExponential(tau) #TruncatedUniform() #EmpiricalLength.from_file(file_name) #
+ins_len_distrib = TruncatedExponential(tau) #TruncatedUniform() #
+transl_len_distrib = TruncatedExponential(tau) #TruncatedUniform() #
+rec_transl_len_distrib = TruncatedExponential(tau) #TruncatedUniform() #
+dupl_len_distrib = TruncatedExponential(tau) #TruncatedUniform() #
 
 chromosome_lengths = [int(5e5), int(5e5), int(5e5), int(5e5), int(5e5),int(5e5), int(5e5), int(5e5),
                     int(5e5), int(5e5),int(5e5), int(5e5), int(5e5), int(5e5), int(5e5), int(5e5)]         
@@ -43,4 +50,18 @@ chromosome_number = 16
 
 #chromosome_table = Utility.random_seq_initializer(chromosome_lengths)
 
-chromosome_table = Utility.read_file()
+
+def _read_chromosome_table():
+    return Utility.read_file()
+
+
+# 'chromosome_table' is read from the file the first time it is used (also by 'from Parameters
+# import *'), so that the processes which only need the other parameters do not read it.
+__all__ = [name for name in globals() if not name.startswith("_")] + ["chromosome_table"]
+
+
+def __getattr__(name):
+    if name == "chromosome_table":
+        globals()["chromosome_table"] = _read_chromosome_table()
+        return globals()["chromosome_table"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
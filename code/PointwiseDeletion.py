@@ -1,6 +1,5 @@
 from Mutation import Mutation
 from BinaryTree import Node
-import numpy as np
 
 class PointDeletion(Mutation):
     """
@@ -18,29 +17,33 @@ class PointDeletion(Mutation):
     Methods
     -------
     update_visual(self, chr: Chromosome):
-        Updates the "visual" array of the chromosome.
-    reconstruct(self, node: Node):
+        Updates the "visual" coverage (Coverage) of the chromosome.
+    reconstruct(self, node: Node, rng = None):
         Reconstruction of the DNA sequence involved in the current PointwiseDeletion, of the 
         considered cell.
+    row(self) -> tuple
+        Returns the columns (chr_a, chr_b, pos, length, final_pos) of the event in the EventLog.
+    from_row(cls, chr_a, chr_b, pos, length, final_pos)
+        Builds the event from its columns in the EventLog.
     """
+    __slots__ = ("ChrID", "Pos")
+    SubKind = "Pointwise Deletion"
+    type_code = 6
 
     def update_visual(self, node: Node):
         """
-        Updates the "visual" array of the chromosome.
+        Updates the "visual" coverage (Coverage) of the chromosome.
 
         Parameters
         ----------
             chr (Chromosome): chromosome involeved in the Deletion.
         """
         chr = node.data.DNA.CHRs[self.ChrID - 1]
-        new_vis = np.concatenate((chr.visual[: self.Pos], chr.visual[self.Pos + 1 :]))
-        #if len(new_vis) != chr.length: raise Exception(f"visual {len(new_vis)}, chr {chr.length}")
-        if self.Pos - 1 >= 0: 
-            new_vis[self.Pos - 1] += 1
-        if self.Pos  < len(new_vis): new_vis[self.Pos] += 1
-        chr.visual = new_vis
+        new_vis = chr.visual.delete(self.Pos, self.Pos + 1)
+        # the bases on both sides of the breakpoint (if present)
+        chr.visual = new_vis.increment(self.Pos - 1, self.Pos + 1)
 
-    def reconstruct(self, node: Node):
+    def reconstruct(self, node: Node, rng = None):
         """
         Reconstruction of the DNA sequence involved in the current PointwiseDeletion, in the 
         considered cell. It takes the old sequence, and modifies it in order to add the
@@ -49,10 +52,10 @@ class PointDeletion(Mutation):
         Parameters
         ----------
             node (Node): node containing the involved cell.
+            rng (np.random.Generator): random generator of the node (not used).
         """
-        chrID, del_pos = self.ChrID, self.Pos
-        node.data.DNA.CHRs[chrID - 1].sequence = node.data.DNA.CHRs[chrID - 1].sequence[ : del_pos]\
-             +  node.data.DNA.CHRs[chrID - 1].sequence[del_pos + 1 : ]
+        chr = node.data.DNA.CHRs[self.ChrID - 1]
+        chr.sequence = chr.sequence.delete(self.Pos, 1)
     
     def __init__(self, ChrID :int, Pos :int, cell = None):
         """
@@ -67,16 +70,36 @@ class PointDeletion(Mutation):
             visual (bool): True if the visualizaiton is active. False if not.
         """
         super().__init__()
-        self.SubKind = "Pointwise Deletion"
         self.ChrID = ChrID
         self.Pos = Pos
         if cell != None:
             cell.events.append(self)
-            cell.DNA.CHRs[ChrID - 1].length -= 1
+            cell.DNA.editable_chromosome(ChrID).length -= 1
             if cell.DNA.CHRs[ChrID - 1].length == 0:
-                cell.DNA.IDs.remove(ChrID)
+                cell.DNA.remove_ID(ChrID)
                 print(f"(generation: {cell.generation}) Chromosome {ChrID} has been removed! \n The event was a {self}.\n")
 
+    def row(self):
+        """
+        Returns the columns of the event in the EventLog.
+
+        Returns
+        -------
+            row (tuple): (chr_a, chr_b, pos, length, final_pos).
+        """
+        return (self.ChrID, 0, self.Pos, 1, 0)
+
+    @classmethod
+    def from_row(cls, chr_a, chr_b, pos, length, final_pos):
+        """
+        Builds the event from its columns in the EventLog, without adding it to any cell.
+
+        Parameters
+        ----------
+            chr_a (int), chr_b (int), pos (int), length (int), final_pos (int): columns of the event.
+        """
+        return cls(chr_a, pos)
+
     def __repr__(self):
         return f"Event->{self.kind}->{self.SubKind}(ChrId: {self.ChrID!r}, Pos: {self.Pos!r})"
 
@@ -1,5 +1,6 @@
 from Mutation import Mutation
 from BinaryTree import Node
+from Coverage import Coverage
 import numpy as np
 
 class PointInsertion(Mutation):
@@ -18,25 +19,31 @@ class PointInsertion(Mutation):
     Methods
     -------
     update_visual(self, chr: Chromosome):
-        Updates the "visual" array of the chromosome.
-    reconstruct(self, node: Node):
+        Updates the "visual" coverage (Coverage) of the chromosome.
+    reconstruct(self, node: Node, rng = None):
         Reconstruction of the DNA sequence involved in the current PointwiseInsertion, of the 
         considered cell.
+    row(self) -> tuple
+        Returns the columns (chr_a, chr_b, pos, length, final_pos) of the event in the EventLog.
+    from_row(cls, chr_a, chr_b, pos, length, final_pos)
+        Builds the event from its columns in the EventLog.
     """
+    __slots__ = ("ChrID", "Pos")
+    SubKind = "Pointwise Insertion"
+    type_code = 5
+
     def update_visual(self, node: Node):
         """
-        Updates the "visual" array of the chromosome.
+        Updates the "visual" coverage (Coverage) of the chromosome.
 
         Parameters
         ----------
             chr (Chromosome): chromosome involved in the Deletion.
         """
         chr = node.data.DNA.CHRs[self.ChrID - 1]
-        new_vis = np.concatenate((chr.visual[: self.Pos], np.array([1]), chr.visual[self.Pos :]))
-        #if len(new_vis) != chr.length: raise Exception(f"P.Insertion: visual {len(new_vis)}, chr {chr.length}")
-        chr.visual = new_vis
+        chr.visual = chr.visual.insert(self.Pos, Coverage(1, 1))
 
-    def reconstruct(self, node: Node):
+    def reconstruct(self, node: Node, rng = None):
         """
         Reconstruction of the DNA sequence involved in the current PointwiseInsertion, in the 
         considered cell. It takes the old sequence, and modifies it in order to add the
@@ -45,10 +52,13 @@ class PointInsertion(Mutation):
         Parameters
         ----------
             node (Node): node containing the involved cell.
+            rng (np.random.Generator): random generator of the node, from which the new bases
+                                       are drawn. (default: None, a new generator)
         """
-        chrID, ins_pos = self.ChrID, self.Pos
-        ins_base = np.random.choice(["A","G","C","T"])
-        node.data.DNA.CHRs[chrID - 1].sequence = node.data.DNA.CHRs[chrID - 1].sequence[ : ins_pos] + ins_base + node.data.DNA.CHRs[chrID - 1].sequence[ins_pos : ]
+        if rng is None: rng = np.random.default_rng()
+        chr = node.data.DNA.CHRs[self.ChrID - 1]
+        ins_base = rng.choice(["A","G","C","T"])
+        chr.sequence = chr.sequence.insert(self.Pos, str(ins_base))
 
     def __init__(self, ChrID :int, Pos :int, cell = None):
         """
@@ -63,12 +73,32 @@ class PointInsertion(Mutation):
             visual (bool): True if the visualizaiton is active. False if not.
         """
         super().__init__()
-        self.SubKind = "Pointwise Insertion"
         self.ChrID = ChrID
         self.Pos = Pos
         if cell != None:
             cell.events.append(self)
-            cell.DNA.CHRs[ChrID - 1].length += 1
+            cell.DNA.editable_chromosome(ChrID).length += 1
+
+    def row(self):
+        """
+        Returns the columns of the event in the EventLog.
+
+        Returns
+        -------
+            row (tuple): (chr_a, chr_b, pos, length, final_pos).
+        """
+        return (self.ChrID, 0, self.Pos, 1, 0)
+
+    @classmethod
+    def from_row(cls, chr_a, chr_b, pos, length, final_pos):
+        """
+        Builds the event from its columns in the EventLog, without adding it to any cell.
+
+        Parameters
+        ----------
+            chr_a (int), chr_b (int), pos (int), length (int), final_pos (int): columns of the event.
+        """
+        return cls(chr_a, pos)
 
     def __repr__(self):
         return f"Event->{self.kind}->{self.SubKind}(ChrId: {self.ChrID!r}, Pos: {self.Pos!r})"
@@ -17,23 +17,31 @@ class PointReplacement(Mutation):
     Methods
     -------
     update_visual(self, chr: Chromosome):
-        Updates the "visual" array of the chromosome.
-    reconstruct(self, node: Node):
+        Updates the "visual" coverage (Coverage) of the chromosome.
+    reconstruct(self, node: Node, rng = None):
         Reconstruction of the DNA sequence involved in the current PointwiseReplacement, of the 
         considered cell.
+    row(self) -> tuple
+        Returns the columns (chr_a, chr_b, pos, length, final_pos) of the event in the EventLog.
+    from_row(cls, chr_a, chr_b, pos, length, final_pos)
+        Builds the event from its columns in the EventLog.
     """
+    __slots__ = ("ChrID", "Pos")
+    SubKind = "Pointwise Replacement"
+    type_code = 7
+
     def update_visual(self, node: Node):
         """
-        Updates the "visual" array of the chromosome.
+        Updates the "visual" coverage (Coverage) of the chromosome.
 
         Parameters
         ----------
             chr (Chromosome): chromosome involved in the Deletion.
         """
         chr = node.data.DNA.CHRs[self.ChrID - 1]
-        chr.visual[self.Pos] += 1
+        chr.visual = chr.visual.increment(self.Pos, self.Pos + 1)
 
-    def reconstruct(self, node: Node):
+    def reconstruct(self, node: Node, rng = None):
         """
         Reconstruction of the DNA sequence involved in the current PointwiseReplacement, in the 
         considered cell. It takes the old sequence, and modifies it in order to add the
@@ -42,13 +50,16 @@ class PointReplacement(Mutation):
         Parameters
         ----------
             node (Node): node containing the involved cell.
+            rng (np.random.Generator): random generator of the node, from which the new bases
+                                       are drawn. (default: None, a new generator)
         """
-        chrID, repl_pos = self.ChrID, self.Pos
-        old_base = str(node.data.DNA.CHRs[chrID - 1].sequence[repl_pos])
+        if rng is None: rng = np.random.default_rng()
+        chr = node.data.DNA.CHRs[self.ChrID - 1]
+        old_base = str(chr.sequence[self.Pos])
         bases = ["A","G","C","T"]
         bases.remove(old_base)
-        new_base = np.random.choice(bases)
-        node.data.DNA.CHRs[chrID - 1].sequence = node.data.DNA.CHRs[chrID - 1].sequence[ : repl_pos] + new_base + node.data.DNA.CHRs[chrID - 1].sequence[repl_pos + 1 : ]
+        new_base = rng.choice(bases)
+        chr.sequence = chr.sequence.replace(self.Pos, str(new_base))
     
     def __init__(self, ChrID :int, Pos :int, cell = None):
         """
@@ -63,13 +74,33 @@ class PointReplacement(Mutation):
             visual (bool): True if the visualizaiton is active. False if not.
         """
         super().__init__()
-        self.SubKind = "Pointwise Replacement"
         self.ChrID = ChrID
         self.Pos = Pos
         if cell != None:
             cell.events.append(self)
             
 
+    def row(self):
+        """
+        Returns the columns of the event in the EventLog.
+
+        Returns
+        -------
+            row (tuple): (chr_a, chr_b, pos, length, final_pos).
+        """
+        return (self.ChrID, 0, self.Pos, 1, 0)
+
+    @classmethod
+    def from_row(cls, chr_a, chr_b, pos, length, final_pos):
+        """
+        Builds the event from its columns in the EventLog, without adding it to any cell.
+
+        Parameters
+        ----------
+            chr_a (int), chr_b (int), pos (int), length (int), final_pos (int): columns of the event.
+        """
+        return cls(chr_a, pos)
+
     def __repr__(self):
         return f"Event->{self.kind}->{self.SubKind}(ChrId: {self.ChrID!r}, Pos: {self.Pos!r})"
 
@@ -0,0 +1,133 @@
+import numpy as np
+
+
+class PopulationCoverage():
+    """
+    Population-level statistics of the cumulated mutations, accumulated over the leaves of a
+    simulated tree without keeping their 'visual' arrays. A group of identical leaves (all the
+    leaves below a node whose descendants have no events) is added once, with its number of leaves
+    as weight; every other leaf is added one at a time.
+
+    Attributes
+    ----------
+    n_chr : int
+        Number of chromosomes of each cell.
+    n_leaves : int
+        Number of leaves added.
+    histogram : np.ndarray
+        'histogram[k]' is the number of bases (summed over all the leaves) involved in exactly 'k'
+        Rearrangements/Mutations.
+    max_histogram : np.ndarray
+        Array (n_chr, K): 'max_histogram[ID - 1, k]' is the number of leaves whose chromosome 'ID'
+        has maximum coverage 'k' (at most 'k' superposed mutations, reached in some base).
+
+    Methods
+    -------
+    add_leaves(self, visuals: list, weight: int)
+        Adds 'weight' leaves whose chromosomes have the given coverages.
+    max_distribution(self, ID: int) -> np.ndarray
+        Returns the distribution of the maximum coverage of the chromosome 'ID' over the leaves.
+    stat_max_cumulated_mutations(self) -> (float, float)
+        Same statistics of 'Simulator.stat_max_cumulated_mutations'.
+    stat_cumulated_mutations(self) -> (float, float)
+        Same statistics of 'Simulator.stat_cumulated_mutations'.
+    """
+    def __init__(self, n_chr: int):
+        """
+        It initializes empty statistics.
+
+        Parameters
+        ----------
+            n_chr (int): number of chromosomes of each cell.
+        """
+        self.n_chr = n_chr
+        self.n_leaves = 0
+        self.histogram = np.zeros(1, dtype=np.int64)
+        self.max_histogram = np.zeros((n_chr, 1), dtype=np.int64)
+        # running maximum (over the leaves, in order) used by 'stat_max_cumulated_mutations'
+        self._running_max = 0
+        self._running_max_sum = 0
+        self._running_max_sum2 = 0
+
+    @staticmethod
+    def _grow(array, size: int):
+        """
+        Returns 'array' extended with zeros along its last axis up to 'size' elements.
+        """
+        if array.shape[-1] >= size: return array
+        padding = [(0, 0)] * (array.ndim - 1) + [(0, size - array.shape[-1])]
+        return np.pad(array, padding)
+
+    def add_leaves(self, visuals: list, weight: int):
+        """
+        Adds 'weight' leaves whose chromosomes have the given coverages. The leaves must be added
+        in the order of 'Simulator.leaves' (left to right) for 'stat_max_cumulated_mutations'.
+
+        Parameters
+        ----------
+            visuals (list): Coverage of each chromosome, ordered by ID.
+            weight (int): number of identical leaves.
+        """
+        leaf_max = 0
+        for ID, visual in enumerate(visuals, start=1):
+            run_lengths = np.diff(np.append(visual.starts, visual.length))
+            bases = np.bincount(visual.counts, weights=run_lengths).astype(np.int64)
+            self.histogram = PopulationCoverage._grow(self.histogram, len(bases))
+            self.histogram[: len(bases)] += weight * bases
+            max = visual.max()
+            self.max_histogram = PopulationCoverage._grow(self.max_histogram, max + 1)
+            self.max_histogram[ID - 1, max] += weight
+            if max >= leaf_max: leaf_max = max
+        if leaf_max >= self._running_max: self._running_max = leaf_max
+        self._running_max_sum += weight * self._running_max
+        self._running_max_sum2 += weight * self._running_max ** 2
+        self.n_leaves += weight
+
+    def max_distribution(self, ID: int):
+        """
+        Returns the distribution of the maximum coverage of the chromosome 'ID' over the leaves.
+
+        Parameters
+        ----------
+            ID (int): chromosome ID.
+
+        Returns
+        -------
+            distribution (np.ndarray): 'distribution[k]' is the fraction of leaves whose
+                                       chromosome has maximum coverage 'k'.
+        """
+        return self.max_histogram[ID - 1] / self.n_leaves
+
+    def stat_max_cumulated_mutations(self):
+        """
+        Computes average and standard deviation of the maximum number (between different chromosme of
+        a cell) of cumulated mutations over each leaf, as 'Simulator.stat_max_cumulated_mutations'.
+
+        Return
+        ------
+            ave (float): average
+            stdev (float): standard deviation
+        """
+        ave = self._running_max_sum / self.n_leaves
+        stdv = np.sqrt(self._running_max_sum2 / self.n_leaves - np.power(ave, 2))
+        return ave, stdv
+
+    def stat_cumulated_mutations(self):
+        """
+        Computes average and standard deviation of the number of cumulated mutations over each
+        chromosome of each leaf, as 'Simulator.stat_cumulated_mutations'.
+
+        Return
+        ------
+            ave (float): average
+            stdev (float): standard deviation
+        """
+        values = np.arange(self.max_histogram.shape[1])
+        n = self.n_leaves * self.n_chr
+        ave = (self.max_histogram * values).sum() / n
+        mom2 = (self.max_histogram * values ** 2).sum() / n
+        stdv = np.sqrt(mom2 - np.power(ave, 2))
+        return ave, stdv
+
+    def __repr__(self):
+        return f"PopulationCoverage(n_leaves: {self.n_leaves!r}, n_chr: {self.n_chr!r})"
@@ -0,0 +1,90 @@
+import sys
+import time
+
+
+class Progress():
+    """
+    Progress report of a long stage (e.g. the reconstruction of many leaves), printed on the
+    standard error, so that the standard output can be piped to another program. A line with the
+    items done, their rate and the estimated remaining time is printed at most every 'interval'
+    seconds, and a last line when the stage is closed. The items done before the report was created
+    (e.g. by an interrupted run which is resumed) are counted as done, but not in the rate.
+
+    Attributes
+    ----------
+    stage : str
+        Name of the stage.
+    total : int
+        Number of items of the stage (None if it is not known, e.g. for items read from a pipe).
+    done : int
+        Number of items done.
+    interval : float
+        Minimum number of seconds between two lines.
+    quiet : bool
+        If True, nothing is printed.
+
+    Methods
+    -------
+    update(self, n = 1)
+        Adds 'n' items done.
+    close(self)
+        Prints the last line.
+    """
+    def __init__(self, stage: str, total: int, done = 0, interval = 1., quiet = False):
+        """
+        It starts the report.
+
+        Parameters
+        ----------
+            stage (str): name of the stage.
+            total (int): number of items of the stage, or None if it is not known.
+            done (int): number of items already done. (default: 0)
+            interval (float): minimum number of seconds between two lines. (default: 1.)
+            quiet (bool): if True, nothing is printed. (default: False)
+        """
+        self.stage = stage
+        self.total = total
+        self.done = done
+        self.interval = interval
+        self.quiet = quiet
+        self._initial = done
+        self._start = self._last = time.perf_counter()
+
+    def update(self, n = 1):
+        """
+        Adds 'n' items done, and prints a line if 'interval' seconds passed since the last one.
+
+        Parameters
+        ----------
+            n (int): number of items done. (default: 1)
+        """
+        self.done += n
+        now = time.perf_counter()
+        # the last item is reported by 'close'
+        if now - self._last >= self.interval and self.done != self.total:
+            self._last = now
+            self._print(now)
+
+    def _print(self, now: float, last = False):
+        if self.quiet: return
+        elapsed = now - self._start
+        rate = (self.done - self._initial) / elapsed if elapsed > 0 else 0.
+        if self.total is None:
+            line = f"[{self.stage}] {self.done}, {rate:.2f}/s"
+        else:
+            percentage = 100. * self.done / self.total if self.total > 0 else 100.
+            line = f"[{self.stage}] {self.done}/{self.total} ({percentage:.1f}%), {rate:.2f}/s"
+        if last:
+            line += f", {elapsed:.1f} s"
+        elif rate > 0 and self.total is not None:
+            line += f", {(self.total - self.done) / rate:.0f} s remaining"
+        print(line, file=sys.stderr, flush=True)
+
+    def close(self):
+        """
+        Prints the last line, with the elapsed time.
+        """
+        self._print(time.perf_counter(), last=True)
+
+    def __repr__(self):
+        return f"Progress(stage: {self.stage!r}, done: {self.done!r}, total: {self.total!r})"
@@ -0,0 +1,109 @@
+import math
+
+
+class QuantileSketch():
+    """
+    Mergeable sketch of the quantiles of a stream of non negative values, with relative accuracy
+    'accuracy'. The positive values are counted in logarithmic buckets '(gamma^(k-1), gamma^k]',
+    with 'gamma = (1 + accuracy) / (1 - accuracy)', so that every quantile is returned within a
+    relative error 'accuracy' and the memory grows only with the logarithm of the range of the
+    values. Two sketches with the same accuracy are merged adding their buckets.
+
+    Attributes
+    ----------
+    accuracy : float
+        Relative accuracy of the quantiles.
+    count : int
+        Number of values added.
+    zeros : int
+        Number of values equal to 0.
+    buckets : dict
+        Number of positive values in each bucket, indexed by 'k'.
+
+    Methods
+    -------
+    add(self, value: float, weight = 1)
+        Adds a value to the sketch.
+    merge(self, other: QuantileSketch)
+        Adds the values of another sketch.
+    quantile(self, q: float) -> float
+        Returns the 'q'-quantile of the values added.
+    """
+    __slots__ = ("accuracy", "count", "zeros", "buckets", "_log_gamma")
+
+    def __init__(self, accuracy = 0.01):
+        """
+        It initializes an empty sketch.
+
+        Parameters
+        ----------
+            accuracy (float): relative accuracy of the quantiles. (default: 0.01)
+        """
+        if not 0 < accuracy < 1: raise Exception(f"The accuracy must be between 0 and 1")
+        self.accuracy = accuracy
+        self.count = 0
+        self.zeros = 0
+        self.buckets = {}
+        self._log_gamma = math.log((1 + accuracy) / (1 - accuracy))
+
+    def add(self, value: float, weight = 1):
+        """
+        Adds 'weight' times the value 'value' to the sketch.
+
+        Parameters
+        ----------
+            value (float): non negative value.
+            weight (int): number of times the value is added. (default: 1)
+        """
+        if value > 0:
+            k = math.ceil(math.log(value) / self._log_gamma)
+            self.buckets[k] = self.buckets.get(k, 0) + weight
+        else:
+            self.zeros += weight
+        self.count += weight
+
+    def merge(self, other):
+        """
+        Adds the values of another sketch with the same accuracy.
+
+        Parameters
+        ----------
+            other (QuantileSketch): sketch to be merged.
+        """
+        if other.accuracy != self.accuracy: raise Exception(f"The sketches have different accuracies")
+        for k, n in other.buckets.items():
+            self.buckets[k] = self.buckets.get(k, 0) + n
+        self.zeros += other.zeros
+        self.count += other.count
+
+    def quantile(self, q: float):
+        """
+        Returns the 'q'-quantile of the values added (nan if the sketch is empty).
+
+        Parameters
+        ----------
+            q (float): quantile, between 0 and 1.
+
+        Returns
+        -------
+            value (float): estimate of the quantile, within a relative error 'accuracy'.
+        """
+        if self.count == 0: return math.nan
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen: return 0.
+        for k in sorted(self.buckets):
+            seen += self.buckets[k]
+            if rank < seen: break
+        gamma = math.exp(self._log_gamma)
+        return 2 * gamma ** k / (gamma + 1)
+
+    def __getstate__(self):
+        return (self.accuracy, self.count, self.zeros, self.buckets)
+
+    def __setstate__(self, state):
+        self.__init__(state[0])
+        self.count, self.zeros, self.buckets = state[1:]
+
+    def __repr__(self):
+        return f"QuantileSketch(accuracy: {self.accuracy!r}, count: {self.count!r})"
@@ -19,9 +19,11 @@ class Rearrangement(Event):
         ReciprocalTranslocation
         Duplication
     """
+    __slots__ = ("chr_id",)
+    kind = "Rearrangement"
+
     def __init__(self):
         """
-        It initializes the kind to 'Rearrangement' and the chromosome ID to 'None'.
+        It initializes the chromosome ID to 'None'.
         """
-        self.kind = "Rearrangement"
         self.chr_id = None
\ No newline at end of file
@@ -1,6 +1,5 @@
 from Rearrangement import Rearrangement
 from BinaryTree import Node
-import numpy as np
 
 class ReciprocalTranslocation(Rearrangement):
     """
@@ -25,30 +24,36 @@ class ReciprocalTranslocation(Rearrangement):
     Methods
     -------
     update_visual(self, chrs: tuple):
-        Updates the "visual" array of the chromosome.
-    reconstruct(self, node: Node)
+        Updates the "visual" coverage (Coverage) of the chromosome.
+    reconstruct(self, node: Node, rng = None):
         Reconstruction of the DNA sequence involved in the current ReciprocalTranslocation, of the 
         considered cell.
+    row(self) -> tuple
+        Returns the columns (chr_a, chr_b, pos, length, final_pos) of the event in the EventLog.
+    from_row(cls, chr_a, chr_b, pos, length, final_pos)
+        Builds the event from its columns in the EventLog.
     """
+    __slots__ = ("ChrIDs", "InitPos", "Length", "FinalPos")
+    SubKind = "Reciprocal Translocation"
+    type_code = 3
+
     def update_visual(self, node: Node):
         """
-        Updates the "visual" array of the chromosome.
+        Updates the "visual" coverage (Coverage) of the chromosome.
 
         Parameters
         ----------
             chrs (tuple): tuple of the two chromosome involved in the Deletion.
         """
         chrs = (node.data.DNA.CHRs[self.ChrIDs[0] - 1], node.data.DNA.CHRs[self.ChrIDs[1] - 1])
-        translocated = chrs[0].visual[self.InitPos : self.InitPos + self.Length] + 1
-        new_vis_1 = np.concatenate((chrs[0].visual[: self.InitPos], chrs[0].visual[self.InitPos + self.Length :]))
-        new_vis_2 = np.concatenate((chrs[1].visual[: self.FinalPos], translocated, chrs[1].visual[self.FinalPos :]))
-        #if len(new_vis_1) != chrs[0].length: raise Exception(f"chr 1: visual={len(new_vis_1)}, chr_len={chrs[0].length}")
-        if self.InitPos - 1 >= 0: new_vis_1[self.InitPos - 1] += 1
-        if self.InitPos  < len(new_vis_1): new_vis_1[self.InitPos] += 1
-        #if len(new_vis_2) != chrs[1].length: raise Exception(f"chr 2: visual={len(new_vis_2)}, chr_len={chrs[0].length}")
+        translocated = chrs[0].visual.slice(self.InitPos, self.InitPos + self.Length)
+        translocated = translocated.increment(0, translocated.length)
+        new_vis_1 = chrs[0].visual.delete(self.InitPos, self.InitPos + self.Length)
+        new_vis_1 = new_vis_1.increment(self.InitPos - 1, self.InitPos + 1)
+        new_vis_2 = chrs[1].visual.insert(self.FinalPos, translocated)
         chrs[0].visual, chrs[1].visual = new_vis_1, new_vis_2
 
-    def reconstruct(self, node: Node):
+    def reconstruct(self, node: Node, rng = None):
         """
         Reconstruction of the DNA sequence involved in the current ReciprocalTranslocation, in the 
         considered cell. It takes the old sequence, and modifies it in order to add the 
@@ -57,13 +62,12 @@ class ReciprocalTranslocation(Rearrangement):
         Parameters
         ----------
             node (Node): node containing the involved cell.
+            rng (np.random.Generator): random generator of the node (not used).
         """
-        chrIDs, init_pos, end_pos, final_pos = self.ChrIDs, self.InitPos, self.InitPos + self.Length, self.FinalPos
-        transl_seq = node.data.DNA.CHRs[chrIDs[0] - 1].sequence[init_pos : end_pos]
-        node.data.DNA.CHRs[chrIDs[0] - 1].sequence = node.data.DNA.CHRs[chrIDs[0] - 1].sequence[ : init_pos] \
-             +  node.data.DNA.CHRs[chrIDs[0] - 1].sequence[end_pos : ]
-        node.data.DNA.CHRs[chrIDs[1] - 1].sequence = node.data.DNA.CHRs[chrIDs[1] - 1].sequence[ : final_pos] \
-            + transl_seq + node.data.DNA.CHRs[chrIDs[1] - 1].sequence[final_pos : ]
+        chrs = (node.data.DNA.CHRs[self.ChrIDs[0] - 1], node.data.DNA.CHRs[self.ChrIDs[1] - 1])
+        transl_seq = chrs[0].sequence.copy_range(self.InitPos, self.InitPos + self.Length)
+        chrs[0].sequence = chrs[0].sequence.delete(self.InitPos, self.Length)
+        chrs[1].sequence = chrs[1].sequence.insert(self.FinalPos, transl_seq)
 
     def __init__(self, ChrIDs :tuple, InitPos :int, Length :int, FinalPos :int, cell = None):
         """
@@ -83,19 +87,39 @@ class ReciprocalTranslocation(Rearrangement):
             visual (bool): True if the visualizaiton is active. False if not.
         """
         super().__init__()
-        self.SubKind = "Reciprocal Translocation"
         self.ChrIDs = ChrIDs
         self.InitPos = InitPos
         self.Length = Length
         self.FinalPos = FinalPos
         if cell != None:
             cell.events.append(self)
-            cell.DNA.CHRs[ChrIDs[0] - 1].length -= self.Length
-            cell.DNA.CHRs[ChrIDs[1] - 1].length += self.Length
+            cell.DNA.editable_chromosome(ChrIDs[0]).length -= self.Length
+            cell.DNA.editable_chromosome(ChrIDs[1]).length += self.Length
             if cell.DNA.CHRs[ChrIDs[0] - 1].length == 0:
-                cell.DNA.IDs.remove(ChrIDs[0])
+                cell.DNA.remove_ID(ChrIDs[0])
                 print(f"(generation: {cell.generation}) Chromosome {ChrIDs[0]} has been removed! The events was a {self}.")
 
+    def row(self):
+        """
+        Returns the columns of the event in the EventLog.
+
+        Returns
+        -------
+            row (tuple): (chr_a, chr_b, pos, length, final_pos).
+        """
+        return (self.ChrIDs[0], self.ChrIDs[1], self.InitPos, self.Length, self.FinalPos)
+
+    @classmethod
+    def from_row(cls, chr_a, chr_b, pos, length, final_pos):
+        """
+        Builds the event from its columns in the EventLog, without adding it to any cell.
+
+        Parameters
+        ----------
+            chr_a (int), chr_b (int), pos (int), length (int), final_pos (int): columns of the event.
+        """
+        return cls((chr_a, chr_b), pos, length, final_pos)
+
     def __repr__(self):
         return f"Event->{self.kind}->{self.SubKind}(ChrIds: {self.ChrIDs!r}, InitPos: {self.InitPos!r}, Length: {self.Length!r}, FinalPos: {self.FinalPos!r})"
 
@@ -0,0 +1,254 @@
+import gzip
+import mmap
+import os
+import numpy as np
+from BufferBases import BufferBases
+from PackedBases import PackedBases
+
+
+class ReferenceGenome():
+    """
+    Reference (WT) genome read from a file, in one of the formats:
+        FASTA: each chromosome is a record '>name' followed by its sequence, split in lines;
+        plain text: each line contains the sequence of one chromosome (the format of
+                    'chromosome_list.txt');
+    optionally compressed with gzip. Uncompressed files are memory-mapped: each chromosome is a
+    BufferBases view on the file, so that no base is copied until it is used, and all the
+    processes reading the same file share the same pages of memory. The position of the chromosomes
+    in a FASTA file is found once and can be saved in a '.fai' index (the format of 'samtools
+    faidx'), which is read instead of scanning the file when it exists. Compressed files cannot be
+    memory-mapped: they are decompressed in memory.
+
+    Attributes
+    ----------
+    file_name : str
+        Path of the file.
+    names : list
+        Name of each chromosome (the FASTA record names, or "1", "2"... for plain text files).
+    sequences : list
+        Sequence of each chromosome (BufferBases), ordered by ID.
+    index : list
+        List of tuple (name, length, offset, line_bases, line_width): position of each chromosome
+        in a memory-mapped FASTA file (empty for the other formats).
+
+    Methods
+    -------
+    chromosome_table(self, packed = False) -> list
+        Returns the 'chromosome_table' of the genome.
+    write_index(self, index_name = None)
+        Writes the '.fai' index of a FASTA file.
+    close(self)
+        Closes the memory map of the file.
+    """
+    def __init__(self, file_name: str):
+        """
+        It opens the file and finds the position of each chromosome.
+
+        Parameters
+        ----------
+            file_name (str): path of the file (FASTA or plain text, optionally gzip compressed).
+
+        Raises
+        ------
+            Exception
+                If the file contains no sequence.
+        """
+        self.file_name = file_name
+        self.names, self.sequences, self.index = [], [], []
+        self._mmap = None
+        with open(file_name, "rb") as f:
+            compressed = f.read(2) == b"\x1f\x8b"
+        if compressed:
+            self._read_compressed()
+        elif os.path.getsize(file_name) > 0:
+            with open(file_name, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            first = 0
+            while first < len(self._mmap) and self._mmap[first] in b" \t\r\n": first += 1
+            if self._mmap[first : first + 1] == b">":
+                self._index_fasta()
+            else:
+                self._index_lines()
+        if not self.sequences: raise Exception(f"No sequence found in {file_name}")
+
+    def _index_lines(self):
+        """
+        Builds a view on each line of a memory-mapped plain text file.
+        """
+        data, start = self._mmap, 0
+        while start < len(data):
+            end = data.find(b"\n", start)
+            if end < 0: end = len(data)
+            length = end - start - (1 if end > start and data[end - 1] == ord("\r") else 0)
+            if length > 0:
+                self.names.append(str(len(self.sequences) + 1))
+                self.sequences.append(BufferBases(data, start, length))
+            start = end + 1
+
+    def _index_fasta(self):
+        """
+        Builds a view on each record of a memory-mapped FASTA file, reading the '.fai' index if
+        it exists.
+        """
+        if os.path.exists(self.file_name + ".fai"):
+            with open(self.file_name + ".fai", "r") as f:
+                for line in f:
+                    if not line.strip(): continue
+                    name, length, offset, line_bases, line_width = line.split("\t")[: 5]
+                    self.index.append((name, int(length), int(offset), int(line_bases), \
+                                       int(line_width)))
+            for name, length, offset, line_bases, line_width in self.index:
+                self.names.append(name)
+                if length == 0:
+                    self.sequences.append(BufferBases(self._mmap, offset, 0))
+                else:
+                    self.sequences.append(BufferBases(self._mmap, offset, length, line_bases, \
+                                                      line_width))
+        else:
+            self._scan_fasta()
+
+    def _scan_fasta(self):
+        """
+        Finds the name, length, offset and line geometry of each record of the FASTA file. The
+        records whose lines do not have all the same length (except the last one) cannot be read
+        through the index: their bases are copied in memory, and the index cannot be written.
+        Empty records (a header followed by another header) are indexed with length 0.
+        """
+        data = self._mmap
+        header = data.find(b">")
+        while header >= 0:
+            name_end = data.find(b"\n", header)
+            if name_end < 0: name_end = len(data)
+            name = data[header + 1 : name_end].decode("ascii").split()[0]
+            start = min(name_end + 1, len(data))
+            if data[start : start + 1] == b">":
+                # empty record: the next header follows this one
+                end = start
+            else:
+                end = data.find(b"\n>", name_end)
+                end = len(data) if end < 0 else end + 1
+            record = data[start : end]
+            length = len(record) - record.count(b"\n") - record.count(b"\r")
+            first_line = record.find(b"\n")
+            line_width = first_line + 1 if first_line >= 0 else len(record)
+            line_bases = len(record[: line_width].rstrip(b"\r\n"))
+            self.names.append(name)
+            if length == 0:
+                self.index.append((name, 0, start, 0, 0))
+                self.sequences.append(BufferBases(data, start, 0))
+            elif self._regular(record, length, line_bases, line_width):
+                self.index.append((name, length, start, line_bases, line_width))
+                self.sequences.append(BufferBases(data, start, length, line_bases, line_width))
+            else:
+                self.sequences.append(BufferBases(record.translate(None, b"\r\n")))
+            header = end if end < len(data) else -1
+
+    @staticmethod
+    def _regular(record: bytes, length: int, line_bases: int, line_width: int):
+        """
+        Checks if all the lines of a FASTA record, except the last one, have 'line_bases' bases
+        and the same terminator.
+        """
+        if length == 0 or line_bases == 0: return False
+        n_lines = -(-length // line_bases)
+        terminator = line_width - line_bases
+        if len(record) not in (length + n_lines * terminator, length + (n_lines - 1) * terminator):
+            return False
+        ends = np.frombuffer(record, dtype=np.uint8)
+        ends = ends[line_width - 1 : (n_lines - 1) * line_width : line_width]
+        return bool(np.all(ends == ord("\n")))
+
+    def _read_compressed(self):
+        """
+        Decompresses a gzip file, storing the bases of each chromosome in memory.
+        """
+        records, name, fasta = [], None, None
+        with gzip.open(self.file_name, "rb") as f:
+            for line in f:
+                line = line.rstrip(b"\r\n")
+                if fasta is None:
+                    if not line.strip(): continue
+                    fasta = line.startswith(b">")
+                if fasta and line.startswith(b">"):
+                    name = line[1 :].decode("ascii").split()[0]
+                    records.append((name, bytearray()))
+                elif fasta:
+                    records[-1][1].extend(line)
+                elif line:
+                    records.append((str(len(records) + 1), line))
+        for name, bases in records:
+            self.names.append(name)
+            self.sequences.append(BufferBases(bytes(bases)))
+
+    def chromosome_table(self, packed = False):
+        """
+        Returns the 'chromosome_table' of the genome. The sequences are views on the file, which
+        can be used directly by the Simulator.
+
+        Parameters
+        ----------
+            packed (bool): if True each sequence is encoded with 2 bits per base (PackedBases):
+                           the bases are read and copied. (default: False)
+
+        Returns
+        -------
+            chromosome_table (list): list of tuple. Each tuple contains the chromosome ID and its
+                                     sequence (BufferBases or PackedBases).
+
+        Raises
+        ------
+            Exception
+                If 'packed' is True and a record contains bases different from A, C, G, T (e.g.
+                N), which cannot be packed.
+        """
+        if not packed: return list(enumerate(self.sequences, start=1))
+        chromosome_table = []
+        for ID, (name, seq) in enumerate(zip(self.names, self.sequences), start=1):
+            try:
+                chromosome_table.append((ID, PackedBases(str(seq))))
+            except Exception as error:
+                raise Exception(f"Record {name!r} (chromosome {ID}) of {self.file_name} cannot be packed: {error}. Read it with packed=False")
+        return chromosome_table
+
+    def write_index(self, index_name = None):
+        """
+        Writes the '.fai' index of a memory-mapped FASTA file, so that the next time the file is
+        opened it is not scanned.
+
+        Parameters
+        ----------
+            index_name (str): path of the index. (default: None, the file name followed by '.fai')
+        """
+        if len(self.index) != len(self.sequences):
+            raise Exception(f"The file is compressed, not in FASTA format or its lines have different lengths: it cannot be indexed")
+        if index_name is None: index_name = self.file_name + ".fai"
+        with open(index_name, "w") as f:
+            for name, length, offset, line_bases, line_width in self.index:
+                f.write(f"{name}\t{length}\t{offset}\t{line_bases}\t{line_width}\n")
+
+    def close(self):
+        """
+        Closes the memory map of the file. The views of the sequences are released first, so the
+        sequences (and the Ropes built on them) cannot be used anymore. If other views on the file
+        are still alive (e.g. NumPy arrays built on 'BufferBases.buffer'), the map cannot be closed
+        now: it is closed when the last of them is freed.
+        """
+        # BufferError: the view (or the map) is still exported
+        for seq in self.sequences:
+            try:
+                seq.buffer.release()
+            except BufferError:
+                pass
+        self.sequences = []
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass
+            self._mmap = None
+
+    def __len__(self):
+        return len(self.sequences)
+
+    def __repr__(self):
+        return f"ReferenceGenome(file_name: {self.file_name!r}, chromosomes: {len(self)!r})"
@@ -0,0 +1,285 @@
+import random
+
+# private generator for the treap priorities: it must not consume the numpy random state used by
+# the simulation, otherwise the reconstructed sequences would depend on the rope internals.
+_priorities = random.Random(0)
+
+
+class _Piece():
+    """
+    Node of the (persistent) treap on which the Rope is built. Each node stores one piece of the
+    sequence, i.e. the slice 'source[start : start + length]', together with the total number of
+    bases and of pieces of the subtree of which it is the root. Nodes are never modified after
+    their creation, so that they can be shared between different ropes.
+    """
+    __slots__ = ("left", "right", "source", "start", "length", "priority", "size", "count")
+
+    def __init__(self, left, right, source, start, length, priority):
+        self.left = left
+        self.right = right
+        self.source = source
+        self.start = start
+        self.length = length
+        self.priority = priority
+        self.size = length + (left.size if left is not None else 0) \
+            + (right.size if right is not None else 0)
+        self.count = 1 + (left.count if left is not None else 0) \
+            + (right.count if right is not None else 0)
+
+
+def _with_children(node, left, right):
+    """
+    Returns a copy of 'node' (same piece and priority) with the given children.
+    """
+    return _Piece(left, right, node.source, node.start, node.length, node.priority)
+
+
+def _merge(a, b):
+    """
+    Concatenates the treaps 'a' and 'b', keeping the heap order of the priorities.
+    """
+    if a is None: return b
+    if b is None: return a
+    if a.priority > b.priority:
+        return _with_children(a, a.left, _merge(a.right, b))
+    return _with_children(b, _merge(a, b.left), b.right)
+
+
+def _split(node, k):
+    """
+    Splits the treap 'node' in two treaps: the first contains the first 'k' bases, the second all
+    the others. A piece is cut in two if 'k' falls inside it.
+    """
+    if node is None: return None, None
+    left_size = node.left.size if node.left is not None else 0
+    if k <= left_size:
+        left, right = _split(node.left, k)
+        return left, _with_children(node, right, node.right)
+    if k >= left_size + node.length:
+        left, right = _split(node.right, k - left_size - node.length)
+        return _with_children(node, node.left, left), right
+    offset = k - left_size
+    left = _Piece(node.left, None, node.source, node.start, offset, node.priority)
+    right = _Piece(None, node.right, node.source, node.start + offset, node.length - offset, \
+                   node.priority)
+    return left, right
+
+
+class Rope():
+    """
+    Rope Class. Immutable DNA sequence stored as a persistent treap of pieces. Each piece refers to
+    a slice of a 'source' sequence (usually the Wild Type sequence or a short inserted sequence),
+    so that inserting, deleting, cutting and pasting or copying a range of bases costs O(log n) in
+    the number of pieces, instead of O(chromosome length) as with the slicing of a string.
+    Every operation returns a new Rope and shares all the untouched pieces with the old one.
+
+    Attributes
+    ----------
+    root : _Piece
+        Root of the treap containing the pieces of the sequence. (None for an empty sequence)
+
+    Methods
+    -------
+    insert(self, pos: int, seq)
+        Returns the sequence obtained by inserting 'seq' before the base in position 'pos'.
+    delete(self, pos: int, length: int)
+        Returns the sequence obtained by removing 'length' bases starting from position 'pos'.
+    copy_range(self, start: int, end: int)
+        Returns the subsequence between 'start' (included) and 'end' (excluded).
+    cut_paste(self, start: int, end: int, final_pos: int)
+        Returns the sequence obtained by moving the bases between 'start' and 'end' to
+        'final_pos' (position counted after the removal of the moved bases).
+    replace(self, pos: int, seq)
+        Returns the sequence obtained by replacing the bases from 'pos' on with 'seq'.
+    pieces(self)
+        Iterates over the pieces of the sequence as tuple (source, start, end).
+    nbytes
+        Approximate memory used by the pieces of the sequence.
+    """
+    __slots__ = ("root",)
+    # approximate size of a _Piece with its priority and counters
+    PIECE_BYTES = 160
+
+    def __init__(self, seq = ""):
+        """
+        It initializes the Rope with the given sequence.
+
+        Parameters
+        ----------
+            seq (str/Rope): initial sequence. Any object supporting 'len' and slicing can be used
+                            as source. (default: "")
+        """
+        if isinstance(seq, Rope): self.root = seq.root
+        else: self.root = Rope._leaf(seq, 0, len(seq))
+
+    @staticmethod
+    def _leaf(source, start, length):
+        """
+        Returns a treap with a single piece, or None if the piece is empty.
+        """
+        if length <= 0: return None
+        return _Piece(None, None, source, start, length, _priorities.random())
+
+    @staticmethod
+    def _from_root(root):
+        """
+        Builds a Rope around an already existing treap.
+        """
+        rope = Rope.__new__(Rope)
+        rope.root = root
+        return rope
+
+    @staticmethod
+    def _as_root(seq):
+        """
+        Returns the treap corresponding to 'seq'.
+        """
+        if isinstance(seq, Rope): return seq.root
+        return Rope._leaf(seq, 0, len(seq))
+
+    def _check_range(self, start, end):
+        if start < 0 or end > len(self) or start > end:
+            raise IndexError(f"range [{start}, {end}) out of the sequence (length {len(self)})")
+
+    def insert(self, pos: int, seq):
+        """
+        Returns the sequence obtained by inserting 'seq' before the base in position 'pos'.
+
+        Parameters
+        ----------
+            pos (int): position of the insertion.
+            seq (str/Rope): inserted sequence.
+        """
+        self._check_range(pos, pos)
+        left, right = _split(self.root, pos)
+        return Rope._from_root(_merge(_merge(left, Rope._as_root(seq)), right))
+
+    def delete(self, pos: int, length: int):
+        """
+        Returns the sequence obtained by removing 'length' bases starting from position 'pos'.
+
+        Parameters
+        ----------
+            pos (int): position of the first removed base.
+            length (int): number of removed bases.
+        """
+        self._check_range(pos, min(pos + length, len(self)))
+        left, rest = _split(self.root, pos)
+        _, right = _split(rest, length)
+        return Rope._from_root(_merge(left, right))
+
+    def copy_range(self, start: int, end: int):
+        """
+        Returns the subsequence between 'start' (included) and 'end' (excluded).
+
+        Parameters
+        ----------
+            start (int): position of the first copied base.
+            end (int): position following the last copied base.
+        """
+        self._check_range(start, end)
+        _, rest = _split(self.root, start)
+        middle, _ = _split(rest, end - start)
+        return Rope._from_root(middle)
+
+    def cut_paste(self, start: int, end: int, final_pos: int):
+        """
+        Returns the sequence obtained by moving the bases between 'start' and 'end' to
+        'final_pos'. 'final_pos' is the position of the moved bases in the sequence from which
+        they have been removed.
+
+        Parameters
+        ----------
+            start (int): position of the first moved base.
+            end (int): position following the last moved base.
+            final_pos (int): position where the moved bases are pasted.
+        """
+        self._check_range(start, end)
+        left, rest = _split(self.root, start)
+        moved, right = _split(rest, end - start)
+        left, right = _split(_merge(left, right), final_pos)
+        return Rope._from_root(_merge(_merge(left, moved), right))
+
+    def replace(self, pos: int, seq):
+        """
+        Returns the sequence obtained by replacing the bases from 'pos' on with 'seq'.
+
+        Parameters
+        ----------
+            pos (int): position of the first replaced base.
+            seq (str/Rope): new bases.
+        """
+        self._check_range(pos, pos + len(seq))
+        left, rest = _split(self.root, pos)
+        _, right = _split(rest, len(seq))
+        return Rope._from_root(_merge(_merge(left, Rope._as_root(seq)), right))
+
+    def pieces(self):
+        """
+        Iterates (in order) over the pieces of the sequence.
+
+        Returns
+        -------
+            iterator of tuple (source, start, end): each piece is the slice 'source[start : end]'.
+        """
+        stack, node = [], self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.source, node.start, node.start + node.length
+            node = node.right
+
+    @property
+    def nbytes(self):
+        """
+        Approximate memory used by the pieces of the sequence (the sources, e.g. the WT sequence,
+        are not counted, and the pieces shared with other ropes are counted as well).
+        """
+        return (self.root.count if self.root is not None else 0) * Rope.PIECE_BYTES
+
+    def __len__(self):
+        return self.root.size if self.root is not None else 0
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1: raise ValueError("Rope slicing does not support steps")
+            return self.copy_range(start, max(start, stop))
+        if key < 0: key += len(self)
+        if key < 0 or key >= len(self): raise IndexError("Rope index out of range")
+        node = self.root
+        while True:
+            left_size = node.left.size if node.left is not None else 0
+            if key < left_size:
+                node = node.left
+            elif key < left_size + node.length:
+                return node.source[node.start + key - left_size]
+            else:
+                key -= left_size + node.length
+                node = node.right
+
+    def __add__(self, other):
+        return Rope._from_root(_merge(self.root, Rope._as_root(other)))
+
+    def __radd__(self, other):
+        return Rope._from_root(_merge(Rope._as_root(other), self.root))
+
+    def __eq__(self, other):
+        if isinstance(other, (Rope, str)): return str(self) == str(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __str__(self):
+        return "".join(str(source[start : end]) for source, start, end in self.pieces())
+
+    def __repr__(self):
+        return f"Rope(length: {len(self)!r}, pieces: {self.root.count if self.root else 0!r})"
@@ -0,0 +1,97 @@
+import numpy as np
+from multiprocessing import shared_memory
+from BufferBases import BufferBases
+from PackedBases import PackedBases
+
+
+class SharedReference():
+    """
+    Wild Type 'chromosome_table' stored in a single block of shared memory, so that all the worker
+    processes of a parallel reconstruction read the same copy of the WT sequences. String sequences
+    are stored as ASCII bytes (see BufferBases), PackedBases sequences keep their 2-bit encoding.
+    Pickling a SharedReference sends only the name of the block and the layout of the sequences:
+    the unpickled object is attached to the same memory.
+
+    Attributes
+    ----------
+    layout : list
+        list of tuple (ID, offset, length, packed): position of each sequence in the block.
+    shm : SharedMemory
+        Block of shared memory containing the sequences.
+
+    Methods
+    -------
+    chromosome_table(self) -> list
+        Returns the 'chromosome_table' whose sequences are views on the shared memory.
+    close(self)
+        Detaches the current process from the shared memory.
+    unlink(self)
+        Frees the shared memory. It must be called once, by the process which created it.
+    """
+    def __init__(self, chromosome_table):
+        """
+        It copies the sequences of 'chromosome_table' in a new block of shared memory.
+
+        Parameters
+        ----------
+            chromosome_table (list): list of tuple. Each tuple contains the chromosome ID and its
+                                     sequence (str or PackedBases).
+        """
+        self.layout, data, offset = [], [], 0
+        for ID, seq in chromosome_table:
+            if isinstance(seq, PackedBases):
+                raw = seq.buffer.tobytes()
+            else:
+                raw = str(seq).encode("ascii")
+            self.layout.append((ID, offset, len(seq), isinstance(seq, PackedBases)))
+            data.append(raw)
+            offset += len(raw)
+        self.shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        offset = 0
+        for raw in data:
+            self.shm.buf[offset : offset + len(raw)] = raw
+            offset += len(raw)
+
+    def chromosome_table(self):
+        """
+        Returns the 'chromosome_table' whose sequences are views on the shared memory (no base is
+        copied).
+
+        Returns
+        -------
+            chromosome_table (list): list of tuple. Each tuple contains the chromosome ID and its
+                                     sequence (BufferBases or PackedBases).
+        """
+        table = []
+        for ID, offset, length, packed in self.layout:
+            if packed:
+                buffer = np.frombuffer(self.shm.buf, dtype=np.uint8, count=(length + 3) // 4, \
+                                       offset=offset)
+                table.append((ID, PackedBases(buffer=buffer, length=length)))
+            else:
+                table.append((ID, BufferBases(self.shm.buf, offset, length)))
+        return table
+
+    def close(self):
+        """
+        Detaches the current process from the shared memory.
+        """
+        self.shm.close()
+
+    def unlink(self):
+        """
+        Frees the shared memory. It must be called once, by the process which created it.
+        """
+        self.shm.unlink()
+
+    def __getstate__(self):
+        return {"layout": self.layout, "name": self.shm.name}
+
+    def __setstate__(self, state):
+        self.layout = state["layout"]
+        # the worker processes share the resource tracker of the process which created the block,
+        # which frees it in 'unlink'
+        self.shm = shared_memory.SharedMemory(name=state["name"])
+
+    def __repr__(self):
+        return f"SharedReference(chromosomes: {len(self.layout)!r}, bytes: {self.shm.size!r})"
@@ -1,11 +1,23 @@
-import copy
+import os
+import time
 import numpy as np
-import matplotlib.pyplot as plt
 from BinaryTree import Node
+from ArrayTree import ArrayTree
+from SparseTree import SparseTree
 from Cell import Cell
 from WTCell import WT_Cell
 from MutantCell import MUT_Cell
 from Utility import Utility
+from Rope import Rope
+from GenomeCache import GenomeCache
+from Instrumentation import Instrumentation
+from EventProfiler import EventProfiler
+from EventLog import EventLog
+from Coverage import Coverage
+from PopulationCoverage import PopulationCoverage
+from OnlineStatistics import OnlineStatistics
+from LengthDistribution import LengthDistribution
+from TruncatedUniform import TruncatedUniform
 from PointwiseReplacement import PointReplacement
 from PointwiseDeletion import PointDeletion
 from PointwiseInsertion import PointInsertion
@@ -24,7 +36,10 @@ class Simulator():
     ----------
     chromosome_table : list
         list of tuple. Each tuple contains the chromosome ID and its sequence.
-    parent : Node
+    tree : ArrayTree
+        Array-backed binary tree containing the chromosome lengths and the events of every cell
+        generated by the simulation.
+    parent : NodeView
         It ontains the ancestor (WT) cell, from which it is possible to acces the whole tree of cells
         generated.
     generations : int
@@ -40,53 +55,81 @@ class Simulator():
     chr_length_st_dev : list
         List of the standard deviation of the chromosome lenght for each chromosome. Computed over 
         the last generation of cells.
+    seed : int
+        Seed of the simulation. The random generator of each cell is derived from it (see
+        'node_rng').
+    root_path : list
+        Path of 'parent' in the whole simulated tree ([] except in the worker processes, which
+        simulate a subtree).
+    statistics : OnlineStatistics
+        Statistics of the lengths of the leaves and of the events, collected during the growth.
+    keep_leaves : bool
+        If False, the leaves are released as soon as they are added to the statistics, and
+        'leaves' is empty after the growth.
+    sampled_paths : list
+        Paths of the sampled leaves, whose lineages are the only simulated cells (None if the
+        complete tree is simulated).
+    genome_cache : GenomeCache
+        Cache of the ancestor genomes used by 'batch_path_reconstructor' (None until its first
+        call).
+    instrumentation : Instrumentation
+        Wall time, CPU time and memory of the phases of the simulation: 'growth',
+        'reconstruction', 'visualization' and 'stats'.
+    profiler : EventProfiler
+        Calls, time and bytes copied of each kind of event (None if the events are not profiled).
 
     General Methods
     ---------------
     leaves_collector(self, cell: Cell)
         It appends to a list all the leaves of the simulation.
+    node_rng(self, index: int, stream: int)
+        Returns the random generator of a node, derived from the seed and from the path of the node.
 
     Methods Generating Random Rearrangement
     ---------------------------------------
-    rand_insertion(self, cell: Cell, length_extraction_method)
+    rand_insertion(self, cell: Cell, length_extraction_method, rng)
         It generates a random Insertion, according to a given distirbution. Then calls the function 
         that adds it to the events of the considered cell.
-    rand_deletion(self, cell :Cell, length_extraction_method)
+    rand_deletion(self, cell :Cell, length_extraction_method, rng)
         It generates a random Deletion, according to a given distirbution. Then calls the function 
         that adds it to the events of the considered cell.
-    rand_translocation(self, cell :Cell, length_extraction_method)
+    rand_translocation(self, cell :Cell, length_extraction_method, rng)
         It generates a random Translocation, according to a given distirbution. Then calls the function 
         that adds it to the events of the considered cell.
-    rand_reciprocal_translocation(self, cell :Cell, length_extraction_method)
+    rand_reciprocal_translocation(self, cell :Cell, length_extraction_method, rng)
         It generates a random Reciprocal Translocation, according to a given distirbution. Then calls
         the function that adds it to the events of the considered cell.
-    rand_duplication(self, cell :Cell, length_extraction_method)
+    rand_duplication(self, cell :Cell, length_extraction_method, rng)
         It generates a random Duplication, according to a given distirbution. Then calls the function
         that adds it to the events of the considered cell.
 
     Methods Generating Random Mutation
     ----------------------------------
-    rand_point_insertion(self, cell: Cell)
+    rand_point_insertion(self, cell: Cell, rng)
         It generates a random Pointwise Insertion, drawing its position from a Uniform distribution.
         Then calls the function that adds it to the events of the considered cell.
-    rand_point_deletion(self, cell :Cell)
+    rand_point_deletion(self, cell :Cell, rng)
         It generates a random Pointwise Deletion, drawing its position from a Uniform distribution.
         Then calls the function that adds it to the events of the considered cell.
-    rand_point_replacement(self, cell :Cell)
+    rand_point_replacement(self, cell :Cell, rng)
         It generates a random Pointwise Replacement, drawing its position from a Uniform distribution.
         Then calls the function that adds it to the events of the considered cell.
 
     Methods for Cell Duplication & Growth
     -------------------------------------
     random_choice(self, cell: Cell, cumulative_list :list, del_len_distrib, ins_len_distrib,
-                  transl_len_distrib, rec_transl_len_distrib, dupl_len_distrib)
+                  transl_len_distrib, rec_transl_len_distrib, dupl_len_distrib, rng)
         Given that an event happens, this funciton chooses which event happen according to the
         cumulative probability given in 'cumulative_list'.
+    sample_events(self, cell: Cell, n_events: int, cumulative_list: list, length_distribs: tuple,
+                  rng)
+        Batched version of 'random_choice': it draws the kinds, chromosomes and positions of all
+        the events of a cell with a few vectorised calls, and returns them as EventLog rows.
     node_duplication(self, node: Node, cumulative_list :list, ave_events_num, del_len_distrib,
                      ins_len_distrib, transl_len_distrib, rec_transl_len_distrib, dupl_len_distrib,
                      n_event_method)
         Given the current 'node' and the distribution of the number of events in one duplication
-        (n_ave_method), it creates two doughter nodes, and calls 'random_choice' to add the
+        (n_ave_method), it creates two doughter nodes, and calls 'sample_events' to add the
         extracted number of events to them.
     growth(self, node :Node, n_generations :int, ave_events_num, cumulative_list, n_event_method,
            del_len_distrib, ins_len_distrib, transl_len_distrib, rec_transl_len_distrib,
@@ -96,6 +139,19 @@ class Simulator():
         Tree accessible from the parent node (WT Cell).
         It saves in an array all the leaves of the last generaitons and computes averages and 
         standard deviations on the chromosomes and genome lengths.
+    parallel_growth(self, n_generations: int, split_generation: int, n_workers: int,
+                    growth_parameters: tuple)
+        Simulates serially the first 'split_generation' generations, then the independent subtrees
+        below them in a pool of processes, and merges the results in the tree.
+    single_doughter_duplication(self, node: Node, index: int, cumulative_list, ave_events_num,
+                                length_distribs: tuple, n_event_method)
+        It creates one doughter of 'node' with its events and stores it in the tree.
+    grown_leaf_collector(self, node: Node)
+        Adds a leaf to the statistics and (if 'keep_leaves') to 'leaves'.
+    sample_paths(self, n_leaves: int, n_generations: int)
+        Draws the paths of 'n_leaves' distinct leaves.
+    sampled_growth(self, node: Node, n_generations: int, paths: list, growth_parameters: tuple)
+        Simulates only the ancestral lineages of the leaves at the end of 'paths'.
 
     Methods for Cell Sequences Reconstruction
     -----------------------------------------
@@ -105,7 +161,7 @@ class Simulator():
     single_doughter_reconstructor(self, parent: Node, doughter: Node)
         It copies the DNA sequences from the parent to the doughter cell. Then it modifies them 
         according to the new events present in the doughter cell.
-    run_reconstruction(self, parent: Node, n_generations: int)
+    run_reconstruction(self, parent: Node, n_generations: int, lazy = False)
         It runs the process that starts from the root of the binary tree and reconstruct the mutated
         sequences following the list of the events, up to the 'n_generations' generation.
     reconstructor(parent: Node)
@@ -113,9 +169,22 @@ class Simulator():
         generations is accessible) calls itself reconstructing every time both the doughters of the
         parent, up to 'n_generations' generations. In the end only the leaves of the 'n_generation' 
         generation will contain the modified sequences.
+    iter_reconstructed_leaves(self, n_generations: int)
+        Generator that reconstructs the leaves one at a time, in depth-first order, keeping in
+        memory only the sequences of the cells along the current path.
+    parallel_reconstruction(self, n_generations: int, split_generation = None, n_workers = None,
+                            output_dir = None)
+        Reconstructs the leaves in a pool of processes, which read the WT sequences from shared
+        memory, and yields them as soon as they are ready.
     path_reconstructor(self, path, n_generations: int)
         Given a path and the total number of simulated generations 'n_generations', this function 
         reconstructs the sequence of the leaf corresponding to the path.
+    batch_path_reconstructor(self, paths: list, cache_bytes = 2 ** 28)
+        Reconstructs the cells at the end of many paths, visiting them as a trie and keeping the
+        ancestor genomes in a memory-bounded LRU cache.
+    segment_map(self, node: Node)
+        Returns, for each chromosome of the cell in 'node', the ordered list of segments
+        (source, start, end) its reconstructed sequence is made of.
     
     Methods for cumulated mutation visualization
     --------------------------------------------
@@ -123,14 +192,16 @@ class Simulator():
         It runs the process that starts from the root of the bunary tree and reconstruct the array for
         the visualization of the comulated mutations.
     single_doughter_visualizetor(parent: Node, doughter: Node):
-        It copies the DNA visual arrays from the parent to the doughter cell. Then it modifies them 
-        according to the new events present in the doughter cell.
+        It shares the visual coverages (Coverage) of the parent with the doughter cell. Then it
+        replaces them according to the new events present in the doughter cell.
     visualizator(parent: Node):
         Recurrent functions that starting with 'parent' node (from which the all tree of new 
         generations is accessible) calls itself reconstructing every time the 'visual' array of 
         both the doughters of the parent, up to 'n_generations' generations. In the end only the 
         leaves of the 'n_generation' generation will contain the modified 'visual' array and the 
         attribute Simulation.leaves is updated with the visualization array.
+    path_visualization(self, path: list)
+        Builds the 'visual' coverages of the cell at the end of a path only.
     visualize(self, cell: Cell):
         Displays the chromosome of a selected leaf (among Simulation.leaves), highlighting locations where multiple 
         Rearrangements/Mutations have occurred.
@@ -141,15 +212,46 @@ class Simulator():
         It updates the length of the whole genome in order to comute the average.
     update_average_chromosome_length(self, node: Node)
         It updates the length of each chromosome in order to comute the average.
-    chromosome_std_dev(self, n_chr: int, n_gen: int)
-        It computes the Standard Deviation of the final length of each Chromosome.
     stat_max_cumulated_mutations(self)
         Computes average and standard deviation of the maximum number (between different chromosme of
         a cell) of cumulated mutations over each leaf of the simulated binary tree.
     stat_cumulated_mutations(self):
         Computes average and standard deviation of the number of cumulated mutations over each 
         chromosome of each leaf of the simulated binary tree.
+    population_coverage(self, n_generations: int) -> PopulationCoverage
+        Computes the statistics of the cumulated mutations of the whole population of leaves
+        without building their 'visual' arrays.
+    performance_report(self) -> dict
+        Returns the time and the memory used by each phase of the simulation.
+    enable_profiling(self), disable_profiling(self)
+        Start and stop profiling the events.
+    profile_table(self, by_generation = False) -> list
+        Returns the calls, time and bytes copied of each kind of event.
     """
+    GROWTH, RECONSTRUCTION, SAMPLING = 0, 1, 2
+
+    def node_rng(self, index: int, stream: int):
+        """
+        Returns the random generator of the node 'index' for the given stream. The generator is
+        derived from the seed of the simulation and from the path of the node, as the child of
+        the SeedSequence tree 'SeedSequence(seed).spawn(...)' with spawn key (stream, *path): it
+        does not depend on the order in which the nodes are visited, nor on the process.
+
+        Parameters
+        ----------
+            index (int): ID of the node in 'self.tree'.
+            stream (int): Simulator.GROWTH for the events drawn during the growth,
+                          Simulator.RECONSTRUCTION for the bases drawn during the reconstruction,
+                          Simulator.SAMPLING for the choice of the sampled leaves.
+
+        Returns
+        -------
+            rng (np.random.Generator): generator of the node.
+        """
+        path = self.root_path + ArrayTree.path(index)
+        return np.random.default_rng(np.random.SeedSequence(self.seed, \
+                                                            spawn_key=(stream, *path)))
+
     def leaves_collector(self, cell: Cell):
         """
         It appends to a list all the leaves of the simulation.
@@ -162,7 +264,7 @@ class Simulator():
 
 ## RANDOM REARRANGEMENT METHODS ########################################################################
 
-    def rand_insertion(self, cell: Cell, length_extraction_method):
+    def rand_insertion(self, cell: Cell, length_extraction_method, rng):
         """
         It generates a random Insertion, according to a given distirbution. Then calls the function 
         that adds it to the events of the considered cell.
@@ -172,14 +274,15 @@ class Simulator():
             cell (Cell): considered cell.
             length_extraction_method (Method): probability distribution for the extraction of the 
                                                rearrangement length.
+            rng (np.random.Generator): random generator of the cell.
         """
-        chr_id = np.random.choice(cell.DNA.IDs)
-        ins_pos = np.random.randint(0, cell.DNA.CHRs[chr_id - 1].length) 
+        chr_id = rng.choice(cell.DNA.IDs)
+        ins_pos = rng.integers(0, cell.DNA.CHRs[chr_id - 1].length) 
         max_ins_length = int((cell.DNA.CHRs[chr_id - 1].length - ins_pos))  
-        ins_length = length_extraction_method(1, max_ins_length) if max_ins_length >= 2 else 1  
+        ins_length = length_extraction_method(1, max_ins_length, rng) if max_ins_length >= 2 else 1  
         Insertion(chr_id, ins_pos, ins_length, cell)
 
-    def rand_deletion(self, cell :Cell, length_extraction_method):
+    def rand_deletion(self, cell :Cell, length_extraction_method, rng):
         """
         It generates a random Deletion, according to a given distirbution. Then calls the function 
         that adds it to the events of the considered cell.
@@ -189,22 +292,23 @@ class Simulator():
             cell (Cell): considered cell.
             length_extraction_method (Method): probability distribution for the extraction of the 
                                                rearrangement length.
+            rng (np.random.Generator): random generator of the cell.
         """
-        chr_id = np.random.choice(cell.DNA.IDs)
+        chr_id = rng.choice(cell.DNA.IDs)
 
         if cell.DNA.CHRs[chr_id - 1].length <= 0: 
             print(f"Chromosome (ID:{chr_id}) length is {cell.DNA.CHRs[chr_id - 1].length}.")
             chr_list = list(range(1,len(cell.DNA.CHRs) + 1))
             chr_list.remove(chr_id)
-            chr_id = np.random.choice(chr_list)
+            chr_id = rng.choice(chr_list)
             print("ID new",chr_id)
 
-        del_pos = np.random.randint(0, cell.DNA.CHRs[chr_id - 1].length) 
+        del_pos = rng.integers(0, cell.DNA.CHRs[chr_id - 1].length) 
         max_del_length = int((cell.DNA.CHRs[chr_id - 1].length - del_pos)) 
-        del_length = length_extraction_method(1, max_del_length) if max_del_length >= 2 else 1
+        del_length = length_extraction_method(1, max_del_length, rng) if max_del_length >= 2 else 1
         Deletion(chr_id, del_pos, del_length, cell)
 
-    def rand_translocation(self, cell :Cell, length_extraction_method):
+    def rand_translocation(self, cell :Cell, length_extraction_method, rng):
         """
         It generates a random Translocation, according to a given distirbution. Then calls the function 
         that adds it to the events of the considered cell.
@@ -214,19 +318,20 @@ class Simulator():
             cell (Cell): considered cell.
             length_extraction_method (Method): probability distribution for the extraction of the 
                                                rearrangement length.
+            rng (np.random.Generator): random generator of the cell.
         """ 
-        chr_id = np.random.choice(cell.DNA.IDs)
+        chr_id = rng.choice(cell.DNA.IDs)
         if cell.DNA.CHRs[chr_id - 1].length == 1: 
             print(f"(generation: {cell.generation}) Chromosome {chr_id} has only 1 base. Translocation has no meaning here.\n")
             return
-        init_pos = np.random.randint(0, cell.DNA.CHRs[chr_id - 1].length) 
+        init_pos = rng.integers(0, cell.DNA.CHRs[chr_id - 1].length) 
         max_transl_length = int((cell.DNA.CHRs[chr_id - 1].length - init_pos)) 
-        transl_length = length_extraction_method(1, max_transl_length) if max_transl_length >= 2 else 1
+        transl_length = length_extraction_method(1, max_transl_length, rng) if max_transl_length >= 2 else 1
         #print(f"ID: {chr_id}, init: {init_pos}, len: {transl_length}, chr_len: {cell.DNA.CHRs[chr_id - 1].length}")
-        final_pos = np.random.randint(0, cell.DNA.CHRs[chr_id - 1].length - transl_length )
+        final_pos = rng.integers(0, cell.DNA.CHRs[chr_id - 1].length - transl_length )
         Translocation(chr_id, init_pos, transl_length, final_pos, cell)
 
-    def rand_reciprocal_translocation(self, cell :Cell, length_extraction_method):
+    def rand_reciprocal_translocation(self, cell :Cell, length_extraction_method, rng):
         """
         It generates a random Reciprocal Translocation, according to a given distirbution. Then calls
         the function that adds it to the events of the considered cell.
@@ -236,19 +341,20 @@ class Simulator():
             cell (Cell): considered cell.
             length_extraction_method (Method): probability distribution for the extraction of the 
                                                rearrangement length.
+            rng (np.random.Generator): random generator of the cell.
         """
-        chr_id1 = np.random.choice(cell.DNA.IDs)
-        possible_chrs = list(copy.deepcopy(cell.DNA.IDs))
+        chr_id1 = rng.choice(cell.DNA.IDs)
+        possible_chrs = list(cell.DNA.IDs)
         possible_chrs.remove(chr_id1)
-        chr_id2 = np.random.choice(possible_chrs)
+        chr_id2 = rng.choice(possible_chrs)
         chr_ids = (chr_id1, chr_id2) 
-        init_pos = np.random.randint(0, cell.DNA.CHRs[chr_ids[0] - 1].length) 
+        init_pos = rng.integers(0, cell.DNA.CHRs[chr_ids[0] - 1].length) 
         max_transl_length = int((cell.DNA.CHRs[chr_ids[0] - 1].length - init_pos))  
-        transl_length = length_extraction_method(1, max_transl_length) if max_transl_length >= 2 else 1
-        final_pos = np.random.randint(0, cell.DNA.CHRs[chr_ids[1] - 1].length)
+        transl_length = length_extraction_method(1, max_transl_length, rng) if max_transl_length >= 2 else 1
+        final_pos = rng.integers(0, cell.DNA.CHRs[chr_ids[1] - 1].length)
         ReciprocalTranslocation(chr_ids, init_pos, transl_length, final_pos, cell)
 
-    def rand_duplication(self, cell :Cell, length_extraction_method):
+    def rand_duplication(self, cell :Cell, length_extraction_method, rng):
         """
         It generates a random Duplication, according to a given distirbution. Then calls the function 
         that adds it to the events of the considered cell.
@@ -258,17 +364,18 @@ class Simulator():
             cell (Cell): considered cell.
             length_extraction_method (Method): probability distribution for the extraction of the 
                                                rearrangement length.
+            rng (np.random.Generator): random generator of the cell.
         """
-        chr_id = np.random.choice(cell.DNA.IDs)
-        init_pos = np.random.randint(0, cell.DNA.CHRs[chr_id - 1].length) 
+        chr_id = rng.choice(cell.DNA.IDs)
+        init_pos = rng.integers(0, cell.DNA.CHRs[chr_id - 1].length) 
         max_dupl_length = int((cell.DNA.CHRs[chr_id - 1].length - init_pos))  
-        dupl_length = length_extraction_method(1, max_dupl_length) if max_dupl_length >= 2 else 1
-        final_pos = np.random.randint(0, cell.DNA.CHRs[chr_id - 1].length)
+        dupl_length = length_extraction_method(1, max_dupl_length, rng) if max_dupl_length >= 2 else 1
+        final_pos = rng.integers(0, cell.DNA.CHRs[chr_id - 1].length)
         Duplication(chr_id, init_pos, dupl_length, final_pos, cell)
         
 ## RANDOM MUTATION METHODS ########################################################################
 
-    def rand_point_insertion(self, cell: Cell):
+    def rand_point_insertion(self, cell: Cell, rng):
         """
         It generates a random Pointwise Insertion, drawing its position from a Uniform distribution.
         Then calls the function that adds it to the events of the considered cell.
@@ -276,12 +383,13 @@ class Simulator():
         Parameters
         ----------
             cell (Cell): considered cell.
+            rng (np.random.Generator): random generator of the cell.
         """
-        chr_id = np.random.choice(cell.DNA.IDs)
-        ins_pos = np.random.randint(0, cell.DNA.CHRs[chr_id - 1].length)  
+        chr_id = rng.choice(cell.DNA.IDs)
+        ins_pos = rng.integers(0, cell.DNA.CHRs[chr_id - 1].length)  
         PointInsertion(chr_id, ins_pos, cell)
 
-    def rand_point_deletion(self, cell :Cell):
+    def rand_point_deletion(self, cell :Cell, rng):
         """
         It generates a random Pointwise Deletion, drawing its position from a Uniform distribution.
         Then calls the function that adds it to the events of the considered cell.
@@ -289,12 +397,13 @@ class Simulator():
         Parameters
         ----------
             cell (Cell): considered cell.
+            rng (np.random.Generator): random generator of the cell.
         """
-        chr_id = np.random.choice(cell.DNA.IDs)
-        del_pos = np.random.randint(0, cell.DNA.CHRs[chr_id - 1].length) 
+        chr_id = rng.choice(cell.DNA.IDs)
+        del_pos = rng.integers(0, cell.DNA.CHRs[chr_id - 1].length) 
         PointDeletion(chr_id, del_pos, cell)
 
-    def rand_point_replacement(self, cell :Cell):
+    def rand_point_replacement(self, cell :Cell, rng):
         """
         It generates a random Pointwise Replacement, drawing its position from a Uniform distribution.
         Then calls the function that adds it to the events of the considered cell.
@@ -302,15 +411,16 @@ class Simulator():
         Parameters
         ----------
             cell (Cell): considered cell.
+            rng (np.random.Generator): random generator of the cell.
         """
-        chr_id = np.random.choice(cell.DNA.IDs)
-        repl_pos = np.random.randint(0, cell.DNA.CHRs[chr_id - 1].length) 
+        chr_id = rng.choice(cell.DNA.IDs)
+        repl_pos = rng.integers(0, cell.DNA.CHRs[chr_id - 1].length) 
         PointReplacement(chr_id, repl_pos, cell)
 
 ## CELL DUPLICATION AND GROWTH ########################################################################
 
     def random_choice(self, cell: Cell, cumulative_list, del_len_distrib, ins_len_distrib, \
-        transl_len_distrib, rec_transl_len_distrib, dupl_len_distrib):
+        transl_len_distrib, rec_transl_len_distrib, dupl_len_distrib, rng):
         """
         Given that an event happens, this funciton chooses which event happen accordinf to the
         cumulative probability given in 'cumulative_list'.
@@ -326,31 +436,131 @@ class Simulator():
             rec_transl_len_distrib (Method): probability distribution of the Reciprocal 
                                              Translocation length.
             dupl_len_distrib (Method): probability distribution of the Duplication length.
+            rng (np.random.Generator): random generator of the cell.
             """
-        r = np.random.rand()
+        r = rng.random()
         if r < cumulative_list[0]:
-            self.rand_deletion(cell, del_len_distrib)
+            self.rand_deletion(cell, del_len_distrib, rng)
         elif cumulative_list[0] <= r < cumulative_list[1]:
-            self.rand_insertion(cell, ins_len_distrib)
+            self.rand_insertion(cell, ins_len_distrib, rng)
         elif cumulative_list[1] <= r < cumulative_list[2]:
-            self.rand_translocation(cell, transl_len_distrib)
+            self.rand_translocation(cell, transl_len_distrib, rng)
         elif cumulative_list[2] <= r < cumulative_list[3]:
-            self.rand_reciprocal_translocation(cell, rec_transl_len_distrib)
+            self.rand_reciprocal_translocation(cell, rec_transl_len_distrib, rng)
         elif cumulative_list[3] <= r < cumulative_list[4]:
-            self.rand_duplication(cell, dupl_len_distrib)
+            self.rand_duplication(cell, dupl_len_distrib, rng)
         elif cumulative_list[4] <= r < cumulative_list[5]:
-            self.rand_point_insertion(cell)
+            self.rand_point_insertion(cell, rng)
         elif cumulative_list[5] <= r < cumulative_list[6]:
-            self.rand_point_deletion(cell)
+            self.rand_point_deletion(cell, rng)
         elif cumulative_list[6] <= r <= cumulative_list[7]:
-            self.rand_point_replacement(cell)
+            self.rand_point_replacement(cell, rng)
+
+    def sample_events(self, cell: Cell, n_events: int, cumulative_list, length_distribs: tuple, \
+                      rng):
+        """
+        Batched version of 'random_choice': it samples 'n_events' random events of 'cell' and
+        returns them as rows of the EventLog, without building the event objects. The kinds of all
+        the events and the uniform numbers from which their chromosomes, positions and lengths are
+        computed are drawn with two vectorised calls of 'rng'; the rows are then computed one after
+        the other on a plain list of chromosome lengths, since each event depends on the lengths
+        left by the previous ones, and the chromosomes of the cell are updated once at the end. The
+        lengths are obtained from the inverse cumulative distribution functions of the
+        LengthDistribution objects (other length distributions are called once per event). The
+        distributions are the same of the 'rand_*' methods.
+
+        Parameters
+        ----------
+            cell (Cell): considered cell. Its chromosome lengths (and IDs) are updated.
+            n_events (int): number of events.
+            cumulative_list (list): list containing the cumulative probability of the possible 
+                                    events.
+            length_distribs (tuple): probability distributions of the length of Deletions,
+                                     Insertions, Translocations, Reciprocal Translocations and
+                                     Duplications.
+            rng (np.random.Generator): random generator of the cell.
+
+        Returns
+        -------
+            rows (np.ndarray): events of the cell, with dtype 'EventLog.DTYPE' ('node_id' is 0).
+        """
+        if n_events == 0: return np.zeros(0, dtype=EventLog.DTYPE)
+        # kind of event: index of the interval of 'cumulative_list' (same order of EventLog.TYPES).
+        # The running maximum makes the list sorted when it ends with zeros for the unused events.
+        cumulative = np.maximum.accumulate(cumulative_list)
+        type_codes = np.searchsorted(cumulative, rng.random(n_events), side="right").tolist()
+        uniforms = rng.random((n_events, 5)).tolist()
+        DNA = cell.DNA
+        IDs = DNA.IDs
+        lengths = [chr.length for chr in DNA.CHRs]
+        rows = []
+        profiler = self.profiler
+        for type_code, (u_chr, u_pos, u_final, u_chr2, u_len) in zip(type_codes, uniforms):
+            if profiler is not None: start = time.perf_counter_ns()
+            chr_id = IDs[int(u_chr * len(IDs))]
+            chr_length = lengths[chr_id - 1]
+            pos = int(u_pos * chr_length)
+            if type_code <= 4:
+                max_length, distrib = chr_length - pos, length_distribs[type_code]
+                if max_length < 2:
+                    length = 1
+                elif isinstance(distrib, LengthDistribution):
+                    length = distrib.scalar_ppf(u_len, 1, max_length)
+                else:
+                    length = distrib(1, max_length, rng)
+            if type_code == 0:
+                rows.append((0, 0, chr_id, 0, pos, length, 0))
+                lengths[chr_id - 1] -= length
+                if lengths[chr_id - 1] == 0:
+                    DNA.remove_ID(chr_id)
+                    IDs = DNA.IDs
+                    print(f"(generation: {cell.generation}) Chromosome {chr_id} has been removed! \n The event was a {Deletion(chr_id, pos, length)}.\n")
+            elif type_code == 1 or type_code == 4:
+                # the final position of Duplications is drawn on the chromosome before the copy
+                final_pos = int(u_final * chr_length) if type_code == 4 else 0
+                rows.append((0, type_code, chr_id, 0, pos, length, final_pos))
+                lengths[chr_id - 1] += length
+            elif type_code == 2:
+                if chr_length == 1: 
+                    print(f"(generation: {cell.generation}) Chromosome {chr_id} has only 1 base. Translocation has no meaning here.\n")
+                    continue
+                rows.append((0, 2, chr_id, 0, pos, length, int(u_final * (chr_length - length))))
+            elif type_code == 3:
+                possible_chrs = [ID for ID in IDs if ID != chr_id]
+                chr_id2 = possible_chrs[int(u_chr2 * len(possible_chrs))]
+                final_pos = int(u_final * lengths[chr_id2 - 1])
+                rows.append((0, 3, chr_id, chr_id2, pos, length, final_pos))
+                lengths[chr_id - 1] -= length
+                lengths[chr_id2 - 1] += length
+                if lengths[chr_id - 1] == 0:
+                    DNA.remove_ID(chr_id)
+                    IDs = DNA.IDs
+                    event = ReciprocalTranslocation((chr_id, chr_id2), pos, length, final_pos)
+                    print(f"(generation: {cell.generation}) Chromosome {chr_id} has been removed! The events was a {event}.")
+            else:
+                rows.append((0, type_code, chr_id, 0, pos, 1, 0))
+                if type_code == 5:
+                    lengths[chr_id - 1] += 1
+                elif type_code == 6:
+                    lengths[chr_id - 1] -= 1
+                    if lengths[chr_id - 1] == 0:
+                        DNA.remove_ID(chr_id)
+                        IDs = DNA.IDs
+                        print(f"(generation: {cell.generation}) Chromosome {chr_id} has been removed! \n The event was a {PointDeletion(chr_id, pos)}.\n")
+            if profiler is not None:
+                profiler.add("growth", type_code, cell.generation, time.perf_counter_ns() - start, \
+                             EventProfiler.ROW_BYTES)
+        for ID, length in enumerate(lengths, 1):
+            if length != DNA.CHRs[ID - 1].length:
+                DNA.editable_chromosome(ID).length = length
+        return np.array(rows, dtype=EventLog.DTYPE)
 
     def node_duplication(self, node: Node, cumulative_list, ave_events_num, del_len_distrib, \
         ins_len_distrib, transl_len_distrib, rec_transl_len_distrib, dupl_len_distrib, \
             n_event_method):
         """
         Given the current 'node' and the distribution of the number of events in one duplication
-        (n_ave_method), it creates two doughter nodes, and calls 'random_choice' to add the 
+        (n_ave_method), it creates two doughter nodes, and calls 'sample_events' to add the 
         extracted number of events to them.
 
         Parameters
@@ -373,20 +583,47 @@ class Simulator():
             node.left_child (Cell): left doughter cell of the parent one, with the its list of events.
             node.right_child (Cell): right doughter cell of the parent one, with the its list of events.
         """
-        new_generation = node.generation + 1
-        new_left = MUT_Cell(copy.deepcopy(node.data.DNA), [], new_generation)
-        new_right = MUT_Cell(copy.deepcopy(node.data.DNA), [], new_generation)
-
-        n_event_left, n_event_right = n_event_method(ave_events_num), n_event_method(ave_events_num)
-        for i in range(n_event_left): self.random_choice(new_left, cumulative_list, \
-            del_len_distrib, ins_len_distrib, transl_len_distrib, rec_transl_len_distrib, \
-                dupl_len_distrib)
-        for j in range(n_event_right): self.random_choice(new_right, cumulative_list, \
-            del_len_distrib, ins_len_distrib, transl_len_distrib, rec_transl_len_distrib, \
-                dupl_len_distrib)
-        node.left_child = Node(new_left, new_generation)
-        node.right_child = Node(new_right, new_generation)
-        return node.left_child, node.right_child
+        length_distribs = (del_len_distrib, ins_len_distrib, transl_len_distrib, \
+                           rec_transl_len_distrib, dupl_len_distrib)
+        new_left = self.single_doughter_duplication(node, ArrayTree.left(node.index), \
+            cumulative_list, ave_events_num, length_distribs, n_event_method)
+        new_right = self.single_doughter_duplication(node, ArrayTree.right(node.index), \
+            cumulative_list, ave_events_num, length_distribs, n_event_method)
+        return new_left, new_right
+
+    def single_doughter_duplication(self, node: Node, index: int, cumulative_list, \
+                                    ave_events_num, length_distribs: tuple, n_event_method):
+        """
+        It creates the doughter 'index' of 'node', adds to it the extracted number of events and
+        stores it in the tree.
+
+        Parameters
+        ----------
+            node (Node): parent node.
+            index (int): ID of the doughter node (left or right child of 'node').
+            cumulative_list (list): list containing the cumulative probability of the possible 
+                                    events.
+            ave_events_num (int): average number of events of each cell duplication.
+            length_distribs (tuple): probability distributions of the lengths of Deletions,
+                                     Insertions, Translocations, Reciprocal Translocations and
+                                     Duplications.
+            n_event_method (Method): probability distribution of the number of events in one cell
+                                     duplication.
+
+        Returns
+        -------
+            doughter (Node): doughter node.
+        """
+        cell = MUT_Cell(node.data.DNA.copy(), [], node.generation + 1)
+        # each doughter draws its events from its own generator
+        rng = self.node_rng(index, Simulator.GROWTH)
+        rows = self.sample_events(cell, n_event_method(ave_events_num, rng), cumulative_list, \
+                                  length_distribs, rng)
+        self.tree.store(index, cell, rows)
+        row = self.tree.row(index)
+        self.statistics.add_events(self.tree.log.rows[self.tree.event_start[row] : \
+                                                      self.tree.event_stop[row]])
+        return self.tree.node(index)
 
     def growth(self, node :Node, n_generations :int, ave_events_num: int, cumulative_list: list,\
                 n_event_method, del_len_distrib, ins_len_distrib, transl_len_distrib, \
@@ -415,9 +652,7 @@ class Simulator():
             dupl_len_distrib (Method): probability distribution of the Duplication length.
         """
         if node.generation >= n_generations: 
-            self.update_average_genome_length(node)
-            self.update_average_chromosome_length(node)
-            self.leaves_collector(node.data)
+            self.grown_leaf_collector(node)
             return
         else: 
             doughter1, doughter2 = self.node_duplication(node, cumulative_list, ave_events_num, \
@@ -429,20 +664,149 @@ class Simulator():
             self.growth(doughter2, n_generations, ave_events_num, cumulative_list, n_event_method, \
                 del_len_distrib, ins_len_distrib, transl_len_distrib, rec_transl_len_distrib, \
                     dupl_len_distrib)
+            # the cell is kept only in the arrays of the tree
+            self.tree.release(node.index)
+
+    def grown_leaf_collector(self, node: Node):
+        """
+        Adds the leaf in 'node' to the statistics and, if 'self.keep_leaves', to 'self.leaves'
+        (otherwise the cell is released).
+
+        Parameters
+        ----------
+            node (Node): leaf node.
+        """
+        self.statistics.add_leaf(self.tree.lengths[self.tree.row(node.index)])
+        if self.keep_leaves:
+            self.leaves_collector(node.data)
+        else:
+            self.tree.release(node.index)
+
+    def sample_paths(self, n_leaves: int, n_generations: int):
+        """
+        Draws the paths of 'n_leaves' distinct leaves of generation 'n_generations', from the
+        generator of the stream Simulator.SAMPLING of the root.
+
+        Parameters
+        ----------
+            n_leaves (int): number of leaves.
+            n_generations (int): generation of the leaves.
+
+        Returns
+        -------
+            paths (list): sorted list of paths (list of 0 or 1).
+
+        Raises
+        ------
+            Exception
+                If 'n_leaves' is larger than the number of leaves 2^n_generations.
+        """
+        if n_leaves > 2 ** n_generations:
+            raise Exception(f"number of sampled leaves ({n_leaves}) larger than the number of leaves ({2 ** n_generations})")
+        rng = self.node_rng(0, Simulator.SAMPLING)
+        offsets = set()
+        while len(offsets) < n_leaves:
+            offsets.update(rng.integers(0, 2 ** n_generations, n_leaves - len(offsets)).tolist())
+        first_leaf = 2 ** n_generations - 1
+        return [ArrayTree.path(first_leaf + offset) for offset in sorted(offsets)]
+
+    def sampled_growth(self, node: Node, n_generations: int, paths: list, growth_parameters: tuple):
+        """
+        Sampled version of 'growth': only the cells along the given paths (the ancestral lineages of
+        the sampled leaves) are simulated, each one once even if it is shared by several lineages.
+        Every cell draws its events from its own generator (see 'node_rng'), so the simulated
+        cells are the same of the complete tree, at a cost proportional to the number of paths
+        times the number of generations.
+
+        Parameters
+        ----------
+            node (Node): node from which the paths start.
+            n_generations (int): number of generations to be simulated.
+            paths (list): paths (list of 0 or 1) from 'node' to the sampled leaves.
+            growth_parameters (tuple): arguments of 'growth' following 'n_generations'
+                                       (ave_events_num, cumulative_list, n_event_method,
+                                       del_len_distrib, ins_len_distrib, transl_len_distrib,
+                                       rec_transl_len_distrib, dupl_len_distrib).
+        """
+        if node.generation >= n_generations:
+            self.grown_leaf_collector(node)
+            return
+        ave_events_num, cumulative_list, n_event_method = growth_parameters[: 3]
+        length_distribs = growth_parameters[3 :]
+        for direction in (0, 1):
+            sub_paths = [path[1:] for path in paths if path[0] == direction]
+            if sub_paths:
+                doughter = self.single_doughter_duplication(node, ArrayTree.left(node.index) + \
+                    direction, cumulative_list, ave_events_num, length_distribs, n_event_method)
+                self.sampled_growth(doughter, n_generations, sub_paths, growth_parameters)
+        # the cell is kept only in the arrays of the tree
+        self.tree.release(node.index)
+
+    def parallel_growth(self, n_generations: int, split_generation: int, n_workers: int, \
+                        growth_parameters: tuple):
+        """
+        Parallel version of 'growth'. The first 'split_generation' generations are simulated
+        serially, then the 2^split_generation subtrees rooted in the cells of that generation,
+        which are independent once the chromosome lengths of their root are known, are simulated by
+        a pool of 'n_workers' processes. Each subtree is grafted in 'self.tree' and the statistics
+        of its worker are merged as soon as it is returned; finally the leaves are collected from
+        the merged tree.
+        Every cell draws its events from its own generator (see 'node_rng'): the result is the same
+        of 'growth', whatever 'split_generation' and 'n_workers' are.
+
+        Parameters
+        ----------
+            n_generations (int): number of generations to be simulated.
+            split_generation (int): generation of the roots of the subtrees simulated in parallel.
+            n_workers (int): number of processes. With 1 process the subtrees are simulated in the
+                             current one.
+            growth_parameters (tuple): arguments of 'growth' following 'n_generations'
+                                       (ave_events_num, cumulative_list, n_event_method,
+                                       del_len_distrib, ins_len_distrib, transl_len_distrib,
+                                       rec_transl_len_distrib, dupl_len_distrib).
+        """
+        self.growth(self.parent, split_generation, *growth_parameters)
+        self.leaves = []
+        self.statistics.reset_lengths()
+        roots = range(2 ** split_generation - 1, 2 ** (split_generation + 1) - 1)
+        for i in roots: self.tree.release(i)
+        tasks = [(self.tree.lengths[i].copy(), n_generations - split_generation, \
+                  growth_parameters, self.seed, self.root_path + ArrayTree.path(i), \
+                  self.profiler is not None) for i in roots]
+        def merge(results):
+            """
+            Grafts each subtree and merges its statistics as soon as it is returned (in the order
+            of 'roots'), so that only the subtrees not yet merged are kept in memory.
+            """
+            for i, (subtree, statistics, profiler) in zip(roots, results):
+                self.tree.graft(i, subtree)
+                self.statistics.merge(statistics)
+                if profiler is not None: self.profiler.merge(profiler, split_generation)
+        if n_workers > 1:
+            # imported only when needed, to keep the import of the module light
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(n_workers) as executor:
+                merge(executor.map(_grow_subtree, tasks))
+        else:
+            merge(_grow_subtree(task) for task in tasks)
+        if self.keep_leaves:
+            first_leaf = 2 ** n_generations - 1
+            self.leaves = [self.tree.cell(i) for i in range(first_leaf, self.tree.n_nodes)]
 
 ## RECONSTRUCTION OF THE SEQUENCES GIVEN THE EVENTS ######################################################
 
     def WT_sequence_initializer(self, cell: WT_Cell):
             """ 
             Given a WT cell, it fills each of the chromosomes of the WT_Cell.DNA.CHRs attribute with the
-            corresponding sequence according to the 'chromosome_table' parameter.
+            corresponding sequence according to the 'chromosome_table' parameter. The sequences are
+            stored as Rope objects, which all the events modify without copying the whole chromosome.
 
             Parameters
             ----------
                 cell (WT_Cell): Wild Type cell to be initialized with its DNA sequences.
             """
             for ID,seq in self.chromosome_table:
-                cell.DNA.CHRs[ID-1].sequence = seq
+                cell.DNA.editable_chromosome(ID).sequence = Rope(seq)
 
     def single_doughter_reconstructor(self, parent: Node, doughter: Node):
             """
@@ -474,19 +838,31 @@ class Simulator():
                         raise Exception(f"Chromosome lenght ({chr.length}) does not correspond to the length of sequences ({len(chr.sequence)})")
             # END INNER FUNCTION
             doughter.copy_chr_sequences(parent)
-            for event in doughter.data.events:
-                event.reconstruct(doughter)
+            rng = self.node_rng(doughter.index, Simulator.RECONSTRUCTION)
+            if self.profiler is not None:
+                self.profiler.reconstruct(doughter, rng)
+            else:
+                for event in doughter.data.events:
+                    event.reconstruct(doughter, rng)
             check_chr_length()
 
-    def run_reconstruction(self, parent: Node, n_generations: int):
+    def run_reconstruction(self, parent: Node, n_generations: int, lazy = False):
         """
         It runs the process that starts from the root of the binary tree and reconstruct the mutated
         sequences following the list of the events, up to the 'n_generations' generation.
+        Sequences are Rope objects, i.e. ordered lists of segments of the WT sequences and of the
+        inserted bases: no base is copied until 'str()' is called on a sequence. In the 'lazy' mode
+        the segment maps of the internal nodes are kept as well, so that the sequence of any cell of
+        the tree can be produced on demand, at a memory cost proportional to the number of events;
+        otherwise the cells of the internal nodes are released from the tree (see
+        'ArrayTree.release') as soon as their doughters are reconstructed.
 
         Parameters
         ----------
             parent (Node): ancestor (WT) cell from which the recostruction will begin.
             n_generations (int): number of generations that we want to reconstruct.
+            lazy (bool): if True the sequences of the internal nodes are not deleted.
+                         (default: False)
         """
         def reconstructor(parent):
             """
@@ -508,19 +884,165 @@ class Simulator():
             else:
                 if type(parent.data) == WT_Cell: 
                     self.WT_sequence_initializer(parent.data)
-                doughter1, doughter2 = parent.left_child, parent.right_child
-                self.single_doughter_reconstructor(parent, doughter1)
-                self.single_doughter_reconstructor(parent, doughter2)
+                # in a SparseTree only the simulated doughters are present
+                doughters = [d for d in (parent.left_child, parent.right_child) if d is not None]
+                for doughter in doughters:
+                    self.single_doughter_reconstructor(parent, doughter)
                 # delete parent sequence
-                for chr in parent.data.DNA.CHRs:
-                    chr.sequence = []
-                reconstructor(doughter1)
-                reconstructor(doughter2)
+                if not lazy:
+                    for chr in parent.data.DNA.CHRs:
+                        chr.sequence = []
+                    self.tree.release(parent.index)
+                for doughter in doughters:
+                    reconstructor(doughter)
         # END INNER FUNCTIONS
         self.leaves = []
-        reconstructor(parent)
+        with self.instrumentation.phase("reconstruction"):
+            reconstructor(parent)
         return
 
+    def iter_reconstructed_leaves(self, n_generations: int):
+        """
+        Generator version of 'run_reconstruction'. The leaves of generation 'n_generations' are
+        reconstructed one at a time, in depth-first order (from the path [0, ..., 0] to the path
+        [1, ..., 1]), and the sequences of a leaf are deleted as soon as the next one is requested.
+        Only the sequences of the cells along the current path (and of their siblings) are kept, so
+        that the memory is bounded by the number of generations instead of the number of leaves.
+
+        Parameters
+        ----------
+            n_generations (int): generation of the reconstructed leaves.
+
+        Returns
+        -------
+            iterator of tuple (path, cell): path of the leaf (list of 0 or 1) and its cell, whose
+                                            sequences are valid until the next iteration.
+
+        Raises
+        ------
+            Exception
+                If 'n_generations' is larger than the number of simulated generations.
+        """
+        if n_generations > self.generations:
+            raise Exception(f"number of generations ({n_generations}) larger than the simulated ones ({self.generations})")
+        def visit(node, path):
+            """
+            Reconstructs the leaves below 'node', whose sequences are already reconstructed.
+            """
+            if node.generation >= n_generations:
+                cell = node.data
+                self.tree.release(node.index)
+                yield path, cell
+                # delete the sequences of the leaf
+                for chr in cell.DNA.CHRs:
+                    chr.sequence = []
+            else:
+                # same order of 'run_reconstruction' (in a SparseTree only the simulated
+                # doughters are present)
+                doughters = [(direction, d) for direction, d in \
+                             enumerate((node.left_child, node.right_child)) if d is not None]
+                for direction, doughter in doughters:
+                    self.single_doughter_reconstructor(node, doughter)
+                # the sequences of the node are not needed anymore
+                self.tree.release(node.index)
+                for direction, doughter in doughters:
+                    yield from visit(doughter, path + [direction])
+        if type(self.parent.data) == WT_Cell:
+            self.WT_sequence_initializer(self.parent.data)
+        yield from self.instrumentation.iterate("reconstruction", visit(self.parent, []))
+
+    def parallel_reconstruction(self, n_generations: int, split_generation = None, \
+                                n_workers = None, output_dir = None):
+        """
+        Multi-process version of 'run_reconstruction'. The sequences of the cells of generation
+        'split_generation' are reconstructed serially, then the subtrees rooted in them are sent,
+        together with the segment maps of their roots (see 'segment_map'), to a pool of
+        'n_workers' processes which reconstruct their leaves. The WT sequences are copied once in a
+        block of shared memory (see SharedReference), which all the workers read.
+        It is a generator: the leaves are yielded subtree by subtree, in the order of the paths,
+        and they are not kept in 'self.leaves'. Since every cell draws its random bases from its
+        own generator (see 'node_rng'), the sequences are the same of 'run_reconstruction'.
+        The subtrees are built (depth first, keeping only the sequences of the current lineage)
+        and submitted only when a worker is about to need them: at most 2 * 'n_workers' subtrees
+        are in the pool, so that the memory is bounded by 2 * 'n_workers' times the leaves of a
+        subtree (2^(n_generations - split_generation)), not by the whole population.
+
+        Parameters
+        ----------
+            n_generations (int): number of generations that we want to reconstruct.
+            split_generation (int): generation of the roots of the subtrees reconstructed in
+                                    parallel. If None, the largest of min(n_generations, 6) and
+                                    n_generations - 6 (at most 64 leaves per subtree).
+                                    (default: None)
+            n_workers (int): number of processes. If None, the number of CPUs. With 1 process the
+                             subtrees are reconstructed in the current one. (default: None)
+            output_dir (str): if given, each leaf is written by the worker in the FASTA file
+                              'leaf_<path>.fa' of this directory, and the name of the file is
+                              yielded instead of the sequences. (default: None)
+
+        Returns
+        -------
+            iterator of tuple (path, sequences): path of the leaf (list of 0 or 1) and list of
+                                                 the sequences (str) of its chromosomes, or name of
+                                                 its FASTA file.
+
+        Raises
+        ------
+            Exception
+                If only the sampled lineages were simulated (SparseTree), or 'n_generations' is
+                larger than the number of simulated generations.
+        """
+        if isinstance(self.tree, SparseTree):
+            raise Exception(f"'parallel_reconstruction' needs the complete tree, not the sampled lineages: use 'iter_reconstructed_leaves' or 'batch_path_reconstructor'")
+        if n_generations > self.generations:
+            raise Exception(f"number of generations ({n_generations}) larger than the simulated ones ({self.generations})")
+        if split_generation is None: split_generation = max(min(n_generations, 6), n_generations - 6)
+        split_generation = min(split_generation, n_generations)
+        if n_workers is None: n_workers = os.cpu_count()
+        if output_dir is not None: os.makedirs(output_dir, exist_ok=True)
+        from collections import deque
+        from concurrent.futures import ProcessPoolExecutor
+        from SharedReference import SharedReference
+
+        def tasks():
+            """
+            Reconstructs serially the cells down to 'split_generation', depth first, and yields
+            the task of each subtree (in the order of the paths) as soon as its root is ready.
+            """
+            self.WT_sequence_initializer(self.parent.data)
+            stack = [self.parent]
+            while stack:
+                node = stack.pop()
+                if node.generation >= split_generation:
+                    task = (reference, self.tree.subtree(node.index, n_generations - split_generation), \
+                            self.segment_map(node), self.seed, \
+                            self.root_path + ArrayTree.path(node.index), output_dir)
+                    self.tree.release(node.index)
+                    yield task
+                else:
+                    self.single_doughter_reconstructor(node, node.left_child)
+                    self.single_doughter_reconstructor(node, node.right_child)
+                    self.tree.release(node.index)
+                    stack += [node.right_child, node.left_child]
+
+        reference = SharedReference(self.chromosome_table)
+        try:
+            if n_workers > 1:
+                with ProcessPoolExecutor(n_workers) as executor:
+                    pending = deque()
+                    for task in tasks():
+                        pending.append(executor.submit(_reconstruct_subtree, task))
+                        if len(pending) >= 2 * n_workers:
+                            yield from pending.popleft().result()
+                    while pending:
+                        yield from pending.popleft().result()
+            else:
+                for task in tasks():
+                    yield from _reconstruct_subtree(task)
+        finally:
+            reference.close()
+            reference.unlink()
+
     def path_reconstructor(self, path: list):
         """
         Given a path and the total number of simulated generations 'n_generations', this function 
@@ -537,36 +1059,119 @@ class Simulator():
         Raises
         ------
             Exception
-                If the path's length is larger than the number of simulated generations.
+                If the path's length is larger than the number of simulated generations, or it
+                leads to a cell which was not simulated.
         """
         if self.generations < len(path): 
             raise Exception(f"path's length ({len(path)}) larger than number of generations ({self.generations})")
         if self.generations > len(path): 
             print(f"path's length ({len(path)}) is shorter than number of generations ({self.generations})")
-        current_node = self.parent
-        if type(current_node.data) == WT_Cell: 
-            self.WT_sequence_initializer(current_node.data)
-        for direction in path:
-            if direction == 0: 
-                self.single_doughter_reconstructor(current_node, current_node.left_child)
+        with self.instrumentation.phase("reconstruction"):
+            current_node = self.parent
+            if type(current_node.data) == WT_Cell: 
+                self.WT_sequence_initializer(current_node.data)
+            for direction in path:
+                doughter = current_node.left_child if direction == 0 else current_node.right_child
+                # in a SparseTree only the sampled lineages are present
+                if doughter is None: raise Exception(f"the cell at the end of {path} was not simulated")
+                self.single_doughter_reconstructor(current_node, doughter)
                 # delete parent sequence
                 for chr in current_node.data.DNA.CHRs:
                     chr.sequence = []
-                current_node = current_node.left_child
-            elif direction == 1: 
-                self.single_doughter_reconstructor(current_node, current_node.right_child)
-                # delete parent sequence
-                for chr in current_node.data.DNA.CHRs:
-                    chr.sequence = []
-                current_node = current_node.right_child
+                current_node = doughter
         return current_node
 
+    def batch_path_reconstructor(self, paths: list, cache_bytes = 2 ** 28):
+        """
+        Reconstructs the cells at the end of many paths. The paths are visited in the order of
+        their trie (sorted, i.e. depth first), and the genomes of the ancestors are kept in a Least
+        Recently Used cache ('self.genome_cache', see GenomeCache) bounded to 'cache_bytes' bytes:
+        each path starts from its deepest cached ancestor, so that the ancestors shared by several
+        paths are reconstructed only once (as long as the lineage being visited fits in the cache).
+        The cache is kept between different calls.
+
+        Parameters
+        ----------
+            paths (list): list of paths (list of 0 or 1). 0 corresponds to "left_child", 1 to
+                          "right_child".
+            cache_bytes (int): memory bound of the cache of the ancestor genomes.
+                               (default: 2^28, 256 MB)
+
+        Returns
+        -------
+            iterator of tuple (path, cell): path and reconstructed cell, in the order of the trie.
+
+        Raises
+        ------
+            Exception
+                If a path is longer than the number of simulated generations, or it leads to a
+                cell which was not simulated.
+        """
+        if self.genome_cache is None:
+            self.genome_cache = GenomeCache(cache_bytes)
+        else:
+            self.genome_cache.resize(cache_bytes)
+        cache = self.genome_cache
+        for path in sorted(list(path) for path in paths):
+            if len(path) > self.generations:
+                raise Exception(f"path's length ({len(path)}) larger than number of generations ({self.generations})")
+            # deepest ancestor whose genome is cached
+            ancestors = [ArrayTree.index(path[: k]) for k in range(len(path) + 1)]
+            depth, sequences = len(path) - 1, None
+            while depth >= 0:
+                sequences = cache.get(ancestors[depth])
+                if sequences is not None: break
+                depth -= 1
+            depth = max(depth, 0)
+            node = self.tree.node(ancestors[depth])
+            if sequences is None:
+                self.WT_sequence_initializer(node.data)
+                if len(path) > 0: cache.put(node.index, [chr.sequence for chr in node.data.DNA.CHRs])
+            else:
+                for ID, seq in enumerate(sequences, start=1):
+                    node.data.DNA.editable_chromosome(ID).sequence = seq
+            for direction in path[depth :]:
+                doughter = node.left_child if direction == 0 else node.right_child
+                if doughter is None: raise Exception(f"the cell at the end of {path} was not simulated")
+                self.single_doughter_reconstructor(node, doughter)
+                self.tree.release(node.index)
+                node = doughter
+                # only the ancestors are cached
+                if node.index != ancestors[-1]:
+                    cache.put(node.index, [chr.sequence for chr in node.data.DNA.CHRs])
+            cell = node.data
+            self.tree.release(node.index)
+            yield path, cell
+
+    def segment_map(self, node: Node):
+        """
+        Returns, for each chromosome of the (already reconstructed) cell in 'node', the ordered list
+        of segments its sequence is made of. Each segment is a tuple (source, start, end): 'source'
+        is the ID of the WT chromosome (in 'chromosome_table') whose bases are used, or the string of
+        inserted bases itself for the bases created by Insertions and Pointwise Mutations.
+
+        Parameters
+        ----------
+            node (Node): node containing the reconstructed cell.
+
+        Returns
+        -------
+            segments (list): list containing a list of segments for each chromosome.
+        """
+        wt_ids = {id(seq): ID for ID, seq in self.chromosome_table}
+        segments = []
+        for chr in node.data.DNA.CHRs:
+            segments.append([(wt_ids.get(id(source), source), start, end) \
+                             for source, start, end in chr.sequence.pieces()])
+        return segments
+
 ## VISUALIZATION ####################################################################################
 
     def run_visualization(self, parent: Node, n_generations: int):
         """
         It runs the process that starts from the root of the bunary tree and reconstruct the array for
-        the visualization of the comulated mutations.
+        the visualization of the comulated mutations. The cells of the internal nodes are released
+        from the tree (see 'ArrayTree.release') as soon as the arrays of their doughters are built.
 
         Parameters
         ----------
@@ -576,8 +1181,9 @@ class Simulator():
         # INNER FUNCTIONS
         def single_doughter_visualizetor(parent: Node, doughter: Node):
             """
-            It copies the DNA visual arrays from the parent to the doughter cell. Then it modifies them 
-            according to the new events present in the doughter cell.
+            It shares the visual coverages (Coverage) of the parent with the doughter cell. Then it
+            replaces them according to the new events present in the doughter cell: a Coverage is
+            immutable, so the parent is not modified and no copy is needed.
 
             Parameters
             ----------
@@ -603,13 +1209,16 @@ class Simulator():
                     if chr.length != len(chr.visual): 
                         raise Exception(f"Chromosome lenght ({chr.length}) does not correspond to the length of 'visual' array ({len(chr.sequence)})")
             
-            # copy the visual array from parent
+            # share the (immutable) visual coverage of the parent
             n_chr = len(parent.data.DNA.CHRs)
             for i in range(n_chr):
-                doughter.data.DNA.CHRs[i].visual = copy.deepcopy(parent.data.DNA.CHRs[i].visual)
+                doughter.data.DNA.editable_chromosome(i + 1).visual = parent.data.DNA.CHRs[i].visual
 
-            for event in doughter.data.events:
-                event.update_visual(doughter)
+            if self.profiler is not None:
+                self.profiler.update_visual(doughter)
+            else:
+                for event in doughter.data.events:
+                    event.update_visual(doughter)
             check_chr_length()
         
         def visualizator(parent: Node):
@@ -633,19 +1242,67 @@ class Simulator():
             else:
             # initialize wt cell visual
                 if type(parent.data) == WT_Cell: 
-                    for chr in parent.data.DNA.CHRs:
-                        chr.visual = np.zeros(chr.length)
-                doughter1, doughter2 = parent.left_child, parent.right_child
-                single_doughter_visualizetor(parent, doughter1), single_doughter_visualizetor(parent, doughter2)
+                    for ID in range(1, len(parent.data.DNA.CHRs) + 1):
+                        chr = parent.data.DNA.editable_chromosome(ID)
+                        chr.visual = Coverage(chr.length)
+                doughters = [d for d in (parent.left_child, parent.right_child) if d is not None]
+                for doughter in doughters:
+                    single_doughter_visualizetor(parent, doughter)
             # deletion of the parent visual array
                 for chr in parent.data.DNA.CHRs:
-                    chr.visual = []
-                visualizator(doughter1), visualizator(doughter2)
+                    chr.visual = None
+                self.tree.release(parent.index)
+                for doughter in doughters:
+                    visualizator(doughter)
         # END INNER FUNCTIONS
         self.leaves = []
-        visualizator(parent)
+        with self.instrumentation.phase("visualization"):
+            visualizator(parent)
         return
 
+    def path_visualization(self, path: list):
+        """
+        Builds the 'visual' coverages of the cell at the end of 'path' only (as
+        'path_reconstructor' does for the sequences), e.g. to display one leaf without visualizing
+        the whole tree. The coverages of the ancestors are shared (Coverage is immutable) and
+        released along the path.
+
+        Parameters
+        ----------
+            path (list): list of 0 or 1. 0 corresponds to "left_child", 1 to "right_child".
+
+        Returns
+        -------
+            node (Node): cell at the end of the path, with its 'visual' coverages.
+
+        Raises
+        ------
+            Exception
+                If the path is longer than the number of simulated generations, or it leads to a
+                cell which was not simulated.
+        """
+        if len(path) > self.generations:
+            raise Exception(f"path's length ({len(path)}) larger than number of generations ({self.generations})")
+        with self.instrumentation.phase("visualization"):
+            node = self.parent
+            if type(node.data) == WT_Cell:
+                for ID in range(1, len(node.data.DNA.CHRs) + 1):
+                    chr = node.data.DNA.editable_chromosome(ID)
+                    chr.visual = Coverage(chr.length)
+            for direction in path:
+                doughter = node.left_child if direction == 0 else node.right_child
+                if doughter is None: raise Exception(f"the cell at the end of {path} was not simulated")
+                for ID, chr in enumerate(node.data.DNA.CHRs, start=1):
+                    doughter.data.DNA.editable_chromosome(ID).visual = chr.visual
+                if self.profiler is not None:
+                    self.profiler.update_visual(doughter)
+                else:
+                    for event in doughter.data.events:
+                        event.update_visual(doughter)
+                self.tree.release(node.index)
+                node = doughter
+        return node
+
     def visualize(self, cell: Cell):
         """
         Displays the chromosome of a selected leaf (among Simulation.leaves), highlighting locations where multiple 
@@ -660,17 +1317,21 @@ class Simulator():
             Exception
                 If the option 'visual' is set to 'False', the function cannot display the result.
         """
+        # matplotlib is imported only here: it dominates the import time of the module
+        import matplotlib.pyplot as plt
         Max = 0
         for chr in  cell.DNA.CHRs:
-            max = np.amax(chr.visual)
+            max = chr.visual.max()
             if max >= Max: Max = max
         scale_max_value = Max
         data = []
-        fig, axs = plt.subplots(16, figsize = (20,9.9))
+        n_chr = len(cell.DNA.CHRs)
+        fig, axs = plt.subplots(n_chr, figsize = (20,9.9), squeeze = False)
+        axs = axs[:, 0]
         fig.suptitle(f'Cumulated Mutations ({cell.generation} generations)', fontname = 'Helvetica', fontsize = 24)
-        for id in range(1,17):
+        for id in range(1, n_chr + 1):
             ax = axs[id-1]   
-            data.append([np.array(cell.DNA.CHRs[id - 1].visual)])
+            data.append([cell.DNA.CHRs[id - 1].visual.to_array()])
             im = ax.imshow(data[id-1], aspect = 100000*len(data[id-1]), cmap='Greys', vmin = 0, vmax = scale_max_value, \
                 interpolation='nearest')
             ax.set_ylabel(f"CHR {id}", rotation=0, fontname = 'Helvetica', fontsize=15, labelpad=30)
@@ -709,21 +1370,6 @@ class Simulator():
         for chr in node.data.DNA.CHRs:
                 self.average_chromosome_length[chr.ID - 1] += chr.length
 
-    def chromosome_std_dev(self, n_chr: int, n_gen: int):
-        """
-        Computes the Standard Deviation of the final length of each Chromosome.
-
-        Parameters
-        ----------
-            n_chr (int): number of chromosomes.
-            n_gen (int). number of generations.            
-        """
-        st_dev = np.zeros(n_chr)
-        for cell in self.leaves:
-            for chr in cell.DNA.CHRs:
-                st_dev[chr.ID - 1] += (chr.length - self.average_chromosome_length[chr.ID - 1])**2
-        return np.sqrt(st_dev / (2 ** n_gen))
-
     def stat_max_cumulated_mutations(self):
         """
         Computes average and standard deviation of the maximum number (between different chromosme of
@@ -735,17 +1381,18 @@ class Simulator():
             stdev (float): standard deviation
 
         """
-        ave = 0
-        mom2 = 0
-        Max = 0
-        for leaf in self.leaves:
-            for chr in leaf.DNA.CHRs:
-                max = np.amax(chr.visual)
-                if max >= Max: Max = max
-            ave += Max
-            mom2 += np.power(Max, 2)
-        ave /= len(self.leaves)
-        stdv = np.sqrt(mom2/len(self.leaves) - np.power(ave,2))
+        with self.instrumentation.phase("stats"):
+            ave = 0
+            mom2 = 0
+            Max = 0
+            for leaf in self.leaves:
+                for chr in leaf.DNA.CHRs:
+                    max = chr.visual.max()
+                    if max >= Max: Max = max
+                ave += Max
+                mom2 += np.power(Max, 2)
+            ave /= len(self.leaves)
+            stdv = np.sqrt(mom2/len(self.leaves) - np.power(ave,2))
         return ave, stdv
 
     def stat_cumulated_mutations(self):
@@ -759,26 +1406,142 @@ class Simulator():
             stdev (float): standard deviation
 
         """
-        ave = 0
-        mom2 = 0
-        for leaf in self.leaves:
-            for chr in leaf.DNA.CHRs:
-                max = np.amax(chr.visual)
-                ave += max
-                mom2 += np.power(max,2)
-        ave /= len(self.leaves) * len(leaf.DNA.CHRs)
-        mom2 /= len(self.leaves) * len(leaf.DNA.CHRs)
-        stdv = np.sqrt(mom2 - np.power(ave,2))
+        with self.instrumentation.phase("stats"):
+            ave = 0
+            mom2 = 0
+            for leaf in self.leaves:
+                for chr in leaf.DNA.CHRs:
+                    max = chr.visual.max()
+                    ave += max
+                    mom2 += np.power(max,2)
+            ave /= len(self.leaves) * len(leaf.DNA.CHRs)
+            mom2 /= len(self.leaves) * len(leaf.DNA.CHRs)
+            stdv = np.sqrt(mom2 - np.power(ave,2))
         return ave, stdv
 
+    def population_coverage(self, n_generations: int):
+        """
+        Computes the statistics of the cumulated mutations of the whole population of leaves of
+        generation 'n_generations' without building their 'visual' arrays (see PopulationCoverage).
+        The tree is visited once, depth first, keeping only the coverages (Coverage) of the current
+        lineage: when no descendant of a node of generation 'g' has events, its coverages are added
+        once with weight 2^(n_generations - g), the number of leaves they reach.
+        Only the memory is saved: the coverage of every node with events is still built (the
+        coverage of a leaf is not a sum over its ancestors, since the rearrangements move the
+        positions, and its maximum is needed), so the time is O(nodes x breakpoints), as for
+        'run_visualization'. The weighting saves time only when whole subtrees have no events
+        (e.g. 'ave_events_num' << 1).
+
+        Parameters
+        ----------
+            n_generations (int): generation of the leaves.
+
+        Returns
+        -------
+            coverage (PopulationCoverage): population-level statistics.
+        """
+        tree = self.tree
+        if isinstance(tree, SparseTree):
+            raise Exception(f"'population_coverage' needs the complete tree, not the sampled lineages")
+        n_nodes = 2 ** (n_generations + 1) - 1
+        # 'below[i]' is True if a descendant of 'i' (up to 'n_generations') has events
+        with_events = tree.event_stop[: n_nodes] > tree.event_start[: n_nodes]
+        below = np.zeros(n_nodes, dtype=bool)
+        for g in range(n_generations - 1, -1, -1):
+            first, last = 2 ** g - 1, 2 ** (g + 1) - 1
+            children = np.arange(2 * first + 1, 2 * last + 1).reshape(-1, 2)
+            below[first : last] = (with_events[children] | below[children]).any(axis=1)
+        result = PopulationCoverage(tree.lengths.shape[1])
+
+        def aggregator(i: int, visuals: list):
+            """
+            Recurrent function that adds to 'result' the leaves below the node 'i', whose cell has
+            the coverages 'visuals'.
+            """
+            g = ArrayTree.generation(i)
+            if g >= n_generations or not below[i]:
+                result.add_leaves(visuals, 2 ** (n_generations - g))
+                return
+            for child in (ArrayTree.left(i), ArrayTree.right(i)):
+                child_visuals = visuals
+                if with_events[child]:
+                    cached = child in tree.cells
+                    node = tree.node(child)
+                    for ID, visual in enumerate(visuals, start=1):
+                        node.data.DNA.editable_chromosome(ID).visual = visual
+                    if self.profiler is not None:
+                        self.profiler.update_visual(node)
+                    else:
+                        for event in node.data.events:
+                            event.update_visual(node)
+                    child_visuals = [chr.visual for chr in node.data.DNA.CHRs]
+                    if not cached: tree.release(child)
+                aggregator(child, child_visuals)
+
+        with self.instrumentation.phase("stats"):
+            aggregator(0, [Coverage(length) for length in tree.lengths[0].tolist()])
+        return result
+
+    def enable_profiling(self):
+        """
+        Starts profiling the events (see EventProfiler): their creation during the growth
+        (measured inside 'sample_events', event by event), their 'reconstruct' and their
+        'update_visual'. The events created by calling 'random_choice' or the 'rand_*' methods
+        directly are not measured.
+        """
+        if self.profiler is not None: return
+        self.profiler = EventProfiler()
+
+    def disable_profiling(self):
+        """
+        Stops profiling the events. The profile is discarded.
+        """
+        self.profiler = None
+
+    def profile_table(self, by_generation = False):
+        """
+        Returns the profile of the events: calls, nanoseconds and bytes copied by kind of event
+        (and generation) for the growth, the reconstruction and the visualization.
+
+        Parameters
+        ----------
+            by_generation (bool): if True there is one row for each generation. (default: False)
+
+        Returns
+        -------
+            table (list): rows of the profile (see 'EventProfiler.table').
+
+        Raises
+        ------
+            Exception
+                If the profiling is not enabled.
+        """
+        if self.profiler is None:
+            raise Exception(f"The events are not profiled: use 'Simulator(..., profile=True)' or 'enable_profiling'")
+        return self.profiler.table(by_generation)
+
+    def performance_report(self):
+        """
+        Returns the time and the memory used by each phase of the simulation ('growth',
+        'reconstruction', 'visualization', 'stats'), measured by 'self.instrumentation'. Other
+        code can be measured as well, e.g. 'with simulator.instrumentation.phase("output"):'.
+
+        Returns
+        -------
+            report (dict): measurements of each phase (see 'Instrumentation.report').
+        """
+        return self.instrumentation.report()
+
     def __init__(self, chromosome_table, n_gen, ave_events_num = 1, \
                  cumulative_list = [1./7, 2./7, 3./7, 4./7, 5./7, 6./7, 1.], \
                  n_events_distrib = Utility.poisson_events_number, \
-                 del_len_distrib = Utility.int_trunc_uniform, \
-                 ins_len_distrib = Utility.int_trunc_uniform, 
-                 transl_len_distrib = Utility.int_trunc_uniform, \
-                 rec_transl_len_distrib = Utility.int_trunc_uniform, \
-                 dupl_len_distrib = Utility.int_trunc_uniform, visual = False):
+                 del_len_distrib = TruncatedUniform(), \
+                 ins_len_distrib = TruncatedUniform(), \
+                 transl_len_distrib = TruncatedUniform(), \
+                 rec_transl_len_distrib = TruncatedUniform(), \
+                 dupl_len_distrib = TruncatedUniform(), visual = False, seed = None, \
+                 n_workers = 1, split_generation = None, keep_leaves = True, \
+                 sampled_leaves = None, trace_allocations = False, profile = False):
         """ 
         It initializes the Wild Type Cell,the Binary Tree, the number of generations, the average 
         genome and chromosome lengths and the array containing the leaves. Then simulates the cell 
@@ -794,29 +1557,167 @@ class Simulator():
                                     events. (default: [1./7, 2./7, 3./7, 4./7, 5./7, 6./7, 1.]) 
             n_events_distrib (Method): probability distribution of the number of events in one cell
                                        duplication. (default: poisson_events_number)
-            del_len_distrib (Method): probability distribution of the Deletion length. 
-                                      (default: int_trunc_uniform)
-            ins_len_distrib (Method): probability distribution of the Insertion length.
-                                      (default: int_trunc_uniform)
-            transl_len_distrib (Method): probability distribution of the Translocation length.
-                                      (default: int_trunc_uniform)
-            rec_transl_len_distrib (Method): probability distribution of the Reciprocal 
-                                             Translocation length. (default: int_trunc_uniform)
-            dupl_len_distrib (Method): probability distribution of the Duplication length.
-                                      (default: int_trunc_uniform)
+            del_len_distrib (LengthDistribution): probability distribution of the Deletion
+                                                  length. Functions 'distrib(a, b, rng)' are
+                                                  accepted as well. (default: TruncatedUniform())
+            ins_len_distrib (LengthDistribution): probability distribution of the Insertion length.
+                                                  (default: TruncatedUniform())
+            transl_len_distrib (LengthDistribution): probability distribution of the Translocation
+                                                     length. (default: TruncatedUniform())
+            rec_transl_len_distrib (LengthDistribution): probability distribution of the Reciprocal 
+                                                         Translocation length.
+                                                         (default: TruncatedUniform())
+            dupl_len_distrib (LengthDistribution): probability distribution of the Duplication
+                                                   length. (default: TruncatedUniform())
+            seed (int): seed of the simulation, from which the generator of every cell is
+                        derived (see 'node_rng'). If None, a random seed is drawn and saved in
+                        'self.seed'. (default: None)
+            n_workers (int): number of processes used to simulate the tree. The distributions must
+                             be picklable (e.g. module level functions or 'functools.partial').
+                             The sampled lineages ('sampled_leaves') are always simulated in the
+                             current process: with 'n_workers' > 1 a warning is printed.
+                             (default: 1)
+            split_generation (int): generation from which the subtrees are simulated in parallel
+                                    (see 'parallel_growth'). If None and 'n_workers' > 1, it is
+                                    min(n_gen, 6). (default: None)
+            keep_leaves (bool): if False, the leaf cells are not kept in 'self.leaves' after the
+                                growth: the statistics are computed on the fly (see
+                                'self.statistics'). (default: True)
+            sampled_leaves (int/list): if given, only the ancestral lineages of a sample of leaves
+                                       are simulated (see 'sampled_growth'), in a SparseTree: the
+                                       number of leaves drawn at random, or the list of their
+                                       paths. The statistics refer to the sampled leaves.
+                                       (default: None, the complete tree is simulated)
+            trace_allocations (bool): if True, the memory allocations of each phase of the
+                                      simulation are traced (see 'self.instrumentation'), which
+                                      slows it down. (default: False)
+            profile (bool): if True, the time and the bytes copied by the events are profiled
+                            by kind of event and generation (see 'self.profiler'). The parallel
+                            reconstruction is not profiled. (default: False)
         """
         n_chr = len(chromosome_table)
         wt = WT_Cell(chromosome_table)
         self.chromosome_table = chromosome_table
-        self.parent = Node(wt)
+        if sampled_leaves is None:
+            self.tree = ArrayTree(chromosome_table, n_gen)
+        else:
+            self.tree = SparseTree(chromosome_table, n_gen)
+        self.tree.store(0, wt)
+        self.parent = self.tree.node(0)
         self.generations = n_gen
         self.average_genome_length, self.average_chromosome_length = 0, np.zeros(n_chr)
         self.leaves = []
-        self.growth(self.parent, n_gen, ave_events_num, cumulative_list, n_events_distrib, \
-                    del_len_distrib, ins_len_distrib, transl_len_distrib, rec_transl_len_distrib,\
-                    dupl_len_distrib)
-        self.average_genome_length /= 2 ** n_gen
-        self.average_chromosome_length = self.average_chromosome_length / 2 ** n_gen 
-        self.chr_length_st_dev = self.chromosome_std_dev(n_chr, n_gen)
-        
+        self.keep_leaves = keep_leaves
+        self.statistics = OnlineStatistics(n_chr)
+        growth_parameters = (ave_events_num, cumulative_list, n_events_distrib, del_len_distrib, \
+                             ins_len_distrib, transl_len_distrib, rec_transl_len_distrib, \
+                             dupl_len_distrib)
+        self.seed = np.random.SeedSequence(seed).entropy
+        self.root_path = []
+        if split_generation is None and n_workers > 1: split_generation = min(n_gen, 6)
+        self.sampled_paths = None
+        self.genome_cache = None
+        self.instrumentation = Instrumentation(trace_allocations)
+        self.profiler = None
+        if profile: self.enable_profiling()
+        with self.instrumentation.phase("growth"):
+            if sampled_leaves is not None:
+                if n_workers > 1:
+                    print(f"Warning: n_workers ({n_workers}) is ignored, the sampled lineages are simulated in a single process")
+                if isinstance(sampled_leaves, int):
+                    self.sampled_paths = self.sample_paths(sampled_leaves, n_gen)
+                else:
+                    self.sampled_paths = sorted(list(path) for path in sampled_leaves)
+                self.sampled_growth(self.parent, n_gen, self.sampled_paths, growth_parameters)
+            elif split_generation is None:
+                self.growth(self.parent, n_gen, *growth_parameters)
+            else:
+                self.parallel_growth(n_gen, min(split_generation, n_gen), n_workers, \
+                                     growth_parameters)
+        self.average_genome_length = self.statistics.mean[-1]
+        self.average_chromosome_length = self.statistics.mean[: -1]
+        self.chr_length_st_dev = self.statistics.std()[: -1]
+
+
+def _subtree_simulator(tree, seed, root_path: list):
+    """
+    Builds, without running any simulation, a Simulator on 'tree', which is the subtree rooted in
+    the node at the end of 'root_path' of a simulation with the given seed.
+    """
+    simulator = Simulator.__new__(Simulator)
+    simulator.chromosome_table = None
+    simulator.tree = tree
+    simulator.parent = tree.node(0)
+    simulator.generations = tree.generations
+    simulator.seed = seed
+    simulator.root_path = root_path
+    simulator.instrumentation = Instrumentation()
+    simulator.profiler = None
+    return simulator
+
+
+def _grow_subtree(task):
+    """
+    Simulates, in a worker process, the subtree rooted in a cell with the given chromosome lengths
+    (see 'Simulator.parallel_growth').
 
+    Parameters
+    ----------
+        task (tuple): chromosome lengths of the root, number of generations of the subtree,
+                      arguments of 'Simulator.growth', seed of the simulation, path of the
+                      root and True if the events are profiled.
+
+    Returns
+    -------
+        tree (ArrayTree): simulated subtree. Its root is not a WT cell.
+        statistics (OnlineStatistics): statistics of the leaves and of the events of the subtree.
+        profiler (EventProfiler): profile of the events of the subtree (None if not profiled).
+    """
+    root_lengths, n_generations, growth_parameters, seed, root_path, profile = task
+    simulator = _subtree_simulator(ArrayTree(None, n_generations, root_lengths), seed, root_path)
+    if profile: simulator.profiler = EventProfiler()
+    simulator.statistics = OnlineStatistics(len(root_lengths))
+    simulator.keep_leaves = False
+    simulator.leaves = []
+    simulator.growth(simulator.parent, n_generations, *growth_parameters)
+    simulator.tree.cells = {}
+    return simulator.tree, simulator.statistics, simulator.profiler
+
+
+def _reconstruct_subtree(task):
+    """
+    Reconstructs, in a worker process, the leaves of a subtree (see
+    'Simulator.parallel_reconstruction').
+
+    Parameters
+    ----------
+        task (tuple): SharedReference with the WT sequences, subtree (ArrayTree), segment map of
+                      its root, seed of the simulation, path of the root and output directory (or
+                      None).
+
+    Returns
+    -------
+        leaves (list): list of tuple (path, sequences) for each leaf of the subtree. 'sequences' is
+                       the list of the chromosome sequences, or the name of the FASTA file.
+    """
+    reference, tree, segments, seed, root_path, output_dir = task
+    sources = dict(reference.chromosome_table())
+    simulator = _subtree_simulator(tree, seed, root_path)
+    root = simulator.parent.data
+    for chr, chr_segments in zip(root.DNA.CHRs, segments):
+        sequence = Rope()
+        for source, start, end in chr_segments:
+            sequence = sequence + Rope(sources.get(source, source)).copy_range(start, end)
+        root.DNA.editable_chromosome(chr.ID).sequence = sequence
+    leaves = []
+    for path, cell in simulator.iter_reconstructed_leaves(tree.generations):
+        path = root_path + path
+        if output_dir is None:
+            leaves.append((path, [str(chr.sequence) for chr in cell.DNA.CHRs]))
+        else:
+            file_name = os.path.join(output_dir, "leaf_" + "".join(map(str, path)) + ".fa")
+            Utility.write_fasta(file_name, cell)
+            leaves.append((path, file_name))
+    # the sequences refer to the shared memory, which can be closed only when no view is left
+    tree.cells = {}
+    return leaves
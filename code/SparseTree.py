@@ -0,0 +1,83 @@
+import numpy as np
+from ArrayTree import ArrayTree, NodeView
+from EventLog import EventLog
+
+
+class SparseTree(ArrayTree):
+    """
+    ArrayTree containing only some of the nodes of a complete tree, for example the ancestral
+    lineages of a sample of leaves. The nodes keep the IDs they have in the complete tree (so that
+    the paths, and the random generators derived from them, are the same), but the arrays have one
+    row for each stored node only: the memory grows with the number of stored nodes instead of
+    2^generations.
+
+    Attributes
+    ----------
+    rows : dict
+        Row of each stored node in 'lengths', 'event_start' and 'event_stop', indexed by node ID.
+
+    Methods
+    -------
+    row(i: int)
+        Returns the row of the node 'i', adding it to the tree if it is not stored yet.
+    node(i: int)
+        Returns a NodeView on the node 'i', or None if the node is not stored.
+    """
+    def __init__(self, chromosome_table, n_generations: int, root_lengths = None, capacity = 1024):
+        """
+        It allocates the arrays for 'capacity' nodes and stores the chromosome lengths of the WT
+        cell in the root.
+
+        Parameters
+        ----------
+            chromosome_table (list): list of tuple. Each tuple contains the chromosome ID and its
+                                     sequence. It can be None if 'root_lengths' is given.
+            n_generations (int): number of generations of the tree.
+            root_lengths (list): chromosome lengths of the root, if it is not the WT cell.
+                                 (default: None)
+            capacity (int): number of nodes initially allocated. The arrays grow automatically.
+                            (default: 1024)
+        """
+        if root_lengths is None: root_lengths = [len(seq) for ID, seq in chromosome_table]
+        self.chromosome_table = chromosome_table
+        self.generations = n_generations
+        self.rows = {}
+        self.lengths = np.zeros((capacity, len(root_lengths)), dtype=np.int64)
+        self.log = EventLog()
+        self.event_start = np.zeros(capacity, dtype=np.int64)
+        self.event_stop = np.zeros(capacity, dtype=np.int64)
+        self.cells = {}
+        self.lengths[self.row(0)] = root_lengths
+
+    @property
+    def n_nodes(self):
+        return len(self.rows)
+
+    def row(self, i: int):
+        row = self.rows.get(i)
+        if row is None:
+            row = self.rows[i] = len(self.rows)
+            if row >= len(self.event_start):
+                capacity = 2 * len(self.event_start)
+                self.lengths = np.concatenate((self.lengths, np.zeros_like(self.lengths)))
+                self.event_start = np.resize(self.event_start, capacity)
+                self.event_stop = np.resize(self.event_stop, capacity)
+        return row
+
+    def node(self, i: int):
+        """
+        Returns a NodeView on the node 'i', or None if the node is not stored in the tree.
+        """
+        return NodeView(self, i) if i in self.rows else None
+
+    def graft(self, i: int, subtree):
+        raise Exception(f"SparseTree does not support 'graft'")
+
+    def subtree(self, i: int, n_generations = None):
+        raise Exception(f"SparseTree does not support 'subtree'")
+
+    def __repr__(self):
+        return f"SparseTree(generations: {self.generations!r}, nodes: {self.n_nodes!r})"
+
+    def __str__(self):
+        return f"SparseTree(generations: {self.generations}, nodes: {self.n_nodes})"
@@ -1,6 +1,5 @@
 from Rearrangement import Rearrangement
 from BinaryTree import Node
-import numpy as np 
 
 class Translocation(Rearrangement):
     """
@@ -22,30 +21,35 @@ class Translocation(Rearrangement):
     Methods
     -------
     update_visual(self, chr: Chromosome):
-        Updates the "visual" array of the chromosome.
-    reconstruct(self, node: Node):
+        Updates the "visual" coverage (Coverage) of the chromosome.
+    reconstruct(self, node: Node, rng = None):
         Reconstruction of the DNA sequence involved in the current Translocation, of the considered
         cell.
+    row(self) -> tuple
+        Returns the columns (chr_a, chr_b, pos, length, final_pos) of the event in the EventLog.
+    from_row(cls, chr_a, chr_b, pos, length, final_pos)
+        Builds the event from its columns in the EventLog.
     """
+    __slots__ = ("ChrID", "InitPos", "Length", "FinalPos")
+    SubKind = "Translocation"
+    type_code = 2
 
     def update_visual(self, node: Node):
         """
-        Updates the "visual" array of the chromosome.
+        Updates the "visual" coverage (Coverage) of the chromosome.
 
         Parameters
         ----------
             chr (Chromosome): chromosome involved in the Deletion.
         """
         chr = node.data.DNA.CHRs[self.ChrID - 1]
-        translocated = chr.visual[self.InitPos : self.InitPos + self.Length] + 1
-        new_vis = np.concatenate((chr.visual[: self.InitPos], chr.visual[self.InitPos + self.Length :]))
-        new_vis = np.concatenate((new_vis[: self.FinalPos], translocated, new_vis[self.FinalPos :]))
-        #if len(new_vis) != chr.length: raise Exception(f"visual {len(new_vis)}, chr {chr.length}")
-        if self.InitPos - 1 >= 0: new_vis[self.InitPos - 1] += 1
-        if self.InitPos  < len(new_vis): new_vis[self.InitPos] += 1
-        chr.visual = new_vis
+        translocated = chr.visual.slice(self.InitPos, self.InitPos + self.Length)
+        translocated = translocated.increment(0, translocated.length)
+        new_vis = chr.visual.delete(self.InitPos, self.InitPos + self.Length)
+        new_vis = new_vis.insert(self.FinalPos, translocated)
+        chr.visual = new_vis.increment(self.InitPos - 1, self.InitPos + 1)
     
-    def reconstruct(self, node: Node):
+    def reconstruct(self, node: Node, rng = None):
         """
         Reconstruction of the DNA sequence involved in the current Translocation, in the considered
         cell. It takes the old sequence, and modifies it in order to add the Translocation.
@@ -53,11 +57,10 @@ class Translocation(Rearrangement):
         Parameters
         ----------
             node (Node): node containing the involved cell.
+            rng (np.random.Generator): random generator of the node (not used).
         """
-        chrID, init_pos, end_pos, final_pos = self.ChrID, self.InitPos, self.InitPos + self.Length, self.FinalPos
-        transl_seq = node.data.DNA.CHRs[chrID - 1].sequence[init_pos : end_pos]
-        node.data.DNA.CHRs[chrID - 1].sequence = node.data.DNA.CHRs[chrID - 1].sequence[ : init_pos] +  node.data.DNA.CHRs[chrID - 1].sequence[end_pos : ]
-        node.data.DNA.CHRs[chrID - 1].sequence = node.data.DNA.CHRs[chrID - 1].sequence[ : final_pos] + transl_seq + node.data.DNA.CHRs[chrID - 1].sequence[final_pos : ]
+        chr = node.data.DNA.CHRs[self.ChrID - 1]
+        chr.sequence = chr.sequence.cut_paste(self.InitPos, self.InitPos + self.Length, self.FinalPos)
 
     def __init__(self, ChrID :int, InitPos :int, Length :int, FinalPos :int, cell = None):
         """
@@ -74,7 +77,6 @@ class Translocation(Rearrangement):
             visual (bool): True if the visualizaiton is active. False if not.
         """
         super().__init__()
-        self.SubKind = "Translocation"
         self.ChrID = ChrID
         self.InitPos = InitPos
         self.Length = Length
@@ -82,6 +84,27 @@ class Translocation(Rearrangement):
         if cell != None:
             cell.events.append(self)
     
+    def row(self):
+        """
+        Returns the columns of the event in the EventLog.
+
+        Returns
+        -------
+            row (tuple): (chr_a, chr_b, pos, length, final_pos).
+        """
+        return (self.ChrID, 0, self.InitPos, self.Length, self.FinalPos)
+
+    @classmethod
+    def from_row(cls, chr_a, chr_b, pos, length, final_pos):
+        """
+        Builds the event from its columns in the EventLog, without adding it to any cell.
+
+        Parameters
+        ----------
+            chr_a (int), chr_b (int), pos (int), length (int), final_pos (int): columns of the event.
+        """
+        return cls(chr_a, pos, length, final_pos)
+
     def __repr__(self):
         return f"Event->{self.kind}->{self.SubKind}(ChrId: {self.ChrID!r}, InitPos: {self.InitPos!r}, Length: {self.Length!r}, FinalPos: {self.FinalPos!r})"
 
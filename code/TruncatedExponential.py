@@ -0,0 +1,50 @@
+import math
+import numpy as np
+from LengthDistribution import LengthDistribution
+
+
+class TruncatedExponential(LengthDistribution):
+    """
+    Exponential distribution with average value 'tau', truncated between 'low' and 'high'. The
+    lengths are the integer part of the continuous values: it is the distribution of
+    'Utility.int_trunc_exp'.
+
+    Attributes
+    ----------
+    tau : float
+        Average value of the (not truncated) distribution.
+    low : int
+        Usual left extreme of the domain, for which 'exp(-low/tau)' is precomputed. (default: 1)
+    """
+    __slots__ = ("tau", "low", "_exp_low")
+
+    def __init__(self, tau: float, low = 1):
+        """
+        It initializes the parameters and precomputes the constant 'exp(-low/tau)'.
+
+        Parameters
+        ----------
+            tau (float): average value.
+            low (int): usual left extreme of the domain. (default: 1)
+        """
+        self.tau = tau
+        self.low = low
+        self._exp_low = math.exp(-low / tau)
+
+    def ppf(self, u, low, high):
+        exp_low = self._exp_low if np.isscalar(low) and low == self.low else np.exp(-low / self.tau)
+        values = - self.tau * np.log(exp_low * (1 - u) + u * np.exp(-high / self.tau))
+        return values.astype(np.int64)
+
+    def scalar_ppf(self, u: float, low: int, high: int):
+        exp_low = self._exp_low if low == self.low else math.exp(-low / self.tau)
+        return int(- self.tau * math.log(exp_low * (1 - u) + u * math.exp(-high / self.tau)))
+
+    def __getstate__(self):
+        return (self.tau, self.low)
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    def __repr__(self):
+        return f"TruncatedExponential(tau: {self.tau!r})"
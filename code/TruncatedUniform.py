@@ -0,0 +1,19 @@
+import numpy as np
+from LengthDistribution import LengthDistribution
+
+
+class TruncatedUniform(LengthDistribution):
+    """
+    Discrete uniform distribution between 'low' (included) and 'high' (excluded): it is the
+    distribution of 'Utility.int_trunc_uniform'.
+    """
+    __slots__ = ()
+
+    def ppf(self, u, low, high):
+        return (low + np.floor(u * (np.asarray(high) - low))).astype(np.int64)
+
+    def scalar_ppf(self, u: float, low: int, high: int):
+        return low + int(u * (high - low))
+
+    def __repr__(self):
+        return "TruncatedUniform()"
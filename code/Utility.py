@@ -1,5 +1,10 @@
-import subprocess
+import os
 import numpy as np
+from PackedBases import PackedBases
+from ReferenceGenome import ReferenceGenome
+from Instrumentation import Instrumentation
+from TruncatedExponential import TruncatedExponential
+from EmpiricalLength import EmpiricalLength
 
 
 
@@ -7,41 +12,29 @@ class Utility:
     """
     This 'Utility' class contains all the useful function that can be used inside and outside the 
     'Simulator' class. It contains: 
-    - some methods to communicate with the MacOS zsh in order to test the RAM usage;
+    - some methods to measure the RAM usage;
     - some probability distribution methods useful to extract the number of events happening in one
         DNA duplication, or the length of the rearrangement;
     - some methods to randomly initialize the WT chromosomes and their sequence.
-    
-    Attributes
-    ----------
-        output : str
-            It contains the output of the command 'top' of the MacOS zsh which monitors the activity 
-            of all the active processes.
-
-    Methods that communicate with zsh for RAM usage
-    -----------------------------------------------
+
+    Methods for RAM usage
+    ---------------------
         get_pid(self)
             It returns the process ID <pid> of the current python process. 
-        get_output(self)
-            It returns the output of the 'top' command as a string.
-        multiplier(self, num: str, lit :str)
-            It transfoms the output of the memory usage from the different units (Kb, Mb, Gb) into
-            bytes.
         mem_count(self)
-            Calls the method 'get_output'. Then it elaborates the output to compute the memory used
-            by the python process, and the total amount of used RAM.
+            It computes the memory used by the python process, and the total amount of used RAM.
 
     Probability distributions methods
     ---------------------------------
-    int_trunc_exp(a :int, b :int) -> int
+    int_trunc_exp(tau: float)
         It extracts the length of the rearrangement (integer number) from an exponential 
         distribution truncated between "a" and "b".
-    int_trunc_uniform(tau: float)
+    empirical_length(file_name: str)
+        It reads an empirical distribution of the rearrangement lengths from a file.
+    int_trunc_uniform(a :int, b :int, rng = None) -> int
         It extracts the length of the rearrangement (integer number) from a uniform distribution 
         truncated between "a" and "b".
-    trunc_exp(a :int, b :int) -> int
-        Receives the parameter 'tau' and then actually draws the rearrangement length.
-    poisson_events_number(n_ave: int) -> int
+    poisson_events_number(n_ave: int, rng = None) -> int
         It extracts the number of events in one cell duplication (integer number) from the Poisson 
         distribution with average "n_ave".
 
@@ -51,21 +44,25 @@ class Utility:
         It creates a DNA sequence of random bases of length 'n_bases'.
     reference_seq_builder(self, n_chromosomes: int, chromosome_lengths) -> list
         It creates a random DNA sequence of the respective length for each of the chromosomes.
-    random_seq_initializer(chromosome_lengths: list)
+    random_seq_initializer(chromosome_lengths: list, packed = False)
         Given an array containing the lenghts of the chromosomes and the number of chromosomes, it
         creates a 'chromosome_table' with random sequences.
     A_seq_initializer(chromosome_lengths :list)
         Given an array containing the lenghts of the chromosomes and the number of chromosomes, it
         creates a 'chromosome_table' with sequences completely composed by the base 'A'.
     
+    pack_chromosome_table(chromosome_table: list) -> list
+        Returns a copy of 'chromosome_table' in which the sequences are stored with 2 bits per base.
+    
     Methods to Read Chromosome Table from File
     ------------------------------------------
-    read_file(): -> list
-        Reads the parameter 'chromosome_table' from a file: chromosome_table.txt. 
-        In this file each line contains the sequence of the corrsponding chromosome in order from 
-        chromosome 1 to the last one.
+    write_fasta(file_name: str, cell: Cell)
+        Writes the reconstructed chromosome sequences of 'cell' in a FASTA file.
+    read_file(file_name = "../code/chromosome_list.txt", packed = False): -> list
+        Reads the parameter 'chromosome_table' from a file: chromosome_table.txt (each line contains
+        the sequence of the corrsponding chromosome in order from chromosome 1 to the last one) or
+        a FASTA file, optionally gzip compressed.
     """
-    output = []
 
     def get_pid(self):
         """
@@ -73,63 +70,24 @@ class Utility:
 
         Returns
         -------
-            pid (int): process ID of the python3.8 process.
-        """
-        cmd = "ps -A|grep 'python3.8'"
-        output = subprocess.Popen(cmd,shell=True,stdout=subprocess.PIPE,stderr=subprocess.STDOUT).communicate()[0]
-        dirty_pid = str(output).split('\n')[0].split()[0]
-        pid = dirty_pid[2:]
-        return pid
-
-    def get_output(self):
-        """
-        It returns the output of the 'top' command as a string.
-
-        Returns
-        -------
-            self.output (str): splitted output of the command 'top' of the MacOS zsh.
-        """
-        self.output = subprocess.Popen(["top", "-stats", "pid, command, rsize","-l 1"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True).communicate()[0]
-        return self.output.split("\n")
-
-    def multiplier(self, num: str, unit :str):
+            pid (int): process ID of the python process.
         """
-        It transfoms the output of the memory usage from the different units (Kb, Mb, Gb) into
-        bytes. The original format is: 'number' 'unit'. Where 'number' is an integer while 'unit'
-        could be: 'K' (Kb), 'M' (Mb), 'G' (Gb).
-
-        Parameters
-        ----------
-            num (str): is the number of Kb, Mb or Gb used by the process.
-            unit (str): is the unit 'K','M', or 'G' which respectively are Kb, Mb and Gb.
-
-        Returns
-        -------
-            It returns the product between the 'number' and the respective of 1 unit in bytes.
-        """
-        if unit == 'K': return float(num) * 1024
-        elif unit == 'M': return float(num) * 1048576
-        elif unit == 'G': return float(num) * 1073741824
-        else: return 0
+        return os.getpid()
 
     def mem_count(self):
         """
-        Calls the method 'get_output'. Then it elaborates the output to compute the memory used
-        by the python process, and the total amount of used RAM.
+        It computes the memory used by the python process, and the total amount of used RAM (see
+        Instrumentation, which measures the memory of the phases of a simulation).
         
         Returns
         -------
-            tot_mem (float): total RAM usage in Mb.
-            py_mem (float): RAM used by the process 'python3.8' in Mb.
+            tot_mem (float): total RAM usage in Mb (Linux only, None elsewhere).
+            py_mem (float): RAM used by the python process in Mb. Without '/proc' (e.g. on macOS)
+                            it is the peak RAM of the process (None if it is not available).
         """
-        self.output = self.get_output()
-        tot_mem, py_mem = 0.0, 0.0
-        for raw in self.output[12:-1]:
-            raw_splitted = raw.split()
-            num, lit = raw_splitted[2][:-1], raw_splitted[2][-1]
-            if raw_splitted[1] == 'python3.8': py_mem += self.multiplier(num, lit)/ 1048576
-            tot_mem += self.multiplier(num, lit)
-        tot_mem /= 1048576 
+        tot_mem, py_mem = Instrumentation.used_memory(), Instrumentation.rss()
+        if tot_mem is not None: tot_mem /= 1048576
+        if py_mem is not None: py_mem /= 1048576
         return tot_mem, py_mem
 
     @staticmethod
@@ -138,41 +96,37 @@ class Utility:
         It extracts the length of the rearrangement (integer number) from an exponential distribution
         truncated between "a" and "b", with average value "tau".
 
-        Inner Functions:
-        ---------------
-            trunc_exp(a :int, b :int) -> int
-
         Parameters
         ----------
             tau (float): average value
 
         Returns
         -------
-            trunc_exp (Method): calls the function trunc_exp() that receives the parameter tau.
+            trunc_exp (TruncatedExponential): distribution object. It can be called as a function
+                                              of 'a', 'b' and 'rng', and it draws many lengths at
+                                              once with 'sample'.
+        """
+        return TruncatedExponential(tau)
 
-        Raises
-        ------
-            Exception
-                If 'a' or 'b' are negative.
+    @staticmethod
+    def empirical_length(file_name: str):
         """
-        def trunc_exp(a :int, b :int):
-            """
-            Receives the parameter 'tau' and then actually draws the rearrangement length.
+        Reads an empirical distribution of the rearrangement lengths (e.g. a measured spectrum of
+        structural variant lengths) from a file, with one length (and optionally its weight) per
+        line.
 
-            Parameters
-            ----------
-            a (int): left extreme of the distribution domain.
-            b (int): right extreme of the distribution domain.
+        Parameters
+        ----------
+            file_name (str): path of the file.
 
-            """
-            if a <= 0 or b <= 0: raise Exception(f"a<=0 or b<=0. They must be positive")
-            u = np.random.rand()
-            rands = - tau * np.log(np.exp(-a/tau)*(1 - u) + u * np.exp(-b/tau))
-            return int(rands)
-        return trunc_exp
+        Returns
+        -------
+            distribution (EmpiricalLength): distribution object.
+        """
+        return EmpiricalLength.from_file(file_name)
 
     @staticmethod
-    def int_trunc_uniform(a :int, b :int):
+    def int_trunc_uniform(a :int, b :int, rng = None):
         """
         It extracts the length of the rearrangement (integer number) from a uniform distribution 
         truncated between "a" and "b".
@@ -181,6 +135,7 @@ class Utility:
         ----------
             a (int): left extreme of the distribution domain.
             b (int): right extreme of the distribution domain.
+            rng (np.random.Generator): random generator. (default: None, a new generator)
 
         Returns
         -------
@@ -192,11 +147,12 @@ class Utility:
                 If 'a' or 'b' are negative.
         """
         if a <= 0 or b <= 0: raise Exception(f"a<=0 or b<=0. They must be positive")
-        rands = np.random.randint(a, b)
+        if rng is None: rng = np.random.default_rng()
+        rands = rng.integers(a, b)
         return rands
 
     @staticmethod
-    def poisson_events_number(n_ave: int):
+    def poisson_events_number(n_ave: int, rng = None):
         """
         It extracts the number of events in one cell duplicaiton (integer number) from the Poisson 
         distribution with average "n_ave".
@@ -204,12 +160,14 @@ class Utility:
         Parameters
         ----------
             n_ave (int): average number of events in one cell duplication.
+            rng (np.random.Generator): random generator. (default: None, a new generator)
 
         Returns
         -------
             n_events (int): extracted number of events.
         """
-        n_events = np.random.poisson(n_ave)
+        if rng is None: rng = np.random.default_rng()
+        n_events = rng.poisson(n_ave)
         return n_events
 
     @staticmethod
@@ -255,7 +213,7 @@ class Utility:
         reference_seqs = [Utility.random_sequence(chromosome_lengths[n]) for n in range(n_chromosomes)]
         return reference_seqs
 
-    def random_seq_initializer(chromosome_lengths: list):
+    def random_seq_initializer(chromosome_lengths: list, packed = False):
         """
         Given an array containing the lenghts of the chromosomes and the number of chromosomes, it
         creates a 'chromosome_table' with random sequences.
@@ -263,6 +221,8 @@ class Utility:
         Parameters
         ----------
             chromosome_lengths: list containing the lengths of the chromosomes.
+            packed (bool): if True the sequences are stored with 2 bits per base (PackedBases).
+                           (default: False)
 
         Returns
         -------
@@ -274,6 +234,7 @@ class Utility:
         id = 1
         for id in range(1, n_chr + 1):
             chromosome_table.append((id, Utility.random_sequence(chromosome_lengths[id - 1])))
+        if packed: return Utility.pack_chromosome_table(chromosome_table)
         return chromosome_table
         
     def A_seq_initializer(chromosome_lengths: list):
@@ -297,17 +258,51 @@ class Utility:
             chromosome_table.append((id, "A"*chromosome_lengths[id - 1]))
         return chromosome_table
 
-    def read_file():
+    def pack_chromosome_table(chromosome_table: list):
         """
-        Reads the parameter 'chromosome_table' from a file: chromosome_table.txt. 
-        In this file each line contains the sequence of the corrsponding chromosome in order from 
-        chromosome 1 to the last one.
+        Returns a copy of 'chromosome_table' in which the sequences are stored with 2 bits per base
+        (see PackedBases), i.e. with a quarter of the memory of the strings.
+
+        Parameters
+        ----------
+            chromosome_table (list): list of tuple. Each tuple contains the chromosome ID and its
+                                     sequence.
+
+        Returns
+        -------
+            chromosome_table (list): list of tuple. Each tuple contains the chromosome ID and its
+                                     packed sequence.
         """
-        f = open("../code/chromosome_list.txt", "r")
-        chromosome_table = []
-        ID = 0
-        for line in f:
-            ID += 1
-            line = line.rstrip()
-            chromosome_table.append(tuple([ID, line]))
-        return chromosome_table
\ No newline at end of file
+        return [(ID, seq if isinstance(seq, PackedBases) else PackedBases(seq)) \
+                for ID, seq in chromosome_table]
+
+    def write_fasta(file_name: str, cell):
+        """
+        Writes the reconstructed chromosome sequences of 'cell' in a FASTA file: one record per
+        chromosome, with header '>chr<ID>' (also for the chromosomes completely deleted).
+
+        Parameters
+        ----------
+            file_name (str): path of the file.
+            cell (Cell): cell whose sequences have been reconstructed.
+        """
+        with open(file_name, "w") as f:
+            for chr in cell.DNA.CHRs:
+                f.write(f">chr{chr.ID}\n")
+                f.write(str(chr.sequence))
+                f.write("\n")
+
+    def read_file(file_name = "../code/chromosome_list.txt", packed = False):
+        """
+        Reads the parameter 'chromosome_table' from a file (by default chromosome_list.txt), in
+        which each line contains the sequence of the corrsponding chromosome in order from 
+        chromosome 1 to the last one, or from a FASTA file (optionally gzip compressed). The file is
+        memory-mapped by a ReferenceGenome: the sequences are read from the disk only when needed.
+
+        Parameters
+        ----------
+            file_name (str): path of the file. (default: "../code/chromosome_list.txt")
+            packed (bool): if True each sequence is encoded with 2 bits per base as soon as it is
+                           read (PackedBases). (default: False)
+        """
+        return ReferenceGenome(file_name).chromosome_table(packed)
\ No newline at end of file
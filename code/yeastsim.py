@@ -0,0 +1,515 @@
+"""
+Command-line entry point of the simulator, for the runs which are too long for a notebook (e.g.
+batch jobs). Each stage reads and writes a run directory, so that the stages can be run in
+different processes (or on different machines), interrupted and resumed:
+    simulate: simulates the tree with the parameters of a configuration file and saves it in the
+              checkpoint 'tree.ckpt' (see Checkpoint), with the settings ('run.json') and the
+              statistics of the leaves ('stats.json'). Run again with the same configuration it
+              does nothing.
+    reconstruct: reconstructs the leaves (all of them, a sample or the given paths) and writes
+                 each one, as soon as it is ready, in the FASTA file 'leaves/leaf_<path>.fa'.
+                 The leaves done are listed in 'leaves/manifest.txt': an interrupted run is
+                 resumed from the missing leaves. With '--stdout' the FASTA records are written
+                 on the standard output instead.
+    render: draws the cumulated mutations of the given leaves (see 'Simulator.visualize') in
+            'render/leaf_<path>.png', resuming from 'render/manifest.txt' as well.
+    stats: prints (and writes in 'stats.json') the statistics of the lengths and of the events,
+           and optionally of the cumulated mutations of the population (see
+           'Simulator.population_coverage').
+The progress is reported on the standard error. 'reconstruct' prints the path of each selected
+leaf on the standard output (the ones already written first, then each one as soon as it is
+written), and 'render --paths -' reads the paths from the standard input, so that the leaves can be
+rendered while they are reconstructed.
+
+The configuration file (TOML, YAML or JSON) has the names of Parameters.py, whose values are the
+defaults of the missing ones:
+    number_of_generations, average_events_number, cumulative_list, tau: as in Parameters.py;
+    n_events_distrib: name of a method of Utility (e.g. "poisson_events_number");
+    del_len_distrib, ins_len_distrib, transl_len_distrib, rec_transl_len_distrib,
+    dupl_len_distrib: "TruncatedExponential" (with parameter 'tau'), "TruncatedUniform", or a
+        table such as {distribution = "TruncatedExponential", tau = 100} or
+        {distribution = "EmpiricalLength", file = "lengths.txt"}
+        (default: TruncatedExponential(tau), as in Parameters.py);
+    reference: file of the WT sequences (see 'Utility.read_file'). If it is not given, the WT
+        sequences are random, with lengths 'chromosome_lengths' (and 'chromosome_number', if
+        given, must be their number);
+    packed, seed, n_workers, split_generation, sampled_leaves: arguments of the Simulator
+        ('sampled_leaves' is a number of leaves or a list of paths such as "0110").
+The relative paths are relative to the directory of the configuration file.
+
+Usage
+-----
+    python -m yeastsim simulate parameters.toml --output run
+    python -m yeastsim reconstruct run --workers 8
+    python -m yeastsim reconstruct run --sample 10 | python -m yeastsim render run --paths -
+    python -m yeastsim reconstruct run --paths 0000000 --stdout | gzip > leaf.fa.gz
+    python -m yeastsim stats run --coverage
+(from the 'code' directory, or with 'code' in PYTHONPATH).
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+try:
+    import tomllib
+except ImportError:
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+try:
+    import yaml
+except ImportError:
+    yaml = None
+import numpy as np
+import Parameters
+from ArrayTree import ArrayTree
+from Checkpoint import Checkpoint
+from EventLog import EventLog
+from Progress import Progress
+from Simulator import Simulator
+from Utility import Utility
+from TruncatedExponential import TruncatedExponential
+from TruncatedUniform import TruncatedUniform
+from EmpiricalLength import EmpiricalLength
+
+CHECKPOINT, RUN, STATS = "tree.ckpt", "run.json", "stats.json"
+LEAVES, RENDER, MANIFEST = "leaves", "render", "manifest.txt"
+
+DISTRIBUTIONS = ("del_len_distrib", "ins_len_distrib", "transl_len_distrib", \
+                 "rec_transl_len_distrib", "dupl_len_distrib")
+# keys of the configuration file, and their defaults
+SETTINGS = {"number_of_generations": Parameters.number_of_generations, \
+            "average_events_number": Parameters.average_events_number, \
+            "cumulative_list": list(Parameters.cumulative_list), \
+            "n_events_distrib": Parameters.n_events_distrib.__name__, \
+            "tau": Parameters.tau, \
+            **{name: "TruncatedExponential" for name in DISTRIBUTIONS}, \
+            "chromosome_lengths": list(Parameters.chromosome_lengths), \
+            "chromosome_number": None, "reference": None, "packed": False, "seed": None, \
+            "n_workers": 1, "split_generation": None, "sampled_leaves": None}
+
+
+def read_config(file_name: str):
+    """
+    Reads a configuration file (TOML, YAML or JSON, by extension) and returns the settings of the
+    simulation: its values, and the defaults of the missing keys.
+
+    Raises
+    ------
+        Exception
+            If the format is not supported (or its package is not installed) or a key is unknown.
+    """
+    extension = os.path.splitext(file_name)[1].lower()
+    with open(file_name, "rb") as f:
+        if extension == ".toml":
+            if tomllib is None: raise Exception(f"Reading a TOML file needs Python 3.11 or the package 'tomli'")
+            config = tomllib.load(f)
+        elif extension in (".yaml", ".yml"):
+            if yaml is None: raise Exception(f"Reading a YAML file needs the package 'PyYAML'")
+            config = yaml.safe_load(f) or {}
+        elif extension == ".json":
+            config = json.load(f)
+        else:
+            raise Exception(f"Unknown format of the configuration file {file_name} (supported: .toml, .yaml, .yml, .json)")
+    unknown = sorted(set(config) - set(SETTINGS))
+    if unknown: raise Exception(f"Unknown parameters in {file_name}: {', '.join(unknown)}")
+    # the files are found from the directory of the configuration file
+    directory = os.path.dirname(os.path.abspath(file_name))
+    if config.get("reference") is not None:
+        config["reference"] = os.path.join(directory, config["reference"])
+    for name in DISTRIBUTIONS:
+        if isinstance(config.get(name), dict) and "file" in config[name]:
+            config[name] = dict(config[name], file=os.path.join(directory, config[name]["file"]))
+    return dict(SETTINGS, **config)
+
+
+def settings_key(settings: dict):
+    """
+    Returns the sha256 of the settings, which identifies the simulation of a run directory.
+    """
+    return hashlib.sha256(json.dumps(settings, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def length_distribution(spec, tau: float):
+    """
+    Returns the LengthDistribution described by 'spec' (name or dictionary, see the module
+    docstring).
+    """
+    if isinstance(spec, str): spec = {"distribution": spec}
+    spec = dict(spec)
+    name = spec.pop("distribution", None)
+    if name == "TruncatedExponential":
+        return TruncatedExponential(spec.get("tau", tau), spec.get("low", 1))
+    if name == "TruncatedUniform":
+        return TruncatedUniform()
+    if name == "EmpiricalLength":
+        return EmpiricalLength.from_file(spec["file"])
+    raise Exception(f"Unknown length distribution {name!r} (available: TruncatedExponential, TruncatedUniform, EmpiricalLength)")
+
+
+def chromosome_table(settings: dict, seed: int):
+    """
+    Returns the WT sequences of the settings: read from 'reference', or random (drawn from
+    'seed').
+    """
+    if settings["reference"] is not None:
+        return Utility.read_file(settings["reference"], settings["packed"])
+    lengths = [int(length) for length in settings["chromosome_lengths"]]
+    if settings["chromosome_number"] is not None and settings["chromosome_number"] != len(lengths):
+        raise Exception(f"chromosome_number ({settings['chromosome_number']}) different from the number of chromosome_lengths ({len(lengths)})")
+    np.random.seed(seed % 2 ** 32)
+    return Utility.random_seq_initializer(lengths, settings["packed"])
+
+
+def write_json(file_name: str, data: dict):
+    """
+    Writes a JSON file atomically.
+    """
+    with open(file_name + ".tmp", "w") as f:
+        json.dump(data, f, indent=1)
+    os.replace(file_name + ".tmp", file_name)
+
+
+def load(run: str):
+    """
+    Returns the Simulator saved in the run directory 'run'.
+    """
+    if not os.path.exists(os.path.join(run, RUN)) or not os.path.exists(os.path.join(run, CHECKPOINT)):
+        raise Exception(f"No simulation in {run}: run 'yeastsim simulate' first")
+    return Checkpoint.load(os.path.join(run, CHECKPOINT))
+
+
+def path_name(path: list):
+    return "".join(str(direction) for direction in path)
+
+
+def parse_path(text: str):
+    """
+    Returns the path (list of 0 or 1) written as a string of 0 and 1.
+    """
+    if any(c not in "01" for c in text):
+        raise Exception(f"Invalid path {text!r}: it must be a string of 0 and 1")
+    return [int(c) for c in text]
+
+
+def leaf_paths(simulator: Simulator, n_generations: int):
+    """
+    Returns the sorted paths of all the (simulated) cells of generation 'n_generations'.
+    """
+    if simulator.sampled_paths is not None:
+        return [list(path) for path in sorted({tuple(path[: n_generations]) \
+                                               for path in simulator.sampled_paths})]
+    first = 2 ** n_generations - 1
+    return [ArrayTree.path(i) for i in range(first, 2 * first + 1)]
+
+
+def select_paths(args, simulator: Simulator, n_generations: int):
+    """
+    Returns the paths selected by '--paths' (an iterator if they are read from the standard
+    input) or '--sample', or all the leaves of generation 'n_generations', and True in the
+    latter case.
+    """
+    if args.paths == ["-"]:
+        return (parse_path(token) for line in sys.stdin for token in line.split()), False
+    if args.paths:
+        return sorted(parse_path(text) for text in set(args.paths)), False
+    if args.sample is not None:
+        if simulator.sampled_paths is None:
+            return simulator.sample_paths(args.sample, n_generations), False
+        leaves = leaf_paths(simulator, n_generations)
+        chosen = np.random.default_rng(simulator.seed).choice(len(leaves), \
+                 min(args.sample, len(leaves)), replace=False)
+        return [leaves[i] for i in sorted(chosen.tolist())], False
+    return leaf_paths(simulator, n_generations), True
+
+
+def read_manifest(directory: str):
+    """
+    Returns the names of the paths listed in the manifest of 'directory' (only the complete lines:
+    a line interrupted by a crash is ignored).
+    """
+    try:
+        with open(os.path.join(directory, MANIFEST), "r") as f:
+            return set(f.read().split("\n")[: -1])
+    except OSError:
+        return set()
+
+
+def summary(simulator: Simulator, coverage = False, n_generations = None):
+    """
+    Returns the statistics of the leaves of a simulation: lengths of the genome and of each
+    chromosome, number of events of each kind on each chromosome, and (if 'coverage') average and
+    standard deviation of the cumulated mutations of the leaves of generation 'n_generations'.
+    """
+    statistics = simulator.statistics
+    mean, std = statistics.mean, statistics.std()
+    # the sketch is accurate within its relative accuracy, which may exceed the extremes
+    median = np.clip(statistics.quantile(0.5), statistics.min, statistics.max)
+    columns = [{"mean": float(mean[k]), "std": float(std[k]), "min": float(statistics.min[k]), \
+                "max": float(statistics.max[k]), "median": float(median[k])} \
+               for k in range(statistics.n_chr + 1)]
+    result = {"generations": simulator.generations, "seed": str(simulator.seed), \
+              "n_leaves": int(statistics.n), "sampled": simulator.sampled_paths is not None, \
+              "genome_length": columns[-1], \
+              "chromosome_length": {str(ID): column for ID, column in enumerate(columns[: -1], start=1)}, \
+              "event_counts": {event_type.__name__: statistics.event_counts[:, type_code].tolist() \
+                               for type_code, event_type in enumerate(EventLog.TYPES)}}
+    if coverage:
+        if n_generations is None: n_generations = simulator.generations
+        population = simulator.population_coverage(n_generations)
+        result["cumulated_mutations"] = [float(x) for x in population.stat_cumulated_mutations()]
+        result["max_cumulated_mutations"] = [float(x) for x in \
+                                             population.stat_max_cumulated_mutations()]
+    return result
+
+
+def simulate(args):
+    """
+    'simulate' stage: simulates the tree of the configuration file and saves it in the run
+    directory.
+    """
+    settings = read_config(args.config)
+    key = settings_key(settings)
+    run_file = os.path.join(args.output, RUN)
+    if os.path.exists(run_file) and not args.force:
+        with open(run_file, "r") as f:
+            previous = json.load(f)
+        if previous["key"] != key:
+            raise Exception(f"{args.output} contains a simulation with different parameters: use another directory or --force")
+        if os.path.exists(os.path.join(args.output, CHECKPOINT)):
+            print(f"{args.output} already contains this simulation (use --force to simulate it again)", \
+                  file=sys.stderr)
+            return 0
+    os.makedirs(args.output, exist_ok=True)
+    # the outputs of a previous simulation are not valid anymore
+    if os.path.exists(run_file): os.remove(run_file)
+    for directory in (LEAVES, RENDER):
+        shutil.rmtree(os.path.join(args.output, directory), ignore_errors=True)
+
+    seed = settings["seed"]
+    if seed is None: seed = int(np.random.SeedSequence().entropy)
+    sampled_leaves = settings["sampled_leaves"]
+    if isinstance(sampled_leaves, list):
+        sampled_leaves = [parse_path(path) if isinstance(path, str) else path for path in sampled_leaves]
+    n_events_distrib = getattr(Utility, settings["n_events_distrib"], None)
+    if not callable(n_events_distrib):
+        raise Exception(f"Unknown n_events_distrib {settings['n_events_distrib']!r}: it must be a method of Utility")
+    table = chromosome_table(settings, seed)
+    if not args.quiet:
+        print(f"[simulate] {settings['number_of_generations']} generations, {len(table)} chromosomes, seed {seed}", \
+              file=sys.stderr, flush=True)
+    simulator = Simulator(table, settings["number_of_generations"], \
+                          settings["average_events_number"], settings["cumulative_list"], \
+                          n_events_distrib, \
+                          *(length_distribution(settings[name], settings["tau"]) for name in DISTRIBUTIONS), \
+                          seed=seed, n_workers=settings["n_workers"], \
+                          split_generation=settings["split_generation"], keep_leaves=False, \
+                          sampled_leaves=sampled_leaves)
+    with simulator.instrumentation.phase("output"):
+        checkpoint = os.path.join(args.output, CHECKPOINT)
+        Checkpoint.save(simulator, checkpoint + ".tmp")
+        os.replace(checkpoint + ".tmp", checkpoint)
+        write_json(os.path.join(args.output, STATS), summary(simulator))
+    write_json(run_file, {"key": key, "settings": settings, "seed": str(seed), \
+                          "performance": simulator.performance_report()})
+    if not args.quiet:
+        print(simulator.instrumentation, file=sys.stderr)
+        print(f"[simulate] {simulator.statistics.n} leaves, {simulator.tree.log.size} events, saved in {args.output}", \
+              file=sys.stderr)
+    return 0
+
+
+def reconstruct(args):
+    """
+    'reconstruct' stage: reconstructs the selected leaves, writing each one as soon as it is
+    ready, and skipping the leaves already written by a previous run. The path of every selected
+    leaf is printed on the standard output: first the ones already written, then the others as
+    soon as they are ready.
+    """
+    simulator = load(args.run)
+    n_generations = simulator.generations if args.generations is None else args.generations
+    paths, complete = select_paths(args, simulator, n_generations)
+    paths = sorted(paths) if not complete else paths
+    parallel = complete and args.workers > 1 and simulator.sampled_paths is None
+
+    if args.stdout:
+        progress = Progress("reconstruct", len(paths), quiet=args.quiet)
+        if parallel:
+            leaves = simulator.parallel_reconstruction(n_generations, args.split_generation, args.workers)
+        elif complete:
+            leaves = ((path, [chr.sequence for chr in cell.DNA.CHRs]) \
+                      for path, cell in simulator.iter_reconstructed_leaves(n_generations))
+        else:
+            leaves = ((path, [chr.sequence for chr in cell.DNA.CHRs]) \
+                      for path, cell in simulator.batch_path_reconstructor(paths, args.cache_mb * 2 ** 20))
+        for path, sequences in leaves:
+            name = path_name(path)
+            for ID, sequence in enumerate(sequences, start=1):
+                sys.stdout.write(f">leaf_{name}_chr{ID}\n{sequence}\n")
+            sys.stdout.flush()
+            progress.update()
+        progress.close()
+        return 0
+
+    directory = os.path.join(args.run, LEAVES)
+    os.makedirs(directory, exist_ok=True)
+    done = read_manifest(directory)
+    missing = [path for path in paths if path_name(path) not in done]
+    progress = Progress("reconstruct", len(paths), len(paths) - len(missing), quiet=args.quiet)
+    # the leaves written by a previous run are printed too, so that 'render --paths -' gets them
+    for path in paths:
+        if path_name(path) in done: print(path_name(path), flush=True)
+    with open(os.path.join(directory, MANIFEST), "a") as manifest:
+        def record(path):
+            manifest.write(path_name(path) + "\n")
+            manifest.flush()
+            print(path_name(path), flush=True)
+            progress.update()
+
+        resumed = len(missing) < len(paths)
+        if parallel and not resumed:
+            for path, file_name in simulator.parallel_reconstruction(n_generations, \
+                    args.split_generation, args.workers, directory):
+                record(path)
+        elif missing:
+            if parallel: print(f"[reconstruct] the missing leaves are reconstructed in a single process", \
+                               file=sys.stderr)
+            if complete and not resumed:
+                leaves = simulator.iter_reconstructed_leaves(n_generations)
+            else:
+                leaves = simulator.batch_path_reconstructor(missing, args.cache_mb * 2 ** 20)
+            for path, cell in leaves:
+                file_name = os.path.join(directory, f"leaf_{path_name(path)}.fa")
+                Utility.write_fasta(file_name + ".tmp", cell)
+                os.replace(file_name + ".tmp", file_name)
+                record(path)
+    progress.close()
+    return 0
+
+
+def render(args):
+    """
+    'render' stage: draws the cumulated mutations of the selected leaves, skipping the leaves
+    already drawn by a previous run.
+    """
+    # matplotlib is imported only by this stage, and draws without a display
+    import logging
+    import matplotlib
+    matplotlib.use("Agg")
+    logging.getLogger("matplotlib.font_manager").setLevel(logging.ERROR)
+    simulator = load(args.run)
+    paths, _ = select_paths(args, simulator, simulator.generations)
+    directory = os.path.join(args.run, RENDER)
+    os.makedirs(directory, exist_ok=True)
+    done = read_manifest(directory)
+    progress = Progress("render", len(paths) if isinstance(paths, list) else None, quiet=args.quiet)
+    with open(os.path.join(directory, MANIFEST), "a") as manifest:
+        for path in paths:
+            name = path_name(path)
+            if name not in done:
+                node = simulator.path_visualization(path)
+                figure = simulator.visualize(node.data)
+                file_name = os.path.join(directory, f"leaf_{name}.{args.format}")
+                figure.savefig(file_name + ".tmp", format=args.format, dpi=args.dpi)
+                os.replace(file_name + ".tmp", file_name)
+                simulator.tree.release(node.index)
+                manifest.write(name + "\n")
+                manifest.flush()
+                done.add(name)
+            progress.update()
+    progress.close()
+    return 0
+
+
+def stats(args):
+    """
+    'stats' stage: prints the statistics of the simulation and writes them in 'stats.json'.
+    """
+    simulator = load(args.run)
+    result = summary(simulator, args.coverage, args.generations)
+    write_json(os.path.join(args.run, STATS), result)
+    if args.json:
+        print(json.dumps(result, indent=1))
+        return 0
+    print(f"generations: {result['generations']}   leaves: {result['n_leaves']}" + \
+          (" (sampled)" if result["sampled"] else "") + f"   seed: {result['seed']}")
+    print(f"\n{'':<12}{'mean':>14}{'std':>12}{'min':>12}{'median':>12}{'max':>12}")
+    rows = [(f"CHR {ID}", column) for ID, column in result["chromosome_length"].items()]
+    for label, column in rows + [("genome", result["genome_length"])]:
+        print(f"{label:<12}{column['mean']:>14.1f}{column['std']:>12.1f}{column['min']:>12.0f}" + \
+              f"{column['median']:>12.0f}{column['max']:>12.0f}")
+    print(f"\n{'event':<26}{'count':>10}")
+    for name, counts in result["event_counts"].items():
+        print(f"{name:<26}{sum(counts):>10}")
+    if args.coverage:
+        print(f"\ncumulated mutations: {result['cumulated_mutations'][0]:.4f} +- {result['cumulated_mutations'][1]:.4f}")
+        print(f"max cumulated mutations: {result['max_cumulated_mutations'][0]:.4f} +- {result['max_cumulated_mutations'][1]:.4f}")
+    return 0
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog="yeastsim", description="Yeast cascade mutation simulator.")
+    parser.add_argument("--quiet", action="store_true", help="do not report the progress")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    parser_simulate = subparsers.add_parser("simulate", help="simulate the tree and save it")
+    parser_simulate.add_argument("config", help="configuration file (.toml, .yaml or .json)")
+    parser_simulate.add_argument("--output", "-o", default="run", help="run directory (default: run)")
+    parser_simulate.add_argument("--force", action="store_true", \
+                                 help="simulate again, removing the outputs in the run directory")
+    parser_simulate.set_defaults(function=simulate)
+
+    def add_selection(subparser, required = False):
+        group = subparser.add_mutually_exclusive_group(required=required)
+        group.add_argument("--paths", nargs="+", \
+                           help="paths of the leaves (e.g. 0110), or - to read them from the standard input")
+        group.add_argument("--sample", type=int, help="number of leaves drawn at random")
+
+    parser_reconstruct = subparsers.add_parser("reconstruct", help="reconstruct the leaves")
+    parser_reconstruct.add_argument("run", help="run directory")
+    add_selection(parser_reconstruct)
+    parser_reconstruct.add_argument("--generations", type=int, default=None, \
+                                    help="generation of the leaves (default: the simulated ones)")
+    parser_reconstruct.add_argument("--workers", type=int, default=1, \
+                                    help="processes reconstructing all the leaves (default: 1)")
+    parser_reconstruct.add_argument("--split-generation", type=int, default=None, \
+                                    help="generation of the subtrees reconstructed in parallel (default: 6)")
+    parser_reconstruct.add_argument("--cache-mb", type=int, default=256, \
+                                    help="memory of the ancestor genomes cache, in MB (default: 256)")
+    parser_reconstruct.add_argument("--stdout", action="store_true", \
+                                    help="write the FASTA records on the standard output instead of the run directory")
+    parser_reconstruct.set_defaults(function=reconstruct)
+
+    parser_render = subparsers.add_parser("render", help="draw the cumulated mutations of leaves")
+    parser_render.add_argument("run", help="run directory")
+    add_selection(parser_render, required=True)
+    parser_render.add_argument("--format", default="png", help="format of the images (default: png)")
+    parser_render.add_argument("--dpi", type=int, default=100, help="resolution of the images (default: 100)")
+    parser_render.set_defaults(function=render)
+
+    parser_stats = subparsers.add_parser("stats", help="print the statistics of the simulation")
+    parser_stats.add_argument("run", help="run directory")
+    parser_stats.add_argument("--coverage", action="store_true", \
+                              help="compute the cumulated mutations of the population")
+    parser_stats.add_argument("--generations", type=int, default=None, \
+                              help="generation of the leaves of '--coverage' (default: the simulated ones)")
+    parser_stats.add_argument("--json", action="store_true", help="print the statistics as JSON")
+    parser_stats.set_defaults(function=stats)
+
+    args = parser.parse_args(argv)
+    try:
+        return args.function(args)
+    except BrokenPipeError:
+        # the reader of the standard output (e.g. 'head') exited: nothing else can be written
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    except Exception as error:
+        print(f"yeastsim {args.command}: {error}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
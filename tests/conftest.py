@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the modules of the simulator are imported as in the notebooks, from the 'code' directory
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "code"))
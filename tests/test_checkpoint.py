@@ -0,0 +1,69 @@
+"""
+A simulation saved with Checkpoint.save and read with Checkpoint.load must give the same tree,
+statistics and reconstructed leaves of the original one.
+"""
+import numpy as np
+import pytest
+
+from Checkpoint import Checkpoint
+from PackedBases import PackedBases
+from Simulator import Simulator
+from Utility import Utility
+
+N_GENERATIONS = 5
+# all the kinds of event, with the same probability
+CUMULATIVE = [1 / 8, 2 / 8, 3 / 8, 4 / 8, 5 / 8, 6 / 8, 7 / 8, 1.]
+
+
+def chromosome_table(kind, tmp_path):
+    np.random.seed(3)
+    table = Utility.random_seq_initializer([3000, 2500, 1800, 4000])
+    if kind == "packed":
+        return Utility.pack_chromosome_table(table)
+    if kind == "fasta":
+        # memory-mapped views on a FASTA file (BufferBases)
+        path = tmp_path / "genome.fa"
+        path.write_text("".join(f">chr{ID}\n{seq}\n" for ID, seq in table))
+        return Utility.read_file(str(path))
+    return table
+
+
+def leaves(simulator):
+    return [(path, [str(chr.sequence) for chr in cell.DNA.CHRs]) \
+            for path, cell in simulator.iter_reconstructed_leaves(N_GENERATIONS)]
+
+
+@pytest.mark.parametrize("mmap", [True, False], ids=["mmap", "read"])
+@pytest.mark.parametrize("sampled_leaves", [None, 6], ids=["full", "sparse"])
+@pytest.mark.parametrize("kind", ["str", "packed", "fasta"])
+def test_round_trip(tmp_path, kind, sampled_leaves, mmap):
+    simulator = Simulator(chromosome_table(kind, tmp_path), N_GENERATIONS, 3, CUMULATIVE, seed=9, \
+                          sampled_leaves=sampled_leaves)
+    file_name = str(tmp_path / "tree.ckpt")
+    Checkpoint.save(simulator, file_name)
+    loaded = Checkpoint.load(file_name, mmap=mmap)
+
+    assert type(loaded.tree) is type(simulator.tree)
+    assert loaded.seed == simulator.seed and loaded.sampled_paths == simulator.sampled_paths
+    assert [str(seq) for ID, seq in loaded.chromosome_table] == \
+           [str(seq) for ID, seq in simulator.chromosome_table]
+    assert all(isinstance(seq, PackedBases) == (kind == "packed") \
+               for ID, seq in loaded.chromosome_table)
+    tree, expected_tree = loaded.tree, simulator.tree
+    # a SparseTree allocates more rows than its nodes
+    nodes = sorted(expected_tree.rows) if sampled_leaves else range(expected_tree.n_nodes)
+    assert tree.n_nodes == expected_tree.n_nodes
+    for i in nodes:
+        assert np.array_equal(tree.lengths[tree.row(i)], expected_tree.lengths[expected_tree.row(i)])
+        assert [str(event) for event in tree.events(i)] == \
+               [str(event) for event in expected_tree.events(i)]
+    assert np.array_equal(tree.log.table, expected_tree.log.table)
+
+    statistics, expected = loaded.statistics, simulator.statistics
+    assert statistics.n == expected.n
+    for name in ("mean", "m2", "min", "max", "event_counts"):
+        assert np.array_equal(getattr(statistics, name), getattr(expected, name))
+    assert np.array_equal(statistics.quantile(0.5), expected.quantile(0.5))
+    assert np.array_equal(loaded.chr_length_st_dev, simulator.chr_length_st_dev)
+
+    assert leaves(loaded) == leaves(simulator)
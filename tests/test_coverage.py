@@ -0,0 +1,143 @@
+"""
+The run-length encoded 'visual' arrays (Coverage) must be the same of dense NumPy arrays modified
+with the same operations, and PopulationCoverage must give the statistics of 'run_visualization'.
+"""
+import numpy as np
+import pytest
+
+from ArrayTree import ArrayTree
+from Coverage import Coverage
+from Simulator import Simulator
+from Utility import Utility
+
+N_GENERATIONS = 5
+# all the kinds of event, with the same probability
+CUMULATIVE = [1 / 8, 2 / 8, 3 / 8, 4 / 8, 5 / 8, 6 / 8, 7 / 8, 1.]
+
+
+def increment(visual, start, stop):
+    visual = visual.copy()
+    visual[max(start, 0) : max(stop, 0)] += 1
+    return visual
+
+
+def delete(visual, start, stop):
+    return np.concatenate((visual[: start], visual[stop :]))
+
+
+def insert(visual, pos, other):
+    return np.concatenate((visual[: pos], other, visual[pos :]))
+
+
+def apply(visuals, rows):
+    """
+    Applies the events of one node ('rows' of the log) to the dense arrays 'visuals', as the
+    'update_visual' methods of the events do on the Coverages.
+    """
+    visuals = list(visuals)
+    for row in rows:
+        code, chr_a, chr_b = int(row["type_code"]), int(row["chr_a"]), int(row["chr_b"])
+        pos, length, final_pos = int(row["pos"]), int(row["length"]), int(row["final_pos"])
+        visual = visuals[chr_a - 1]
+        if code in (0, 6):
+            visual = increment(delete(visual, pos, pos + length), pos - 1, pos + 1)
+        elif code in (1, 5):
+            visual = insert(visual, pos, np.ones(length, dtype=np.uint16))
+        elif code == 2:
+            moved = visual[pos : pos + length] + 1
+            visual = insert(delete(visual, pos, pos + length), final_pos, moved)
+            visual = increment(visual, pos - 1, pos + 1)
+        elif code == 3:
+            moved = visual[pos : pos + length] + 1
+            visual = increment(delete(visual, pos, pos + length), pos - 1, pos + 1)
+            visuals[chr_b - 1] = insert(visuals[chr_b - 1], final_pos, moved)
+        elif code == 4:
+            visual = insert(visual, final_pos, visual[pos : pos + length] + 1)
+        else:
+            visual = increment(visual, pos, pos + 1)
+        visuals[chr_a - 1] = visual
+    return visuals
+
+
+def dense_leaves(simulator, n_generations):
+    """
+    Returns the dense 'visual' arrays of the leaves, replaying the log node by node.
+    """
+    table = simulator.tree.log.table
+    visuals = {0: [np.zeros(length, dtype=np.uint16) \
+                   for length in simulator.tree.lengths[0].tolist()]}
+    for i in range(1, 2 ** (n_generations + 1) - 1):
+        visuals[i] = apply(visuals[(i - 1) // 2], table[table["node_id"] == i])
+    return [visuals[i] for i in range(2 ** n_generations - 1, len(visuals))]
+
+
+def simulation(ave_events_num):
+    np.random.seed(2)
+    table = Utility.random_seq_initializer([2000, 1500, 2600])
+    return Simulator(table, N_GENERATIONS, ave_events_num, CUMULATIVE, seed=7)
+
+
+def test_operations():
+    rng = np.random.default_rng(5)
+    coverage, dense = Coverage(500), np.zeros(500, dtype=np.uint16)
+    for _ in range(300):
+        start = int(rng.integers(0, len(dense) + 1))
+        stop = int(rng.integers(start, min(start + 60, len(dense)) + 1))
+        operation = int(rng.integers(4))
+        if operation == 0:
+            coverage, dense = coverage.increment(start - 1, stop), increment(dense, start - 1, stop)
+        elif operation == 1 and len(dense) > 100:
+            coverage, dense = coverage.delete(start, stop), delete(dense, start, stop)
+        elif operation == 2:
+            moved = coverage.slice(start, stop).increment(0, stop - start)
+            coverage = coverage.insert(start, moved)
+            dense = insert(dense, start, dense[start : stop] + 1)
+        else:
+            coverage = coverage.insert(start, Coverage(stop - start, 2))
+            dense = insert(dense, start, np.full(stop - start, 2, dtype=np.uint16))
+        assert len(coverage) == len(dense)
+        assert np.array_equal(coverage.to_array(), dense)
+        # two consecutive runs never have the same value
+        assert np.all(coverage.counts[1 :] != coverage.counts[: -1])
+    assert coverage.max() == dense.max()
+
+
+def test_run_visualization():
+    simulator = simulation(4)
+    assert set(simulator.tree.log.table["type_code"].tolist()) == set(range(8))
+    simulator.run_visualization(simulator.parent, N_GENERATIONS)
+    expected = dense_leaves(simulator, N_GENERATIONS)
+    assert len(simulator.leaves) == len(expected)
+    for leaf, visuals in zip(simulator.leaves, expected):
+        for chr, visual in zip(leaf.DNA.CHRs, visuals):
+            assert np.array_equal(chr.visual.to_array(), visual)
+
+
+def test_path_visualization():
+    simulator = simulation(4)
+    expected = dense_leaves(simulator, N_GENERATIONS)
+    path = [1, 0, 0, 1, 1]
+    node = simulator.path_visualization(path)
+    visuals = expected[ArrayTree.index(path) - (2 ** N_GENERATIONS - 1)]
+    for chr, visual in zip(node.data.DNA.CHRs, visuals):
+        assert np.array_equal(chr.visual.to_array(), visual)
+
+
+# with few events whole subtrees have no events, and their leaves are added at once
+@pytest.mark.parametrize("ave_events_num", [4, 0.3])
+def test_population_coverage(ave_events_num):
+    simulator = simulation(ave_events_num)
+    coverage = simulator.population_coverage(N_GENERATIONS)
+    simulator.run_visualization(simulator.parent, N_GENERATIONS)
+    assert coverage.n_leaves == len(simulator.leaves)
+    assert coverage.stat_max_cumulated_mutations() == \
+           pytest.approx(simulator.stat_max_cumulated_mutations())
+    assert coverage.stat_cumulated_mutations() == \
+           pytest.approx(simulator.stat_cumulated_mutations())
+    histogram = sum(np.bincount(chr.visual.to_array(), minlength=len(coverage.histogram)) \
+                    for leaf in simulator.leaves for chr in leaf.DNA.CHRs)
+    assert np.array_equal(coverage.histogram, histogram)
+    for ID in range(1, coverage.n_chr + 1):
+        maxima = [leaf.DNA.CHRs[ID - 1].visual.max() for leaf in simulator.leaves]
+        distribution = np.bincount(maxima, minlength=coverage.max_histogram.shape[1])
+        assert np.allclose(coverage.max_distribution(ID), distribution / len(maxima))
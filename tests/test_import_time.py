@@ -0,0 +1,27 @@
+"""
+Import-time budget of the simulator (see 'benchmarks/import_time.py'): the modules imported by
+the worker processes must not load their heavy dependencies and must stay within the budget.
+"""
+import os
+import statistics
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "benchmarks"))
+import import_time
+
+BUDGET = 0.4
+REPEAT = 3
+
+
+@pytest.mark.parametrize("module", sorted(import_time.PROBES))
+def test_import_time(module):
+    times, lazy = import_time.measure(module, REPEAT)
+    assert lazy, f"{module}: heavy dependencies loaded at import"
+    assert statistics.median(times) <= BUDGET, \
+           f"{module}: import time {statistics.median(times):.3f} s > {BUDGET} s"
+
+
+def test_main():
+    assert import_time.main(["--budget", str(BUDGET), "--repeat", "1"]) == 0
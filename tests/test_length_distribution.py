@@ -0,0 +1,32 @@
+"""
+'scalar_ppf' (pure Python, used once per event) must give the lengths of the vectorised 'ppf'.
+"""
+import numpy as np
+import pytest
+
+from EmpiricalLength import EmpiricalLength
+from LengthDistribution import LengthDistribution
+from TruncatedExponential import TruncatedExponential
+from TruncatedUniform import TruncatedUniform
+
+rng = np.random.default_rng(1)
+DISTRIBUTIONS = [TruncatedUniform(), TruncatedExponential(300), \
+                 EmpiricalLength(rng.integers(1, 5000, 200), rng.random(200)), \
+                 EmpiricalLength([10, 20, 30])]
+
+
+@pytest.mark.parametrize("distrib", DISTRIBUTIONS, ids=repr)
+def test_scalar_ppf(distrib):
+    rng = np.random.default_rng(2)
+    u = rng.random(20000)
+    low = rng.integers(1, 3, len(u))
+    high = low + rng.integers(1, 6000, len(u))
+    expected = distrib.ppf(u, low, high).tolist()
+    lengths = [distrib.scalar_ppf(*args) for args in zip(u.tolist(), low.tolist(), high.tolist())]
+    assert lengths == expected
+    assert all(type(length) is int for length in lengths)
+
+
+def test_abstract():
+    with pytest.raises(TypeError):
+        LengthDistribution()
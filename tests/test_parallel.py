@@ -0,0 +1,98 @@
+"""
+Every cell draws its events and bases from its own generator, so a parallel run must give the
+same tree, statistics and sequences of a serial run with the same seed.
+"""
+import numpy as np
+import pytest
+
+from ArrayTree import ArrayTree
+from Simulator import Simulator
+from Utility import Utility
+
+N_GENERATIONS = 6
+# all the kinds of event, with the same probability
+CUMULATIVE = [1 / 8, 2 / 8, 3 / 8, 4 / 8, 5 / 8, 6 / 8, 7 / 8, 1.]
+
+
+def simulate(**kwargs):
+    np.random.seed(3)
+    table = Utility.random_seq_initializer([3000, 2500, 1800, 4000])
+    distrib = Utility.int_trunc_exp(80)
+    return Simulator(table, N_GENERATIONS, 3, CUMULATIVE, del_len_distrib=distrib, \
+                     ins_len_distrib=distrib, transl_len_distrib=distrib, \
+                     rec_transl_len_distrib=distrib, dupl_len_distrib=distrib, seed=11, **kwargs)
+
+
+def node_rows(tree, i):
+    return tree.log.table[tree.event_start[tree.row(i)] : tree.event_stop[tree.row(i)]]
+
+
+def by_node(table):
+    # the rows of each node are consecutive, but the nodes can be in a different order
+    return table[np.argsort(table["node_id"], kind="stable")]
+
+
+def assert_same_statistics(statistics, expected):
+    assert statistics.n == expected.n
+    assert np.allclose(statistics.mean, expected.mean, rtol=1e-12, atol=0)
+    assert np.allclose(statistics.variance(), expected.variance(), rtol=1e-9, atol=0)
+    assert np.array_equal(statistics.min, expected.min)
+    assert np.array_equal(statistics.max, expected.max)
+    assert np.array_equal(statistics.event_counts, expected.event_counts)
+    assert np.allclose(statistics.quantile(0.9), expected.quantile(0.9))
+
+
+@pytest.fixture(scope="module")
+def serial():
+    return simulate()
+
+
+@pytest.fixture(scope="module")
+def leaves(serial):
+    serial.run_reconstruction(serial.parent, N_GENERATIONS)
+    first_leaf = 2 ** N_GENERATIONS - 1
+    return {tuple(ArrayTree.path(first_leaf + k)): [str(chr.sequence) for chr in leaf.DNA.CHRs] \
+            for k, leaf in enumerate(serial.leaves)}
+
+
+@pytest.mark.parametrize("split_generation, n_workers", [(0, 1), (3, 1), (3, 2), (6, 2)])
+def test_parallel_growth(serial, split_generation, n_workers):
+    parallel = simulate(n_workers=n_workers, split_generation=split_generation)
+    assert np.array_equal(parallel.tree.lengths, serial.tree.lengths)
+    assert np.array_equal(by_node(parallel.tree.log.table), by_node(serial.tree.log.table))
+    assert_same_statistics(parallel.statistics, serial.statistics)
+    assert np.allclose(parallel.chr_length_st_dev, serial.chr_length_st_dev)
+
+
+def test_sampled_leaves(serial):
+    paths = [[0] * N_GENERATIONS, [1, 0, 1, 1, 0, 1], [1, 0, 1, 1, 1, 0], [1] * N_GENERATIONS]
+    # the sampled lineages are simulated in a single process, whatever 'n_workers' is
+    sampled = simulate(sampled_leaves=paths, n_workers=2)
+    for i in sampled.tree.rows:
+        assert np.array_equal(sampled.tree.lengths[sampled.tree.row(i)], serial.tree.lengths[i])
+        assert np.array_equal(node_rows(sampled.tree, i), node_rows(serial.tree, i))
+    lengths = np.array([serial.tree.lengths[ArrayTree.index(path)] for path in paths])
+    assert sampled.statistics.n == len(paths)
+    assert np.allclose(sampled.average_chromosome_length, lengths.mean(axis=0))
+    assert np.allclose(sampled.chr_length_st_dev, lengths.std(axis=0))
+    with pytest.raises(Exception):
+        list(sampled.parallel_reconstruction(N_GENERATIONS, n_workers=2))
+
+
+@pytest.mark.parametrize("split_generation, n_workers", [(None, 1), (0, 2), (2, 2), (6, 2)])
+def test_parallel_reconstruction(serial, leaves, split_generation, n_workers):
+    reconstructed = dict((tuple(path), sequences) for path, sequences in \
+                         serial.parallel_reconstruction(N_GENERATIONS, split_generation, n_workers))
+    assert list(reconstructed) == list(leaves)
+    assert reconstructed == leaves
+
+
+def test_parallel_reconstruction_files(serial, leaves, tmp_path):
+    files = dict((tuple(path), name) for path, name in \
+                 serial.parallel_reconstruction(N_GENERATIONS, 3, 2, output_dir=str(tmp_path)))
+    assert list(files) == list(leaves)
+    for path, name in files.items():
+        with open(name) as f:
+            records = f.read().split(">")[1 :]
+        sequences = ["".join(record.split("\n")[1 :]) for record in records]
+        assert sequences == leaves[path]
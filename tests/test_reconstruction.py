@@ -0,0 +1,114 @@
+"""
+The reconstructed sequences (Ropes) must be the same of a replay of the EventLog on plain strings.
+The replay reads the rows of 'tree.log.table' and draws the inserted bases from the generator of
+each node, as the 'reconstruct' methods of the events do.
+"""
+import numpy as np
+import pytest
+
+from ArrayTree import ArrayTree
+from Simulator import Simulator
+from Utility import Utility
+
+N_GENERATIONS = 5
+SEED = 11
+# all the kinds of event, with the same probability
+CUMULATIVE = [1 / 8, 2 / 8, 3 / 8, 4 / 8, 5 / 8, 6 / 8, 7 / 8, 1.]
+
+
+def chromosome_table(packed = False):
+    rng = np.random.default_rng(3)
+    table = [(ID, "".join(rng.choice(list("ACGT"), length))) \
+             for ID, length in enumerate([3000, 2200, 1500, 4100], start=1)]
+    return Utility.pack_chromosome_table(table) if packed else table
+
+
+def apply(sequences, rows, rng):
+    """
+    Applies the events of one node ('rows' of the log) to the list of strings 'sequences'.
+    """
+    sequences = list(sequences)
+    for row in rows:
+        code, chr_a, chr_b = int(row["type_code"]), int(row["chr_a"]), int(row["chr_b"])
+        pos, length, final_pos = int(row["pos"]), int(row["length"]), int(row["final_pos"])
+        seq = sequences[chr_a - 1]
+        if code == 0:
+            seq = seq[: pos] + seq[pos + length :]
+        elif code == 1:
+            seq = seq[: pos] + "".join(rng.choice(["A","G","C","T"], length)) + seq[pos :]
+        elif code == 2:
+            moved, rest = seq[pos : pos + length], seq[: pos] + seq[pos + length :]
+            seq = rest[: final_pos] + moved + rest[final_pos :]
+        elif code == 3:
+            moved = seq[pos : pos + length]
+            seq = seq[: pos] + seq[pos + length :]
+            other = sequences[chr_b - 1]
+            sequences[chr_b - 1] = other[: final_pos] + moved + other[final_pos :]
+        elif code == 4:
+            seq = seq[: final_pos] + seq[pos : pos + length] + seq[final_pos :]
+        elif code == 5:
+            seq = seq[: pos] + str(rng.choice(["A","G","C","T"])) + seq[pos :]
+        elif code == 6:
+            seq = seq[: pos] + seq[pos + 1 :]
+        else:
+            bases = ["A","G","C","T"]
+            bases.remove(seq[pos])
+            seq = seq[: pos] + str(rng.choice(bases)) + seq[pos + 1 :]
+        sequences[chr_a - 1] = seq
+    return sequences
+
+
+def replay(simulator):
+    """
+    Returns the sequences (list of str) of every leaf, by path, replaying the log node by node.
+    """
+    tree, table = simulator.tree, simulator.tree.log.table
+    sequences = {0: [str(seq) for ID, seq in simulator.chromosome_table]}
+    for i in range(1, 2 ** (N_GENERATIONS + 1) - 1):
+        rng = np.random.default_rng(np.random.SeedSequence(simulator.seed, \
+              spawn_key=(Simulator.RECONSTRUCTION, *ArrayTree.path(i))))
+        sequences[i] = apply(sequences[(i - 1) // 2], table[table["node_id"] == i], rng)
+    first_leaf = 2 ** N_GENERATIONS - 1
+    return {tuple(ArrayTree.path(i)): sequences[i] for i in range(first_leaf, len(sequences))}
+
+
+def strings(cell):
+    return [str(chr.sequence) for chr in cell.DNA.CHRs]
+
+
+@pytest.fixture(scope="module", params=[False, True], ids=["str", "packed"])
+def simulation(request):
+    simulator = Simulator(chromosome_table(request.param), N_GENERATIONS, 4, CUMULATIVE, \
+                          seed=SEED)
+    assert set(simulator.tree.log.table["type_code"].tolist()) == set(range(8))
+    return simulator, replay(simulator)
+
+
+def test_run_reconstruction(simulation):
+    simulator, expected = simulation
+    simulator.run_reconstruction(simulator.parent, N_GENERATIONS)
+    assert [strings(leaf) for leaf in simulator.leaves] == list(expected.values())
+
+
+def test_iter_reconstructed_leaves(simulation):
+    simulator, expected = simulation
+    leaves = {tuple(path): strings(cell) \
+              for path, cell in simulator.iter_reconstructed_leaves(N_GENERATIONS)}
+    assert leaves == expected
+
+
+def test_path_reconstructor(simulation):
+    simulator, expected = simulation
+    for path in [(0,) * N_GENERATIONS, (1, 0, 1, 1, 0), (1,) * N_GENERATIONS]:
+        assert strings(simulator.path_reconstructor(list(path)).data) == expected[path]
+
+
+def test_batch_path_reconstructor(simulation):
+    simulator, expected = simulation
+    paths = [list(path) for path in expected][:: 3]
+    # a small cache forces some paths to start from the root again
+    for cache_bytes in (2 ** 28, 2 ** 14):
+        simulator.genome_cache = None
+        leaves = {tuple(path): strings(cell) \
+                  for path, cell in simulator.batch_path_reconstructor(paths, cache_bytes)}
+        assert leaves == {tuple(path): expected[tuple(path)] for path in paths}
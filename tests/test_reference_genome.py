@@ -0,0 +1,48 @@
+"""
+The three readers of ReferenceGenome (memory-mapped scan, '.fai' index and gzip) must return the
+same records.
+"""
+import gzip
+
+import pytest
+
+from ReferenceGenome import ReferenceGenome
+
+EMPTY = b">c1\nACGT\n>empty\n>c3\nAA\n"
+EMPTY_LAST = b">c1\nACGT\nAC\n>empty\n"
+CRLF = b">c1 description\r\nACGT\r\nAC\r\n>empty\r\n>c3\r\nGGG\r\n"
+RAGGED = b">c1\nACG\nACGTA\nA\n>c2\nTT\n"
+
+
+def read(path):
+    genome = ReferenceGenome(str(path))
+    records = (genome.names, [str(seq) for seq in genome.sequences])
+    return genome, records
+
+
+def write(tmp_path, name, data):
+    path = tmp_path / name
+    path.write_bytes(data)
+    with gzip.open(str(path) + ".gz", "wb") as f:
+        f.write(data)
+    return path
+
+
+@pytest.mark.parametrize("data", [EMPTY, EMPTY_LAST, CRLF], ids=["empty", "empty_last", "crlf"])
+def test_readers_agree(tmp_path, data):
+    path = write(tmp_path, "genome.fa", data)
+    genome, scanned = read(path)
+    genome.write_index()
+    genome.close()
+    indexed = read(path)[1]
+    compressed = read(str(path) + ".gz")[1]
+    assert scanned == indexed == compressed
+    assert "" in scanned[1] and scanned[0][1] == "empty"
+
+
+def test_ragged_record(tmp_path):
+    path = write(tmp_path, "genome.fa", RAGGED)
+    genome, scanned = read(path)
+    assert scanned == read(str(path) + ".gz")[1] == (["c1", "c2"], ["ACGACGTAA", "TT"])
+    with pytest.raises(Exception):
+        genome.write_index()